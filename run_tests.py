@@ -2,24 +2,52 @@
 Script pour exécuter tous les tests de l'application.
 """
 
+import json
 import unittest
 import sys
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 
 # Ajouter le répertoire src au path
 sys.path.insert(0, str(Path(__file__).parent / "src"))
 
+# Manifeste des modules de tests découverts (chemins -> mtime) : tant que
+# rien n'a changé, les exécutions suivantes court-circuitent la marche du
+# répertoire par loader.discover
+_MANIFESTE = Path(__file__).parent / ".test_manifest.json"
+
+
+def _decouvrir_suite(loader, start_dir):
+    """Découvrir la suite de tests, avec cache de découverte sur disque."""
+    fichiers = {p.name: p.stat().st_mtime for p in Path(start_dir).glob("test_*.py")}
+
+    try:
+        manifeste = json.loads(_MANIFESTE.read_text())
+    except (OSError, ValueError):
+        manifeste = None
+
+    if manifeste and manifeste.get("fichiers") == fichiers:
+        return loader.loadTestsFromNames(manifeste["noms"])
+
+    suite = loader.discover(str(start_dir), pattern='test_*.py')
+    noms = sorted(f"tests.{nom[:-3]}" for nom in fichiers)
+    try:
+        _MANIFESTE.write_text(json.dumps({"fichiers": fichiers, "noms": noms}))
+    except OSError:
+        pass
+    return suite
+
 
 def run_all_tests():
     """Exécuter tous les tests."""
     print("Lancement des tests de l'application de comptabilité...")
     print("=" * 60)
     
-    # Découvrir tous les tests
+    # Découvrir tous les tests (avec cache de découverte)
     loader = unittest.TestLoader()
     start_dir = Path(__file__).parent / "tests"
-    suite = loader.discover(str(start_dir), pattern='test_*.py')
+    suite = _decouvrir_suite(loader, start_dir)
     
     # Exécuter les tests
     runner = unittest.TextTestRunner(verbosity=2)
@@ -57,6 +85,64 @@ def run_all_tests():
         return 1
 
 
+def _executer_module(nom_module):
+    """Exécuter un module de tests dans un processus de travail."""
+    suite = unittest.TestLoader().loadTestsFromName(f"tests.{nom_module}")
+    with open(os.devnull, 'w') as devnull:
+        result = unittest.TextTestRunner(verbosity=0, stream=devnull).run(suite)
+    return (
+        result.testsRun,
+        [(str(test), traceback) for test, traceback in result.failures],
+        [(str(test), traceback) for test, traceback in result.errors],
+    )
+
+
+def run_all_tests_parallel():
+    """Exécuter tous les tests, un processus par module de tests."""
+    print("Lancement des tests en parallèle...")
+    print("=" * 60)
+
+    start_dir = Path(__file__).parent / "tests"
+    noms_modules = sorted(p.stem for p in start_dir.glob("test_*.py"))
+
+    with ProcessPoolExecutor() as pool:
+        resultats = list(pool.map(_executer_module, noms_modules))
+
+    tests_executes = sum(r[0] for r in resultats)
+    echecs = [e for r in resultats for e in r[1]]
+    erreurs = [e for r in resultats for e in r[2]]
+
+    # Résumé
+    print("\n" + "=" * 60)
+    print("RESUME DES TESTS")
+    print("=" * 60)
+    print(f"Tests executes: {tests_executes}")
+    print(f"Succes: {tests_executes - len(echecs) - len(erreurs)}")
+    print(f"Echecs: {len(echecs)}")
+    print(f"Erreurs: {len(erreurs)}")
+
+    if echecs:
+        print("\nDETAILS DES ÉCHECS:")
+        for test, traceback in echecs:
+            print(f"\nERREUR {test}")
+            print("-" * 40)
+            print(traceback)
+
+    if erreurs:
+        print("\nDETAILS DES ERREURS:")
+        for test, traceback in erreurs:
+            print(f"\nERREUR {test}")
+            print("-" * 40)
+            print(traceback)
+
+    if not echecs and not erreurs:
+        print("\nTOUS LES TESTS SONT PASSÉS!")
+        return 0
+    else:
+        print("\nCERTAINS TESTS ONT ÉCHOUÉ")
+        return 1
+
+
 def run_specific_test(test_name):
     """Exécuter un test spécifique."""
     print(f"Lancement du test: {test_name}")
@@ -79,7 +165,10 @@ def run_specific_test(test_name):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) > 1:
+    if len(sys.argv) > 1 and sys.argv[1] == "--parallel":
+        # Exécuter les modules de tests en parallèle
+        exit_code = run_all_tests_parallel()
+    elif len(sys.argv) > 1:
         # Exécuter un test spécifique
         test_name = sys.argv[1]
         exit_code = run_specific_test(test_name)
@@ -0,0 +1,212 @@
+"""
+Noyaux d'agrégation pour les calculateurs de rapports.
+
+Compilés avec Numba (njit) quand la dépendance est installée ; sinon un
+repli NumPy vectorisé offre les mêmes signatures, pour rester compatible
+avec l'installation minimale.
+"""
+
+from typing import Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+# Masques de bits d'appartenance aux groupes de classes : tester une classe
+# revient à un AND entier, sans liste ni tuple par itération.
+_MASQUE_CIRCULANT = (1 << 3) | (1 << 4)            # classes 3, 4
+_MASQUE_ECONOMIQUE = (1 << 2) | (1 << 3) | (1 << 4) | (1 << 5)  # classes 2 à 5
+
+
+def _agg_fonctionnel(montants, classes, is_debit):
+    """Accumulateurs du bilan fonctionnel en une seule passe.
+
+    Retourne (emplois_stables, ressources_stables, actifs_circulants,
+    passifs_circulants, tresorerie_active, tresorerie_passive).
+    """
+    es = 0.0
+    rs = 0.0
+    ac = 0.0
+    pc = 0.0
+    ta = 0.0
+    tp = 0.0
+    for i in range(montants.shape[0]):
+        c = classes[i]
+        m = montants[i]
+        if is_debit[i]:
+            if c == 2:
+                es += m
+            elif (1 << c) & _MASQUE_CIRCULANT:
+                ac += m
+            elif c == 5:
+                ta += m
+        else:
+            if c == 1:
+                rs += m
+            elif (1 << c) & _MASQUE_CIRCULANT:
+                pc += m
+            elif c == 5:
+                rs += m
+                tp += m
+    return es, rs, ac, pc, ta, tp
+
+
+def _agg_patrimoine(montants, classes, is_debit, starts_11):
+    """Accumulateurs du patrimoine en une seule passe.
+
+    Le masque de préfixe '11' est précalculé par l'appelant pour garder
+    les chaînes hors du noyau compilé. Retourne (actifs_economiques,
+    dettes_financieres, capitaux_propres_retraites).
+    """
+    ae = 0.0
+    df = 0.0
+    cp = 0.0
+    for i in range(montants.shape[0]):
+        c = classes[i]
+        m = montants[i]
+        if is_debit[i]:
+            if (1 << c) & _MASQUE_ECONOMIQUE:
+                ae += m
+        elif c == 1:
+            if starts_11[i]:
+                cp += m
+            else:
+                df += m
+    return ae, df, cp
+
+
+def _agg_tous(montants, classes, is_debit, prefix2, prefix3):
+    """Tous les compteurs des trois rapports en une seule passe.
+
+    Retourne les totaux (classe, sens) utiles plus les sous-compteurs par
+    préfixe de code compte, dans l'ordre :
+    (t1c, t2d, t3d, t3c, t4d, t4c, t5d, t5c, c67d, c67c,
+     c1c_111, c1c_11_autres, c1c_14, c1c_hors_11,
+     c4d_342, c4d_autres, c4c_441, c4c_autres).
+    """
+    t1c = t2d = t3d = t3c = t4d = t4c = t5d = t5c = 0.0
+    c67d = c67c = 0.0
+    c1c_111 = c1c_11_autres = c1c_14 = c1c_hors_11 = 0.0
+    c4d_342 = c4d_autres = c4c_441 = c4c_autres = 0.0
+    for i in range(montants.shape[0]):
+        c = classes[i]
+        m = montants[i]
+        if is_debit[i]:
+            if c == 2:
+                t2d += m
+            elif c == 3:
+                t3d += m
+            elif c == 4:
+                t4d += m
+                if prefix3[i] == 342:
+                    c4d_342 += m
+                else:
+                    c4d_autres += m
+            elif c == 5:
+                t5d += m
+            elif c == 6 or c == 7:
+                c67d += m
+        else:
+            if c == 1:
+                t1c += m
+                if prefix3[i] == 111:
+                    c1c_111 += m
+                elif prefix2[i] == 11:
+                    c1c_11_autres += m
+                else:
+                    c1c_hors_11 += m
+                if prefix2[i] == 14:
+                    c1c_14 += m
+            elif c == 3:
+                t3c += m
+            elif c == 4:
+                t4c += m
+                if prefix3[i] == 441:
+                    c4c_441 += m
+                else:
+                    c4c_autres += m
+            elif c == 5:
+                t5c += m
+            elif c == 6 or c == 7:
+                c67c += m
+    return (t1c, t2d, t3d, t3c, t4d, t4c, t5d, t5c, c67d, c67c,
+            c1c_111, c1c_11_autres, c1c_14, c1c_hors_11,
+            c4d_342, c4d_autres, c4c_441, c4c_autres)
+
+
+if NUMBA_DISPONIBLE:
+    # Signatures explicites (tableaux C-contigus) : la compilation a lieu à
+    # l'import plutôt qu'au premier appel, et LLVM peut vectoriser avec des
+    # chargements alignés
+    try:
+        agg_fonctionnel = njit(
+            'UniTuple(f8, 6)(f8[::1], i1[::1], b1[::1])',
+            cache=True)(_agg_fonctionnel)
+        agg_patrimoine = njit(
+            'UniTuple(f8, 3)(f8[::1], i1[::1], b1[::1], b1[::1])',
+            cache=True)(_agg_patrimoine)
+        agg_tous = njit(
+            'UniTuple(f8, 18)(f8[::1], i1[::1], b1[::1], i2[::1], i2[::1])',
+            cache=True)(_agg_tous)
+    except Exception:
+        NUMBA_DISPONIBLE = False
+
+if not NUMBA_DISPONIBLE:
+    def agg_fonctionnel(montants, classes, is_debit) -> Tuple[float, ...]:
+        """Repli NumPy de _agg_fonctionnel (sommes masquées)."""
+        credit = ~is_debit
+        circulant = (classes == 3) | (classes == 4)
+        classe_5 = classes == 5
+        return (
+            float(montants[(classes == 2) & is_debit].sum()),
+            float(montants[((classes == 1) | classe_5) & credit].sum()),
+            float(montants[circulant & is_debit].sum()),
+            float(montants[circulant & credit].sum()),
+            float(montants[classe_5 & is_debit].sum()),
+            float(montants[classe_5 & credit].sum()),
+        )
+
+    def agg_patrimoine(montants, classes, is_debit, starts_11) -> Tuple[float, ...]:
+        """Repli NumPy de _agg_patrimoine (sommes masquées)."""
+        classe_1c = (classes == 1) & ~is_debit
+        return (
+            float(montants[(classes >= 2) & (classes <= 5) & is_debit].sum()),
+            float(montants[classe_1c & ~starts_11].sum()),
+            float(montants[classe_1c & starts_11].sum()),
+        )
+
+    def agg_tous(montants, classes, is_debit, prefix2, prefix3) -> Tuple[float, ...]:
+        """Repli NumPy de _agg_tous (sommes masquées)."""
+        credit = ~is_debit
+        c1c = (classes == 1) & credit
+        c4d = (classes == 4) & is_debit
+        c4c = (classes == 4) & credit
+        gestion = (classes == 6) | (classes == 7)
+        p111 = prefix3 == 111
+        p11 = prefix2 == 11
+        s342 = prefix3 == 342
+        s441 = prefix3 == 441
+        return (
+            float(montants[c1c].sum()),
+            float(montants[(classes == 2) & is_debit].sum()),
+            float(montants[(classes == 3) & is_debit].sum()),
+            float(montants[(classes == 3) & credit].sum()),
+            float(montants[c4d].sum()),
+            float(montants[c4c].sum()),
+            float(montants[(classes == 5) & is_debit].sum()),
+            float(montants[(classes == 5) & credit].sum()),
+            float(montants[gestion & is_debit].sum()),
+            float(montants[gestion & credit].sum()),
+            float(montants[c1c & p111].sum()),
+            float(montants[c1c & p11 & ~p111].sum()),
+            float(montants[c1c & (prefix2 == 14)].sum()),
+            float(montants[c1c & ~p11].sum()),
+            float(montants[c4d & s342].sum()),
+            float(montants[c4d & ~s342].sum()),
+            float(montants[c4c & s441].sum()),
+            float(montants[c4c & ~s441].sum()),
+        )
@@ -1,43 +1,117 @@
 """
 Modèles de données simplifiés sans Pydantic pour compatibilité Python 3.14.
+
+Tous les montants sont des float (float64 dans les colonnes NumPy) ; les
+arrondis monétaires se font uniquement à la présentation.
 """
 
-from dataclasses import dataclass
+import math
+from dataclasses import dataclass, field, fields
+from functools import lru_cache
+from operator import attrgetter
 from typing import List, Optional, Dict, Any
-from enum import Enum
-from decimal import Decimal
+from enum import IntEnum
 
+import numpy as np
 
-class Sens(Enum):
-    """Sens des écritures comptables."""
-    DEBIT = "DEBIT"
-    CREDIT = "CREDIT"
 
+class Sens(IntEnum):
+    """Sens des écritures comptables.
 
-@dataclass
+    IntEnum avec DEBIT=1 : les colonnes NumPy et les noyaux compilés
+    peuvent dériver directement un tableau booléen des valeurs entières.
+    """
+    CREDIT = 0
+    DEBIT = 1
+
+
+@dataclass(slots=True, frozen=True)
 class LigneCompte:
-    """Ligne d'écriture comptable."""
+    """Ligne d'écriture comptable (immuable, sans __dict__)."""
     code_compte: str
     libelle: str
     classe: int
     sens: Sens
     montant: float
     periode: str
+    _prefix2: int = field(init=False, repr=False, compare=False)
+    _prefix3: int = field(init=False, repr=False, compare=False)
     
     def __post_init__(self):
         """Validation après création."""
         # Validation du code compte
         if not self.code_compte or len(self.code_compte) < 3:
             raise ValueError("Code compte invalide")
-        
+
         # Validation de la classe
         if not 1 <= self.classe <= 9:
             raise ValueError("Classe doit être entre 1 et 9")
-        
+
         # Validation du montant
         if self.montant < 0:
             raise ValueError("Montant doit être positif")
 
+        # Préfixes numériques du code compte (-1 si non numérique) : les
+        # chemins chauds comparent ces entiers au lieu d'appeler
+        # str.startswith par ligne.
+        p2 = self.code_compte[:2]
+        p3 = self.code_compte[:3]
+        object.__setattr__(self, '_prefix2', int(p2) if p2.isdigit() else -1)
+        object.__setattr__(self, '_prefix3', int(p3) if p3.isdigit() else -1)
+
+    @classmethod
+    def depuis_tableaux(cls, codes, libelles, classes, sens, montants, periodes) -> List['LigneCompte']:
+        """Construction en masse depuis des colonnes déjà alignées.
+
+        Contourne __init__/__post_init__ ligne par ligne : la validation est
+        faite en une passe vectorisée par règle sur les colonnes, puis les
+        instances sont peuplées directement. À réserver aux chargements en
+        volume (journal parsé, base de données).
+        """
+        codes = np.asarray(codes)
+        classes = np.asarray(classes, dtype=np.int8)
+        montants = np.asarray(montants, dtype=np.float64)
+
+        if len(codes) == 0:
+            return []
+        if int(np.char.str_len(codes).min()) < 3:
+            raise ValueError("Code compte invalide")
+        if int(classes.min()) < 1 or int(classes.max()) > 9:
+            raise ValueError("Classe doit être entre 1 et 9")
+        if float(montants.min()) < 0:
+            raise ValueError("Montant doit être positif")
+
+        new = object.__new__
+        set_ = object.__setattr__
+        lignes = []
+        # strict : des colonnes de longueurs différentes lèvent ValueError
+        # au lieu de tronquer silencieusement le journal à la plus courte
+        for code, libelle, classe, s, montant, periode in zip(
+                codes.tolist(), libelles, classes.tolist(), sens, montants.tolist(), periodes,
+                strict=True):
+            ligne = new(cls)
+            set_(ligne, 'code_compte', code)
+            set_(ligne, 'libelle', libelle)
+            set_(ligne, 'classe', classe)
+            set_(ligne, 'sens', Sens(s))
+            set_(ligne, 'montant', montant)
+            set_(ligne, 'periode', periode)
+            p2 = code[:2]
+            p3 = code[:3]
+            set_(ligne, '_prefix2', int(p2) if p2.isdigit() else -1)
+            set_(ligne, '_prefix3', int(p3) if p3.isdigit() else -1)
+            lignes.append(ligne)
+        return lignes
+
+
+# Accesseurs d'attributs compilés en C pour l'extraction des colonnes
+_get_montant = attrgetter('montant')
+_get_classe = attrgetter('classe')
+_get_sens = attrgetter('sens')
+_get_code = attrgetter('code_compte')
+_get_prefix2 = attrgetter('_prefix2')
+_get_prefix3 = attrgetter('_prefix3')
+
 
 @dataclass
 class JeuDonnees:
@@ -47,27 +121,69 @@ class JeuDonnees:
     entreprise: str = "Entreprise"
     
     def __post_init__(self):
-        """Validation après création."""
+        """Validation après création et construction des colonnes NumPy."""
         if not self.lignes:
             raise ValueError("Le jeu de données doit contenir au moins une ligne")
-        
-        # Vérifier l'équilibre débit/crédit
-        total_debit = sum(l.montant for l in self.lignes if l.sens == Sens.DEBIT)
-        total_credit = sum(l.montant for l in self.lignes if l.sens == Sens.CREDIT)
-        
-        if abs(total_debit - total_credit) > 0.01:
+
+        # Représentation colonnaire (SoA) des lignes : les agrégations
+        # parcourent ces tableaux NumPy au lieu de la liste d'objets.
+        # L'extraction des colonnes passe par operator.attrgetter (accès
+        # attribut en C) plutôt que par des expressions génératrices.
+        n = len(self.lignes)
+        lignes = self.lignes
+        self._montants = np.fromiter(map(_get_montant, lignes), dtype=np.float64, count=n)
+        self._classes = np.fromiter(map(_get_classe, lignes), dtype=np.int8, count=n)
+        self._is_debit = np.fromiter(map(_get_sens, lignes), dtype=bool, count=n)
+        self._codes = np.array(list(map(_get_code, lignes)))
+        self._prefix2 = np.fromiter(map(_get_prefix2, lignes), dtype=np.int16, count=n)
+        self._prefix3 = np.fromiter(map(_get_prefix3, lignes), dtype=np.int16, count=n)
+        # Montants signés (crédit positif, débit négatif) : permet de
+        # calculer un solde crédit - débit en une somme sans branchement.
+        self._montants_signes = np.where(self._is_debit, -self._montants, self._montants)
+
+        # Totaux par (classe, sens) calculés une seule fois : le jeu de
+        # données étant immuable après construction, la vérification
+        # d'équilibre et les getters de totaux lisent ce cache au lieu de
+        # rescanner les lignes à chaque appel.
+        self._totaux = np.zeros((10, 2))
+        np.add.at(self._totaux, (self._classes, self._is_debit.astype(np.int8)), self._montants)
+
+        # Vérifier l'équilibre débit/crédit : une seule somme signée au lieu
+        # de deux totaux séparés. math.fsum garantit un solde exact au
+        # dernier bit, pour que la tolérance de 0.01 ne soit jamais
+        # consommée par l'erreur d'arrondi de l'accumulation elle-même
+        # (les agrégations de rapports restent en sommes NumPy, déjà en
+        # sommation par paires).
+        # Cache des rapports calculés : le jeu de données est immuable après
+        # construction, les calculateurs y mémorisent leurs résultats pour
+        # que les passes répétées (affichage puis exports) soient gratuites
+        self._rapports = {}
+
+        solde = math.fsum(self._montants_signes)
+        if not math.isclose(solde, 0.0, abs_tol=0.01):
+            total_debit = float(self._totaux[:, 1].sum())
+            total_credit = float(self._totaux[:, 0].sum())
             raise ValueError(f"Déséquilibre: Débit={total_debit}, Crédit={total_credit}")
-    
+
+    def totaux_par_classe_sens(self) -> np.ndarray:
+        """Totaux par (classe, sens) précalculés à la construction.
+
+        Retourne une matrice (10, 2) où totaux[classe, 1] est le total débit
+        de la classe et totaux[classe, 0] son total crédit (la ligne 0 est
+        inutilisée, les classes allant de 1 à 9).
+        """
+        return self._totaux
+
     def get_total_classe(self, classe: int) -> float:
         """Obtenir le total pour une classe de comptes."""
-        return sum(l.montant for l in self.lignes if l.classe == classe)
-    
+        return float(self._totaux[classe].sum())
+
     def get_total_sens(self, sens: Sens) -> float:
         """Obtenir le total par sens."""
-        return sum(l.montant for l in self.lignes if l.sens == sens)
+        return float(self._totaux[:, 1 if sens is Sens.DEBIT else 0].sum())
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BilanFonctionnel:
     """Bilan fonctionnel simplifié."""
     emplois_stables: float
@@ -83,21 +199,10 @@ class BilanFonctionnel:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertir en dictionnaire."""
-        return {
-            'emplois_stables': self.emplois_stables,
-            'ressources_stables': self.ressources_stables,
-            'frng': self.frng,
-            'actifs_circulants': self.actifs_circulants,
-            'passifs_circulants': self.passifs_circulants,
-            'bfr': self.bfr,
-            'tresorerie_active': self.tresorerie_active,
-            'tresorerie_passive': self.tresorerie_passive,
-            'tresorerie_nette': self.tresorerie_nette,
-            'periode': self.periode
-        }
+        return dict(_champs_valeurs(self))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class BilanFinancier:
     """Bilan financier simplifié."""
     immobilisations_nettes: float
@@ -116,30 +221,29 @@ class BilanFinancier:
     tresorerie_passive: float
     total_passif: float
     periode: str
-    
+    # Ratios dérivés, calculés une seule fois à la construction : les
+    # analyses répétées lisent ces champs au lieu de refaire les divisions.
+    ratio_endettement: float = field(init=False, repr=False, compare=False)
+    ratio_autonomie: float = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        """Calcul des ratios dérivés."""
+        object.__setattr__(
+            self, 'ratio_endettement',
+            (self.total_passif - self.capitaux_propres) / self.total_actif
+            if self.total_actif else 0.0
+        )
+        object.__setattr__(
+            self, 'ratio_autonomie',
+            self.capitaux_propres / self.total_passif if self.total_passif else 0.0
+        )
+
     def to_dict(self) -> Dict[str, Any]:
         """Convertir en dictionnaire."""
-        return {
-            'immobilisations_nettes': self.immobilisations_nettes,
-            'stocks': self.stocks,
-            'creances_clients': self.creances_clients,
-            'autres_creances': self.autres_creances,
-            'tresorerie_active': self.tresorerie_active,
-            'total_actif': self.total_actif,
-            'capital_social': self.capital_social,
-            'reserves': self.reserves,
-            'resultat_net': self.resultat_net,
-            'capitaux_propres': self.capitaux_propres,
-            'dettes_financieres_lt': self.dettes_financieres_lt,
-            'dettes_fournisseurs': self.dettes_fournisseurs,
-            'autres_dettes_ct': self.autres_dettes_ct,
-            'tresorerie_passive': self.tresorerie_passive,
-            'total_passif': self.total_passif,
-            'periode': self.periode
-        }
+        return dict(_champs_valeurs(self))
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class PatrimoineEntreprise:
     """Patrimoine de l'entreprise simplifié."""
     actifs_economiques: float
@@ -154,14 +258,24 @@ class PatrimoineEntreprise:
     
     def to_dict(self) -> Dict[str, Any]:
         """Convertir en dictionnaire."""
-        return {
-            'actifs_economiques': self.actifs_economiques,
-            'dettes_financieres': self.dettes_financieres,
-            'actif_net_comptable': self.actif_net_comptable,
-            'capitaux_propres_retraites': self.capitaux_propres_retraites,
-            'patrimoine_net': self.patrimoine_net,
-            'ratio_endettement': self.ratio_endettement,
-            'ratio_solvabilite': self.ratio_solvabilite,
-            'ratio_liquidite': self.ratio_liquidite,
-            'periode': self.periode
-        }
+        return dict(_champs_valeurs(self))
+
+
+# Noms de champs figés à l'import : to_dict itère sur ces tuples au lieu
+# de reconstruire un littéral de 10-15 entrées à chaque appel
+_CHAMPS_PAR_TYPE = {
+    classe: tuple(f.name for f in fields(classe) if f.init)
+    for classe in (BilanFonctionnel, BilanFinancier, PatrimoineEntreprise)
+}
+
+
+@lru_cache(maxsize=128)
+def _champs_valeurs(rapport) -> tuple:
+    """Paires (champ, valeur) d'un rapport, mises en cache par instance.
+
+    Les rapports étant figés et hachables, les exports répétés du même
+    bilan relisent ce tuple au lieu de refaire les getattr ; to_dict
+    rematérialise un dictionnaire frais à chaque appel pour que les
+    appelants puissent le modifier sans corrompre le cache.
+    """
+    return tuple((nom, getattr(rapport, nom)) for nom in _CHAMPS_PAR_TYPE[type(rapport)])
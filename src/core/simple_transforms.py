@@ -3,6 +3,10 @@ Transformations financières simplifiées sans pandas pour compatibilité Python
 """
 
 from typing import Dict, Any, List
+
+import numpy as np
+
+from ._kernels import agg_fonctionnel, agg_patrimoine, agg_tous
 from .simple_models import JeuDonnees, BilanFonctionnel, BilanFinancier, PatrimoineEntreprise, Sens
 
 
@@ -22,50 +26,26 @@ class SimpleReportCalculator:
         Returns:
             BilanFonctionnel calculé
         """
-        # Calcul des emplois stables (classe 2)
-        emplois_stables = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 2 and l.sens == Sens.DEBIT
+        rapport = donnees._rapports.get('fonctionnel')
+        if rapport is not None:
+            return rapport
+
+        # Accumulation en une seule passe dans le noyau compilé (Numba si
+        # disponible, repli NumPy sinon).
+        (emplois_stables, ressources_stables, actifs_circulants,
+         passifs_circulants, tresorerie_active, tresorerie_passive) = agg_fonctionnel(
+            donnees._montants, donnees._classes, donnees._is_debit
         )
-        
-        # Calcul des ressources stables (classes 1 et 5)
-        ressources_stables = 0
-        for ligne in donnees.lignes:
-            if ligne.classe in [1, 5] and ligne.sens == Sens.CREDIT:
-                ressources_stables += ligne.montant
-        
+
         # FRNG = Ressources stables - Emplois stables
         frng = ressources_stables - emplois_stables
-        
-        # Actifs circulants (classes 3, 4)
-        actifs_circulants = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe in [3, 4] and l.sens == Sens.DEBIT
-        )
-        
-        # Passifs circulants (classes 3, 4)
-        passifs_circulants = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe in [3, 4] and l.sens == Sens.CREDIT
-        )
-        
+
         # BFR = Actifs circulants - Passifs circulants
         bfr = actifs_circulants - passifs_circulants
-        
-        # Trésorerie
-        tresorerie_active = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 5 and l.sens == Sens.DEBIT
-        )
-        
-        tresorerie_passive = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 5 and l.sens == Sens.CREDIT
-        )
-        
+
         tresorerie_nette = tresorerie_active - tresorerie_passive
         
-        return BilanFonctionnel(
+        rapport = BilanFonctionnel(
             emplois_stables=emplois_stables,
             ressources_stables=ressources_stables,
             frng=frng,
@@ -77,6 +57,8 @@ class SimpleReportCalculator:
             tresorerie_nette=tresorerie_nette,
             periode=donnees.periode
         )
+        donnees._rapports['fonctionnel'] = rapport
+        return rapport
     
     def calculer_bilan_financier(self, donnees: JeuDonnees) -> BilanFinancier:
         """
@@ -88,78 +70,64 @@ class SimpleReportCalculator:
         Returns:
             BilanFinancier calculé
         """
+        rapport = donnees._rapports.get('financier')
+        if rapport is not None:
+            return rapport
+
+        # Agrégation vectorisée sur la représentation colonnaire : chaque
+        # rubrique est une somme masquée NumPy. Les masques de préfixe de
+        # code compte sont calculés une seule fois puis réutilisés.
+        montants = donnees._montants
+        classes = donnees._classes
+        debit = donnees._is_debit
+        credit = ~debit
+
+        # Totaux par (classe, sens) en une passe pour les rubriques sans
+        # condition de préfixe ; masques calculés une seule fois en tête de
+        # méthode puis réutilisés pour les rubriques par code compte.
+        totaux = donnees.totaux_par_classe_sens()
+        DEBIT, CREDIT = 1, 0
+
+        classe_1c = (classes == 1) & credit
+        classe_4d = (classes == 4) & debit
+        classe_4c = (classes == 4) & credit
+
+        # Comparaisons entières sur les préfixes de code compte précalculés
+        # à la construction des lignes (plus de str.startswith par ligne).
+        prefix2 = donnees._prefix2
+        prefix3 = donnees._prefix3
+        starts_342 = prefix3 == 342
+        starts_111 = prefix3 == 111
+        starts_11 = prefix2 == 11
+        starts_14 = prefix2 == 14
+        starts_441 = prefix3 == 441
+
         # Actif
-        immobilisations_nettes = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 2 and l.sens == Sens.DEBIT
-        )
-        
-        stocks = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 3 and l.sens == Sens.DEBIT
-        )
-        
-        creances_clients = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 4 and l.sens == Sens.DEBIT and l.code_compte.startswith('342')
-        )
-        
-        autres_creances = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 4 and l.sens == Sens.DEBIT and not l.code_compte.startswith('342')
-        )
-        
-        tresorerie_active = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 5 and l.sens == Sens.DEBIT
-        )
-        
+        immobilisations_nettes = float(totaux[2, DEBIT])
+        stocks = float(totaux[3, DEBIT])
+        creances_clients = float(montants[classe_4d & starts_342].sum())
+        autres_creances = float(montants[classe_4d & ~starts_342].sum())
+        tresorerie_active = float(totaux[5, DEBIT])
+
         total_actif = immobilisations_nettes + stocks + creances_clients + autres_creances + tresorerie_active
-        
+
         # Passif
-        capital_social = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 1 and l.sens == Sens.CREDIT and l.code_compte.startswith('111')
-        )
-        
-        reserves = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 1 and l.sens == Sens.CREDIT and l.code_compte.startswith('11') and not l.code_compte.startswith('111')
-        )
-        
-        resultat_net = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe in [6, 7] and l.sens == Sens.CREDIT
-        ) - sum(
-            l.montant for l in donnees.lignes 
-            if l.classe in [6, 7] and l.sens == Sens.DEBIT
-        )
-        
+        capital_social = float(montants[classe_1c & starts_111].sum())
+        reserves = float(montants[classe_1c & starts_11 & ~starts_111].sum())
+        dettes_financieres_lt = float(montants[classe_1c & starts_14].sum())
+        dettes_fournisseurs = float(montants[classe_4c & starts_441].sum())
+        autres_dettes_ct = float(montants[classe_4c & ~starts_441].sum())
+        tresorerie_passive = float(totaux[5, CREDIT])
+
+        # Résultat = produits - charges, en une somme signée sur les classes
+        # de gestion (crédit positif, débit négatif)
+        resultat_net = float(donnees._montants_signes[(classes == 6) | (classes == 7)].sum())
+
         capitaux_propres = capital_social + reserves + max(0, resultat_net)
-        
-        dettes_financieres_lt = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 1 and l.sens == Sens.CREDIT and l.code_compte.startswith('14')
-        )
-        
-        dettes_fournisseurs = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 4 and l.sens == Sens.CREDIT and l.code_compte.startswith('441')
-        )
-        
-        autres_dettes_ct = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 4 and l.sens == Sens.CREDIT and not l.code_compte.startswith('441')
-        )
-        
-        tresorerie_passive = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 5 and l.sens == Sens.CREDIT
-        )
-        
+
         total_passif = capitaux_propres + dettes_financieres_lt + dettes_fournisseurs + autres_dettes_ct + tresorerie_passive
         
-        return BilanFinancier(
+        rapport = BilanFinancier(
             immobilisations_nettes=immobilisations_nettes,
             stocks=stocks,
             creances_clients=creances_clients,
@@ -177,6 +145,8 @@ class SimpleReportCalculator:
             total_passif=total_passif,
             periode=donnees.periode
         )
+        donnees._rapports['financier'] = rapport
+        return rapport
     
     def calculer_patrimoine(self, donnees: JeuDonnees) -> PatrimoineEntreprise:
         """
@@ -188,27 +158,23 @@ class SimpleReportCalculator:
         Returns:
             PatrimoineEntreprise calculé
         """
-        # Actifs économiques (classes 2, 3, 4, 5)
-        actifs_economiques = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe in [2, 3, 4, 5] and l.sens == Sens.DEBIT
-        )
-        
-        # Dettes financières (classe 1 sauf capitaux propres)
-        dettes_financieres = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 1 and l.sens == Sens.CREDIT and not l.code_compte.startswith('11')
+        rapport = donnees._rapports.get('patrimoine')
+        if rapport is not None:
+            return rapport
+
+        # Accumulation en une seule passe dans le noyau compilé ; le masque
+        # de préfixe '11' est précalculé pour garder les chaînes hors du
+        # noyau (actifs économiques : classes 2 à 5 au débit ; classe 1 au
+        # crédit ventilée entre capitaux propres et dettes financières).
+        starts_11 = donnees._prefix2 == 11
+
+        actifs_economiques, dettes_financieres, capitaux_propres_retraites = agg_patrimoine(
+            donnees._montants, donnees._classes, donnees._is_debit, starts_11
         )
-        
+
         # Actif net comptable
         actif_net_comptable = actifs_economiques - dettes_financieres
         
-        # Capitaux propres retraités
-        capitaux_propres_retraites = sum(
-            l.montant for l in donnees.lignes 
-            if l.classe == 1 and l.sens == Sens.CREDIT and l.code_compte.startswith('11')
-        )
-        
         # Patrimoine net
         patrimoine_net = actif_net_comptable
         
@@ -217,7 +183,7 @@ class SimpleReportCalculator:
         ratio_solvabilite = capitaux_propres_retraites / dettes_financieres if dettes_financieres > 0 else 0
         ratio_liquidite = 1.0  # Simplifié
         
-        return PatrimoineEntreprise(
+        rapport = PatrimoineEntreprise(
             actifs_economiques=actifs_economiques,
             dettes_financieres=dettes_financieres,
             actif_net_comptable=actif_net_comptable,
@@ -228,7 +194,100 @@ class SimpleReportCalculator:
             ratio_liquidite=ratio_liquidite,
             periode=donnees.periode
         )
+        donnees._rapports['patrimoine'] = rapport
+        return rapport
     
+    def calculer_tous(self, donnees: JeuDonnees):
+        """
+        Calculer les trois rapports en une seule passe sur les données.
+
+        Tous les compteurs nécessaires aux trois rapports sont accumulés
+        par le noyau fusionné, puis chaque rapport n'est plus qu'une
+        combinaison en temps constant de ces compteurs.
+
+        Args:
+            donnees: Jeu de données comptables
+
+        Returns:
+            Tuple (BilanFonctionnel, BilanFinancier, PatrimoineEntreprise)
+        """
+        cache = donnees._rapports
+        if ('fonctionnel' in cache and 'financier' in cache
+                and 'patrimoine' in cache):
+            return cache['fonctionnel'], cache['financier'], cache['patrimoine']
+
+        (t1c, t2d, t3d, t3c, t4d, t4c, t5d, t5c, c67d, c67c,
+         c1c_111, c1c_11_autres, c1c_14, c1c_hors_11,
+         c4d_342, c4d_autres, c4c_441, c4c_autres) = agg_tous(
+            donnees._montants, donnees._classes, donnees._is_debit,
+            donnees._prefix2, donnees._prefix3
+        )
+        periode = donnees.periode
+
+        # Bilan fonctionnel
+        ressources_stables = t1c + t5c
+        frng = ressources_stables - t2d
+        actifs_circulants = t3d + t4d
+        passifs_circulants = t3c + t4c
+        bfr = actifs_circulants - passifs_circulants
+        fonctionnel = BilanFonctionnel(
+            emplois_stables=t2d,
+            ressources_stables=ressources_stables,
+            frng=frng,
+            actifs_circulants=actifs_circulants,
+            passifs_circulants=passifs_circulants,
+            bfr=bfr,
+            tresorerie_active=t5d,
+            tresorerie_passive=t5c,
+            tresorerie_nette=t5d - t5c,
+            periode=periode
+        )
+
+        # Bilan financier
+        total_actif = t2d + t3d + c4d_342 + c4d_autres + t5d
+        resultat_net = c67c - c67d
+        capitaux_propres = c1c_111 + c1c_11_autres + max(0, resultat_net)
+        total_passif = capitaux_propres + c1c_14 + c4c_441 + c4c_autres + t5c
+        financier = BilanFinancier(
+            immobilisations_nettes=t2d,
+            stocks=t3d,
+            creances_clients=c4d_342,
+            autres_creances=c4d_autres,
+            tresorerie_active=t5d,
+            total_actif=total_actif,
+            capital_social=c1c_111,
+            reserves=c1c_11_autres,
+            resultat_net=resultat_net,
+            capitaux_propres=capitaux_propres,
+            dettes_financieres_lt=c1c_14,
+            dettes_fournisseurs=c4c_441,
+            autres_dettes_ct=c4c_autres,
+            tresorerie_passive=t5c,
+            total_passif=total_passif,
+            periode=periode
+        )
+
+        # Patrimoine
+        actifs_economiques = t2d + t3d + t4d + t5d
+        capitaux_propres_retraites = c1c_111 + c1c_11_autres
+        actif_net_comptable = actifs_economiques - c1c_hors_11
+        patrimoine = PatrimoineEntreprise(
+            actifs_economiques=actifs_economiques,
+            dettes_financieres=c1c_hors_11,
+            actif_net_comptable=actif_net_comptable,
+            capitaux_propres_retraites=capitaux_propres_retraites,
+            patrimoine_net=actif_net_comptable,
+            ratio_endettement=c1c_hors_11 / actifs_economiques if actifs_economiques > 0 else 0,
+            ratio_solvabilite=capitaux_propres_retraites / c1c_hors_11 if c1c_hors_11 > 0 else 0,
+            ratio_liquidite=1.0,
+            periode=periode
+        )
+
+        cache['fonctionnel'] = fonctionnel
+        cache['financier'] = financier
+        cache['patrimoine'] = patrimoine
+        return fonctionnel, financier, patrimoine
+
     def analyser_rapport(self, rapport: Any) -> Dict[str, Any]:
         """
         Analyser un rapport et générer des recommandations.
@@ -244,43 +303,53 @@ class SimpleReportCalculator:
             'recommandations': [],
             'alertes': []
         }
-        
-        if isinstance(rapport, BilanFonctionnel):
-            # Analyse du FRNG
-            if rapport.frng > 0:
-                analyse['points_cles'].append("FRNG positif : bonne couverture des emplois stables")
-            else:
-                analyse['alertes'].append("FRNG négatif : dépendance aux financements court terme")
-                analyse['recommandations'].append("Renforcer les ressources stables")
-            
-            # Analyse du BFR
-            if rapport.bfr > 0:
-                analyse['points_cles'].append(f"BFR positif de {rapport.bfr:,.2f}")
-                analyse['recommandations'].append("Optimiser le cycle d'exploitation")
-            
-            # Analyse de la trésorerie
-            if rapport.tresorerie_nette < 0:
-                analyse['alertes'].append("Trésorerie négative")
-                analyse['recommandations'].append("Améliorer la gestion de trésorerie")
-        
-        elif isinstance(rapport, BilanFinancier):
-            # Analyse de l'endettement
-            if rapport.total_actif > 0:
-                ratio_endettement = (rapport.total_passif - rapport.capitaux_propres) / rapport.total_actif
-                if ratio_endettement > 0.7:
-                    analyse['alertes'].append("Taux d'endettement élevé")
-                    analyse['recommandations'].append("Réduire l'endettement")
-                
-                ratio_autonomie = rapport.capitaux_propres / rapport.total_passif
-                if ratio_autonomie < 0.3:
-                    analyse['alertes'].append("Faible autonomie financière")
-        
-        elif isinstance(rapport, PatrimoineEntreprise):
-            # Analyse des ratios patrimoniaux
-            if rapport.ratio_endettement and rapport.ratio_endettement > 0.5:
-                analyse['alertes'].append("Endettement patrimonial élevé")
-            
-            if rapport.ratio_solvabilite and rapport.ratio_solvabilite < 1:
-                analyse['alertes'].append("Solvabilité compromise")
-        
+        for predicat, rubrique, gabarit in _REGLES_PAR_TYPE.get(type(rapport), ()):
+            if predicat(rapport):
+                analyse[rubrique].append(gabarit.format(rapport))
         return analyse
+
+
+# Règles d'analyse (prédicat, rubrique, gabarit de message) par type de
+# rapport : une boucle sur la table remplace les cascades de if, et le jeu
+# de règles devient une donnée que l'on étend sans toucher au code. Le
+# gabarit est formaté avec le rapport, ce qui couvre les messages
+# paramétrés comme celui du BFR.
+_REGLES_BILAN_FONCTIONNEL = (
+    (lambda r: r.frng > 0, 'points_cles',
+     "FRNG positif : bonne couverture des emplois stables"),
+    (lambda r: r.frng <= 0, 'alertes',
+     "FRNG négatif : dépendance aux financements court terme"),
+    (lambda r: r.frng <= 0, 'recommandations',
+     "Renforcer les ressources stables"),
+    (lambda r: r.bfr > 0, 'points_cles',
+     "BFR positif de {0.bfr:,.2f}"),
+    (lambda r: r.bfr > 0, 'recommandations',
+     "Optimiser le cycle d'exploitation"),
+    (lambda r: r.tresorerie_nette < 0, 'alertes',
+     "Trésorerie négative"),
+    (lambda r: r.tresorerie_nette < 0, 'recommandations',
+     "Améliorer la gestion de trésorerie"),
+)
+
+# Ratios déjà calculés à la construction du bilan financier
+_REGLES_BILAN_FINANCIER = (
+    (lambda r: r.total_actif > 0 and r.ratio_endettement > 0.7, 'alertes',
+     "Taux d'endettement élevé"),
+    (lambda r: r.total_actif > 0 and r.ratio_endettement > 0.7, 'recommandations',
+     "Réduire l'endettement"),
+    (lambda r: r.total_actif > 0 and r.ratio_autonomie < 0.3, 'alertes',
+     "Faible autonomie financière"),
+)
+
+_REGLES_PATRIMOINE = (
+    (lambda r: r.ratio_endettement and r.ratio_endettement > 0.5, 'alertes',
+     "Endettement patrimonial élevé"),
+    (lambda r: r.ratio_solvabilite and r.ratio_solvabilite < 1, 'alertes',
+     "Solvabilité compromise"),
+)
+
+_REGLES_PAR_TYPE = {
+    BilanFonctionnel: _REGLES_BILAN_FONCTIONNEL,
+    BilanFinancier: _REGLES_BILAN_FINANCIER,
+    PatrimoineEntreprise: _REGLES_PATRIMOINE,
+}
@@ -4,4 +4,22 @@ Module d'export pour l'application de comptabilité.
 
 from .simple_exporters import SimpleExporter
 
-__all__ = ['SimpleExporter']
+__all__ = ['SimpleExporter', 'DocxExporter', 'PDFExporter']
+
+
+def __getattr__(nom):
+    """Import paresseux des exporteurs lourds.
+
+    python-docx et reportlab coûtent chacun plusieurs dizaines à quelques
+    centaines de millisecondes à importer : l'import n'est payé qu'au
+    premier accès à l'exporteur, pas au chargement du package (les
+    processus de travail qui n'exportent jamais dans un format donné ne
+    paient donc jamais son import).
+    """
+    if nom == 'DocxExporter':
+        from .exporters.docx_exporter import DocxExporter
+        return DocxExporter
+    if nom == 'PDFExporter':
+        from .exporters.pdf_exporter import PDFExporter
+        return PDFExporter
+    raise AttributeError(f"module {__name__!r} has no attribute {nom!r}")
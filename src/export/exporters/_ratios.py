@@ -0,0 +1,74 @@
+"""
+Noyau des ratios financiers pour les exporteurs.
+
+Compilé avec Numba (njit) quand la dépendance est installée ; sinon un
+repli en Python pur offre la même signature, pour rester compatible avec
+l'installation minimale. Le noyau est chauffé à l'import pour que le
+premier export d'un lot ne paie pas la latence de compilation.
+"""
+
+from typing import Tuple
+
+try:
+    from numba import njit
+    NUMBA_DISPONIBLE = True
+except ImportError:
+    NUMBA_DISPONIBLE = False
+
+
+def _ratios_financiers(total_actif: float, total_passif: float,
+                       capitaux_propres: float, stocks: float,
+                       creances_clients: float, tresorerie_active: float,
+                       dettes_fournisseurs: float) -> Tuple[float, float, float]:
+    """Ratios d'endettement, d'autonomie et de liquidité générale.
+
+    Retourne (endettement, autonomie, liquidite), avec 0.0 lorsque le
+    dénominateur correspondant est nul.
+    """
+    endettement = ((total_passif - capitaux_propres) / total_actif
+                   if total_actif > 0 else 0.0)
+    autonomie = capitaux_propres / total_passif if total_passif > 0 else 0.0
+    liquidite = ((stocks + creances_clients + tresorerie_active)
+                 / dettes_fournisseurs if dettes_fournisseurs > 0 else 0.0)
+    return endettement, autonomie, liquidite
+
+
+def _classer_bilan_financier(total_actif: float,
+                             immobilisations_nettes: float,
+                             capitaux_propres: float) -> int:
+    """Masque de bits des constats applicables au bilan financier.
+
+    bit 0 : structure capitalistique marquée (immobilisations > 50 %)
+    bit 1 : bonne autonomie financière (capitaux propres > 50 %)
+    bit 2 : dépendance à l'endettement (capitaux propres < 20 %)
+    """
+    masque = 0
+    if total_actif > 0.0:
+        if immobilisations_nettes / total_actif > 0.5:
+            masque |= 1
+        ratio_capitaux_propres = capitaux_propres / total_actif
+        if ratio_capitaux_propres > 0.5:
+            masque |= 2
+        elif ratio_capitaux_propres < 0.2:
+            masque |= 4
+    return masque
+
+
+if NUMBA_DISPONIBLE:
+    # Signatures explicites : la compilation (ou la relecture du cache
+    # disque) est payée à l'import plutôt que sur le premier export, sans
+    # appel de chauffe séparé
+    try:
+        ratios_financiers = njit(
+            'UniTuple(f8, 3)(f8, f8, f8, f8, f8, f8, f8)',
+            cache=True)(_ratios_financiers)
+    except Exception:
+        ratios_financiers = _ratios_financiers
+    try:
+        classer_bilan_financier = njit(
+            'i8(f8, f8, f8)', cache=True)(_classer_bilan_financier)
+    except Exception:
+        classer_bilan_financier = _classer_bilan_financier
+else:
+    ratios_financiers = _ratios_financiers
+    classer_bilan_financier = _classer_bilan_financier
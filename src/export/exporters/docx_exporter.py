@@ -3,10 +3,15 @@ Exporteur de rapports au format DOCX (Word).
 Génère des documents Word éditables avec mise en forme professionnelle.
 """
 
+import io
+import multiprocessing
 import os
+from copy import deepcopy
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from docx import Document
 from docx.shared import Inches, Pt, RGBColor
@@ -16,15 +21,218 @@ from docx.oxml.shared import OxmlElement, qn
 
 from core.models import BilanFonctionnel, BilanFinancier, PatrimoineEntreprise
 
+# Répertoire d'export créé une seule fois au chargement du module (mkdir
+# idempotent) : export() n'a plus un stat/mkdir par rapport généré
+_EXPORT_DIR = Path("exports")
+_EXPORT_DIR.mkdir(exist_ok=True)
+
+# Gabarit de formatage monétaire précompilé : str.format lié une fois évite
+# de réévaluer la f-string complète par cellule
+_MONEY_FMT = "{:,.2f} {}".format
+
+
+def _fragment_shd(fill: str):
+    """Construire un fragment <w:shd> de fond de cellule."""
+    shd = OxmlElement('w:shd')
+    shd.set(qn('w:fill'), fill)
+    return shd
+
+
+# Fonds de cellule précompilés : seuls deux fonds existent (en-tête/total
+# sombre, sous-total clair), clonés par deepcopy au lieu de repasser par
+# OxmlElement et la résolution d'espace de noms qn() par cellule
+_SHD_SOMBRE = _fragment_shd('333333')
+_SHD_CLAIR = _fragment_shd('E6E6E6')
+
+
+def _fragment_saut_de_page():
+    """Construire le paragraphe <w:p><w:r><w:br w:type="page"/></w:r></w:p>."""
+    p = OxmlElement('w:p')
+    r = OxmlElement('w:r')
+    br = OxmlElement('w:br')
+    br.set(qn('w:type'), 'page')
+    r.append(br)
+    p.append(r)
+    return p
+
+
+# Saut de page précompilé, cloné à chaque insertion au lieu de repasser
+# par doc.add_page_break et sa chaîne de proxys paragraphe/run
+_SAUT_DE_PAGE = _fragment_saut_de_page()
+
+
+def _fragment_tabs_sommaire():
+    """Construire la tabulation droite du sommaire (6 pouces = 8640 twips)."""
+    tabs = OxmlElement('w:tabs')
+    tab = OxmlElement('w:tab')
+    tab.set(qn('w:val'), 'right')
+    tab.set(qn('w:pos'), '8640')
+    tabs.append(tab)
+    return tabs
+
+
+# Taquet de tabulation du sommaire précompilé : cloné dans le pPr de chaque
+# ligne au lieu de reconvertir Inches(6.0) et de reconstruire le <w:tab>
+_TABS_SOMMAIRE = _fragment_tabs_sommaire()
+
+# Lignes des tableaux : triplets (libellé, attribut du modèle, pourcentage).
+# Un attribut None marque une ligne vide de séparation.
+_LIGNES_BILAN_FONCTIONNEL = (
+    ("EMPLOIS STABLES", 'emplois_stables', ""),
+    ("Ressources stables", 'ressources_stables', ""),
+    ("FRNG", 'frng', "100%"),
+    ("", None, ""),
+    ("ACTIFS CIRCULANTS", 'actifs_circulants', ""),
+    ("Passifs circulants", 'passifs_circulants', ""),
+    ("BFR", 'bfr', ""),
+    ("", None, ""),
+    ("TRÉSORERIE ACTIVE", 'tresorerie_active', ""),
+    ("Trésorerie passive", 'tresorerie_passive', ""),
+    ("TRÉSORERIE NETTE", 'tresorerie_nette', ""),
+)
+
+_LIGNES_ACTIF = (
+    ("Immobilisations nettes", 'immobilisations_nettes', ""),
+    ("Stocks", 'stocks', ""),
+    ("Créances clients", 'creances_clients', ""),
+    ("Autres créances", 'autres_creances', ""),
+    ("Trésorerie active", 'tresorerie_active', ""),
+    ("TOTAL ACTIF", 'total_actif', "100%"),
+)
+
+_LIGNES_PASSIF = (
+    ("Capital social", 'capital_social', ""),
+    ("Réserves", 'reserves', ""),
+    ("Résultat net", 'resultat_net', ""),
+    ("Capitaux propres", 'capitaux_propres', ""),
+    ("Dettes financières LT", 'dettes_financieres_lt', ""),
+    ("Dettes fournisseurs", 'dettes_fournisseurs', ""),
+    ("Autres dettes CT", 'autres_dettes_ct', ""),
+    ("Trésorerie passive", 'tresorerie_passive', ""),
+    ("TOTAL PASSIF", 'total_passif', "100%"),
+)
+
+_LIGNES_PATRIMOINE = (
+    ("Actifs économiques", 'actifs_economiques', ""),
+    ("Dettes financières", 'dettes_financieres', ""),
+    ("Actif net comptable", 'actif_net_comptable', ""),
+    ("Capitaux propres retraités", 'capitaux_propres_retraites', ""),
+    ("PATRIMOINE NET", 'patrimoine_net', "100%"),
+)
+
+
+def _saut_de_page(doc):
+    """Insérer un saut de page depuis le fragment précompilé."""
+    _attacher_au_corps(doc, deepcopy(_SAUT_DE_PAGE))
+
+
+def _bold_run(paragraph, text):
+    """Ajouter un run en gras à un paragraphe en un seul passage."""
+    run = paragraph.add_run(text)
+    run.bold = True
+    return run
+
+
+def _attacher_au_corps(doc, element):
+    """Rattacher un élément au corps du document, avant le sectPr final.
+
+    Le <w:sectPr> doit rester le dernier enfant du corps : un append brut
+    placerait l'élément après lui, en fin de document.
+    """
+    sect_pr = doc.element.body.find(qn('w:sectPr'))
+    if sect_pr is not None:
+        sect_pr.addprevious(element)
+    else:
+        doc.element.body.append(element)
+
+
+def _ajouter_paragraphes_vides(doc, n):
+    """Ajouter n paragraphes vides d'espacement en une seule insertion XML.
+
+    Évite n appels à doc.add_paragraph (chacun créant un proxy Paragraph) :
+    les <w:p/> nus sont construits directement et rattachés au corps.
+    """
+    sect_pr = doc.element.body.find(qn('w:sectPr'))
+    if sect_pr is not None:
+        for _ in range(n):
+            sect_pr.addprevious(OxmlElement('w:p'))
+    else:
+        doc.element.body.extend(OxmlElement('w:p') for _ in range(n))
+
+
+def _lignes_montants(entete, lignes, valeurs, devise):
+    """Construire les données d'un tableau monétaire depuis sa spécification.
+
+    valeurs est le tuple des montants dans l'ordre des lignes à attribut
+    non vide, extrait en amont par l'attrgetter de la spécification.
+    """
+    suivant = iter(valeurs).__next__
+    return [list(entete)] + [
+        [libelle,
+         _MONEY_FMT(float(suivant()), devise) if attr else "",
+         pct]
+        for libelle, attr, pct in lignes
+    ]
+
+
+def _extracteur(lignes):
+    """Attrgetter multi-champs sur les attributs non vides d'une spécification."""
+    return attrgetter(*[attr for _, attr, _ in lignes if attr])
+
+
+# Spécifications complètes des tableaux monétaires : en-tête, lignes,
+# extracteur des montants (un seul accès attrgetter en C par tableau),
+# indices des sous-totaux et indice du total dans le tableau rendu.
+# Les quatre constructeurs ne diffèrent que par ces données.
+_TABLE_SPECS = {
+    'bilan_fonctionnel': (("EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"),
+                          _LIGNES_BILAN_FONCTIONNEL,
+                          _extracteur(_LIGNES_BILAN_FONCTIONNEL), (3, 7, 10), 11),
+    'actif': (("Rubriques", "Montant", "Pourcentage"),
+              _LIGNES_ACTIF, _extracteur(_LIGNES_ACTIF), (), 6),
+    'passif': (("Rubriques", "Montant", "Pourcentage"),
+               _LIGNES_PASSIF, _extracteur(_LIGNES_PASSIF), (4,), 9),
+    'patrimoine': (("ÉLÉMENTS PATRIMONIAUX", "Montant", "Pourcentage"),
+                   _LIGNES_PATRIMOINE, _extracteur(_LIGNES_PATRIMOINE), (), 5),
+}
+
+# Répartition par type de rapport : titre de page de garde et méthode de
+# contenu principal, résolus en un accès dict au lieu d'une chaîne
+# d'isinstance par export
+_CONTENU_PAR_TYPE = {
+    BilanFonctionnel: ("BILAN FONCTIONNEL", 'create_bilan_fonctionnel_content'),
+    BilanFinancier: ("BILAN FINANCIER", 'create_bilan_financier_content'),
+    PatrimoineEntreprise: ("PATRIMOINE DE L'ENTREPRISE", 'create_patrimoine_content'),
+}
+
+
+def _init_worker():
+    """Précharger le modèle de document dans un processus de travail."""
+    DocxExporter._template_buf()
+
 
 class DocxExporter:
     """
     Exporteur pour générer des rapports DOCX professionnels.
     """
 
+    # Octets du modèle de document par défaut, lus une seule fois par
+    # processus : Document() rouvre et relit sinon le .docx modèle depuis
+    # le disque à chaque export
+    _TEMPLATE_BYTES: Optional[bytes] = None
+
     def __init__(self):
         pass
 
+    @classmethod
+    def _template_buf(cls) -> io.BytesIO:
+        """Obtenir un tampon mémoire sur le modèle de document par défaut."""
+        if cls._TEMPLATE_BYTES is None:
+            import docx
+            chemin = Path(docx.__file__).parent / 'templates' / 'default.docx'
+            cls._TEMPLATE_BYTES = chemin.read_bytes()
+        return io.BytesIO(cls._TEMPLATE_BYTES)
+
     def export(self, report_data, filename: str, options: Dict[str, Any]) -> str:
         """
         Exporter un rapport au format DOCX.
@@ -37,42 +245,74 @@ class DocxExporter:
         Returns:
             Chemin du fichier généré
         """
-        # Créer le répertoire d'export si nécessaire
-        export_dir = Path("exports")
-        export_dir.mkdir(exist_ok=True)
-        
-        file_path = export_dir / filename
-        
-        # Créer le document Word
-        doc = Document()
+        # Répertoire d'export déjà créé au chargement du module
+        file_path = _EXPORT_DIR / filename
+
+        # Date d'édition calculée une fois par export et propagée aux
+        # sections via les options
+        options = {**options, '_today': datetime.now().strftime('%d/%m/%Y')}
+
+        # Créer le document Word depuis le modèle mis en cache
+        doc = Document(self._template_buf())
         
         # Configurer le document
         self.setup_document(doc)
-        
-        # Contenu du document
-        # Page de titre
-        self.create_title_page(doc, report_data, options)
-        
-        # Sommaire
-        self.create_table_of_contents(doc)
-        
-        # Contenu principal selon le type de rapport
-        if isinstance(report_data, BilanFonctionnel):
-            self.create_bilan_fonctionnel_content(doc, report_data, options)
-        elif isinstance(report_data, BilanFinancier):
-            self.create_bilan_financier_content(doc, report_data, options)
-        elif isinstance(report_data, PatrimoineEntreprise):
-            self.create_patrimoine_content(doc, report_data, options)
-        
-        # Annexes
-        if options.get('include_notes', True):
-            self.create_annexes(doc, report_data, options)
-        
-        # Sauvegarder le document
-        doc.save(str(file_path))
-        
+
+        # Détacher le sectPr final pendant la construction : chaque insertion
+        # devient un append en fin de corps, sans recherche du sectPr ni
+        # réinsertion avant lui élément par élément. Il est recollé une seule
+        # fois à la fin.
+        body = doc.element.body
+        sect_pr = body.find(qn('w:sectPr'))
+        if sect_pr is not None:
+            body.remove(sect_pr)
+        try:
+            # Contenu du document
+            # Page de titre
+            self.create_title_page(doc, report_data, options)
+
+            # Sommaire
+            self.create_table_of_contents(doc)
+
+            # Contenu principal selon le type de rapport
+            _, methode = _CONTENU_PAR_TYPE.get(type(report_data), (None, None))
+            if methode:
+                getattr(self, methode)(doc, report_data, options)
+
+            # Annexes
+            if options.get('include_notes', True):
+                self.create_annexes(doc, report_data, options)
+        finally:
+            if sect_pr is not None:
+                body.append(sect_pr)
+        
+        # Sauvegarder le document : le zip est assemblé en mémoire puis
+        # écrit sur disque en un seul write, au lieu des nombreuses petites
+        # écritures qu'émet zipfile quand il écrit directement le fichier
+        buf = io.BytesIO()
+        doc.save(buf)
+        file_path.write_bytes(buf.getbuffer())
+
         return str(file_path)
 
+    def export_batch(self, items: List[Tuple[Any, str, Dict[str, Any]]]) -> List[str]:
+        """
+        Exporter plusieurs rapports en parallèle, un par cœur.
+
+        Les rapports sont indépendants et l'exporteur est sans état : chaque
+        processus de travail rend sa part des documents pendant que les
+        autres cœurs font de même, le modèle de document étant préchargé une
+        fois par processus.
+
+        Args:
+            items: Liste de tuples (report_data, filename, options)
+
+        Returns:
+            Liste des chemins des fichiers générés, dans l'ordre d'entrée
+        """
+        with multiprocessing.Pool(initializer=_init_worker) as pool:
+            return pool.starmap(self.export, items)
+
     def setup_document(self, doc: Document):
         """Configurer les paramètres du document."""
         # Configurer les marges
@@ -85,18 +325,10 @@ class DocxExporter:
     def create_title_page(self, doc: Document, report_data, options: Dict[str, Any]):
         """Créer la page de titre."""
         # Ajouter des paragraphes vides pour l'espacement
-        for _ in range(8):
-            doc.add_paragraph()
+        _ajouter_paragraphes_vides(doc, 8)
         
         # Titre principal
-        if isinstance(report_data, BilanFonctionnel):
-            title = "BILAN FONCTIONNEL"
-        elif isinstance(report_data, BilanFinancier):
-            title = "BILAN FINANCIER"
-        elif isinstance(report_data, PatrimoineEntreprise):
-            title = "PATRIMOINE DE L'ENTREPRISE"
-        else:
-            title = "RAPPORT FINANCIER"
+        title, _ = _CONTENU_PAR_TYPE.get(type(report_data), ("RAPPORT FINANCIER", None))
         
         title_para = doc.add_paragraph(title)
         title_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -104,10 +336,9 @@ class DocxExporter:
         title_run.font.size = Pt(18)
         title_run.font.bold = True
         title_run.font.color.rgb = RGBColor(0, 0, 0)
-        
+
         # Espacement
-        for _ in range(3):
-            doc.add_paragraph()
+        _ajouter_paragraphes_vides(doc, 3)
         
         # Informations sur l'entreprise
         entreprise = options.get('entreprise', 'Entreprise')
@@ -116,18 +347,18 @@ class DocxExporter:
         
         info_para = doc.add_paragraph()
         info_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
-        info_para.add_run("Entreprise: ").bold = True
-        info_para.add_run(f"{entreprise}\n")
-        info_para.add_run("Période: ").bold = True
-        info_para.add_run(f"{periode}\n")
-        info_para.add_run("Devise: ").bold = True
-        info_para.add_run(f"{devise}\n")
-        info_para.add_run("Date d'édition: ").bold = True
-        info_para.add_run(f"{datetime.now().strftime('%d/%m/%Y')}")
-        
+        libelles = [
+            ("Entreprise: ", f"{entreprise}\n"),
+            ("Période: ", f"{periode}\n"),
+            ("Devise: ", f"{devise}\n"),
+            ("Date d'édition: ", options.get('_today') or datetime.now().strftime('%d/%m/%Y')),
+        ]
+        for libelle, valeur in libelles:
+            _bold_run(info_para, libelle)
+            info_para.add_run(valeur)
+
         # Espacement
-        for _ in range(3):
-            doc.add_paragraph()
+        _ajouter_paragraphes_vides(doc, 3)
         
         # Footer
         if options.get('include_logo', True):
@@ -138,8 +369,7 @@ class DocxExporter:
             logo_run.font.color.rgb = RGBColor(128, 128, 128)
         
         # Pied de page
-        for _ in range(2):
-            doc.add_paragraph()
+        _ajouter_paragraphes_vides(doc, 2)
         
         footer_para = doc.add_paragraph("Rapport généré par l'application de comptabilité professionnelle")
         footer_para.alignment = WD_ALIGN_PARAGRAPH.CENTER
@@ -150,7 +380,7 @@ class DocxExporter:
     def create_table_of_contents(self, doc: Document):
         """Créer le sommaire."""
         # Saut de page
-        doc.add_page_break()
+        _saut_de_page(doc)
         
         # Titre du sommaire
         toc_title = doc.add_paragraph("SOMMAIRE")
@@ -174,9 +404,8 @@ class DocxExporter:
         
         for title, page in toc_items:
             para = doc.add_paragraph()
+            para._p.get_or_add_pPr().append(deepcopy(_TABS_SOMMAIRE))
             para.add_run(title)
-            tab_stops = para.paragraph_format.tab_stops
-            tab_stops.add_tab_stop(Inches(6.0), WD_ALIGN_PARAGRAPH.RIGHT)
             para.add_run(f"\t{page}")
         
         doc.add_paragraph()
@@ -184,7 +413,7 @@ class DocxExporter:
     def create_bilan_fonctionnel_content(self, doc: Document, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer le contenu du bilan fonctionnel."""
         # Saut de page
-        doc.add_page_break()
+        _saut_de_page(doc)
         
         # Titre
         title = doc.add_paragraph("BILAN FONCTIONNEL")
@@ -192,11 +421,11 @@ class DocxExporter:
         title_run.font.size = Pt(14)
         title_run.font.bold = True
         
-        # Introduction
-        intro = doc.add_paragraph()
-        intro.add_run("Le bilan fonctionnel présente l'analyse de la structure financière de l'entreprise ")
-        intro.add_run("selon l'approche fonctionnelle. Il met en évidence les équilibres fondamentaux : ")
-        intro.add_run("Fonds de Roulement Net Global (FRNG), Besoin en Fonds de Roulement (BFR) et Trésorerie.")
+        # Introduction (un seul run : un seul élément <w:r> sérialisé)
+        doc.add_paragraph(
+            "Le bilan fonctionnel présente l'analyse de la structure financière de l'entreprise "
+            "selon l'approche fonctionnelle. Il met en évidence les équilibres fondamentaux : "
+            "Fonds de Roulement Net Global (FRNG), Besoin en Fonds de Roulement (BFR) et Trésorerie.")
         
         doc.add_paragraph()
         
@@ -230,7 +459,7 @@ class DocxExporter:
     def create_bilan_financier_content(self, doc: Document, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer le contenu du bilan financier."""
         # Saut de page
-        doc.add_page_break()
+        _saut_de_page(doc)
         
         # Titre
         title = doc.add_paragraph("BILAN FINANCIER")
@@ -238,11 +467,11 @@ class DocxExporter:
         title_run.font.size = Pt(14)
         title_run.font.bold = True
         
-        # Introduction
-        intro = doc.add_paragraph()
-        intro.add_run("Le bilan financier présente la situation patrimoniale de l'entreprise selon ")
-        intro.add_run("la présentation comptable classique. Il distingue clairement les actifs ")
-        intro.add_run("et les passifs pour évaluer la structure financière et la solvabilité.")
+        # Introduction (un seul run)
+        doc.add_paragraph(
+            "Le bilan financier présente la situation patrimoniale de l'entreprise selon "
+            "la présentation comptable classique. Il distingue clairement les actifs "
+            "et les passifs pour évaluer la structure financière et la solvabilité.")
         
         doc.add_paragraph()
         
@@ -278,7 +507,7 @@ class DocxExporter:
     def create_patrimoine_content(self, doc: Document, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]):
         """Créer le contenu du patrimoine."""
         # Saut de page
-        doc.add_page_break()
+        _saut_de_page(doc)
         
         # Titre
         title = doc.add_paragraph("PATRIMOINE DE L'ENTREPRISE")
@@ -286,11 +515,11 @@ class DocxExporter:
         title_run.font.size = Pt(14)
         title_run.font.bold = True
         
-        # Introduction
-        intro = doc.add_paragraph()
-        intro.add_run("L'analyse patrimoniale évalue la valeur réelle de l'entreprise en tenant compte ")
-        intro.add_run("de ses actifs économiques et de ses dettes. Elle permet d'apprécier la solidité ")
-        intro.add_run("financière et la capacité de l'entreprise à faire face à ses engagements.")
+        # Introduction (un seul run)
+        doc.add_paragraph(
+            "L'analyse patrimoniale évalue la valeur réelle de l'entreprise en tenant compte "
+            "de ses actifs économiques et de ses dettes. Elle permet d'apprécier la solidité "
+            "financière et la capacité de l'entreprise à faire face à ses engagements.")
         
         doc.add_paragraph()
         
@@ -318,155 +547,29 @@ class DocxExporter:
         analysis_text = self._analyze_patrimoine(patrimoine)
         analysis_para = doc.add_paragraph(analysis_text)
 
+    def _render_table(self, doc: Document, nom_spec: str, data, options: Dict[str, Any]):
+        """Rendre un tableau monétaire depuis sa spécification déclarative."""
+        entete, lignes, extracteur, sous_totaux, total = _TABLE_SPECS[nom_spec]
+        devise = options.get('devise', 'MAD')
+        table_data = _lignes_montants(entete, lignes, extracteur(data), devise)
+        _attacher_au_corps(
+            doc, self._build_table_xml(table_data, subtotal_rows=sous_totaux, total_row=total))
+
     def create_bilan_fonctionnel_table(self, doc: Document, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer le tableau du bilan fonctionnel."""
-        # Données du tableau
-        table_data = [
-            ["EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"],
-            ["EMPLOIS STABLES", f"{float(bilan.emplois_stables):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Ressources stables", f"{float(bilan.ressources_stables):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["FRNG", f"{float(bilan.frng):,.2f} {options.get('devise', 'MAD')}", "100%"],
-            ["", "", ""],
-            ["ACTIFS CIRCULANTS", f"{float(bilan.actifs_circulants):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Passifs circulants", f"{float(bilan.passifs_circulants):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["BFR", f"{float(bilan.bfr):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["", "", ""],
-            ["TRÉSORERIE ACTIVE", f"{float(bilan.tresorerie_active):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie passive", f"{float(bilan.tresorerie_passive):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TRÉSORERIE NETTE", f"{float(bilan.tresorerie_nette):,.2f} {options.get('devise', 'MAD')}", ""],
-        ]
-        
-        # Créer le tableau
-        table = doc.add_table(rows=len(table_data), cols=3)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        # Remplir le tableau
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                paragraph = cell.paragraphs[0]
-                run = paragraph.runs[0] if paragraph.runs else paragraph.add_run()
-                run.text = cell_data
-                
-                # Style
-                if i == 0:  # En-tête
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                elif i in [3, 7, 10]:  # Sous-totaux
-                    run.font.bold = True
-                    self.set_cell_background(cell, RGBColor(230, 230, 230))
-                elif i == 11:  # Total
-                    run.font.bold = True
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if j == 0 else WD_ALIGN_PARAGRAPH.RIGHT
+        self._render_table(doc, 'bilan_fonctionnel', bilan, options)
 
     def create_actif_table(self, doc: Document, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer le tableau de l'actif."""
-        table_data = [
-            ["Rubriques", "Montant", "Pourcentage"],
-            ["Immobilisations nettes", f"{float(bilan.immobilisations_nettes):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Stocks", f"{float(bilan.stocks):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Créances clients", f"{float(bilan.creances_clients):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Autres créances", f"{float(bilan.autres_creances):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie active", f"{float(bilan.tresorerie_active):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TOTAL ACTIF", f"{float(bilan.total_actif):,.2f} {options.get('devise', 'MAD')}", "100%"],
-        ]
-        
-        table = doc.add_table(rows=len(table_data), cols=3)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                paragraph = cell.paragraphs[0]
-                run = paragraph.runs[0] if paragraph.runs else paragraph.add_run()
-                run.text = cell_data
-                
-                if i == 0 or i == 6:  # En-tête et total
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if j == 0 else WD_ALIGN_PARAGRAPH.RIGHT
+        self._render_table(doc, 'actif', bilan, options)
 
     def create_passif_table(self, doc: Document, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer le tableau du passif."""
-        table_data = [
-            ["Rubriques", "Montant", "Pourcentage"],
-            ["Capital social", f"{float(bilan.capital_social):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Réserves", f"{float(bilan.reserves):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Résultat net", f"{float(bilan.resultat_net):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Capitaux propres", f"{float(bilan.capitaux_propres):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes financières LT", f"{float(bilan.dettes_financieres_lt):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes fournisseurs", f"{float(bilan.dettes_fournisseurs):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Autres dettes CT", f"{float(bilan.autres_dettes_ct):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie passive", f"{float(bilan.tresorerie_passive):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TOTAL PASSIF", f"{float(bilan.total_passif):,.2f} {options.get('devise', 'MAD')}", "100%"],
-        ]
-        
-        table = doc.add_table(rows=len(table_data), cols=3)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                paragraph = cell.paragraphs[0]
-                run = paragraph.runs[0] if paragraph.runs else paragraph.add_run()
-                run.text = cell_data
-                
-                if i == 0 or i == 9:  # En-tête et total
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                elif i == 4:  # Sous-total capitaux propres
-                    run.font.bold = True
-                    self.set_cell_background(cell, RGBColor(230, 230, 230))
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if j == 0 else WD_ALIGN_PARAGRAPH.RIGHT
+        self._render_table(doc, 'passif', bilan, options)
 
     def create_patrimoine_table(self, doc: Document, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]):
         """Créer le tableau patrimonial."""
-        table_data = [
-            ["ÉLÉMENTS PATRIMONIAUX", "Montant", "Pourcentage"],
-            ["Actifs économiques", f"{float(patrimoine.actifs_economiques):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes financières", f"{float(patrimoine.dettes_financieres):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Actif net comptable", f"{float(patrimoine.actif_net_comptable):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Capitaux propres retraités", f"{float(patrimoine.capitaux_propres_retraites):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["PATRIMOINE NET", f"{float(patrimoine.patrimoine_net):,.2f} {options.get('devise', 'MAD')}", "100%"],
-        ]
-        
-        table = doc.add_table(rows=len(table_data), cols=3)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                paragraph = cell.paragraphs[0]
-                run = paragraph.runs[0] if paragraph.runs else paragraph.add_run()
-                run.text = cell_data
-                
-                if i == 0 or i == 5:  # En-tête et total
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if j == 0 else WD_ALIGN_PARAGRAPH.RIGHT
+        self._render_table(doc, 'patrimoine', patrimoine, options)
 
     def create_ratios_table(self, doc: Document, patrimoine: PatrimoineEntreprise):
         """Créer le tableau des ratios."""
@@ -476,31 +579,13 @@ class DocxExporter:
             ["Ratio de solvabilité", f"{patrimoine.ratio_solvabilite or 0:.2f}", self._interpret_solvability(patrimoine.ratio_solvabilite)],
             ["Ratio de liquidité", f"{patrimoine.ratio_liquidite or 0:.2f}", self._interpret_ratio(patrimoine.ratio_liquidite, 1.0, 0.8)],
         ]
-        
-        table = doc.add_table(rows=len(table_data), cols=3)
-        table.style = 'Table Grid'
-        table.alignment = WD_TABLE_ALIGNMENT.CENTER
-        
-        for i, row_data in enumerate(table_data):
-            row = table.rows[i]
-            for j, cell_data in enumerate(row_data):
-                cell = row.cells[j]
-                paragraph = cell.paragraphs[0]
-                run = paragraph.runs[0] if paragraph.runs else paragraph.add_run()
-                run.text = cell_data
-                
-                if i == 0:  # En-tête
-                    run.font.bold = True
-                    run.font.color.rgb = RGBColor(255, 255, 255)
-                    self.set_cell_background(cell, RGBColor(51, 51, 51))
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.CENTER
-                else:
-                    paragraph.alignment = WD_ALIGN_PARAGRAPH.LEFT if j == 0 else WD_ALIGN_PARAGRAPH.CENTER
+
+        _attacher_au_corps(doc, self._build_table_xml(table_data, body_align='center'))
 
     def create_annexes(self, doc: Document, report_data, options: Dict[str, Any]):
         """Créer les annexes du rapport."""
         # Saut de page
-        doc.add_page_break()
+        _saut_de_page(doc)
         
         # Titre
         annexes_title = doc.add_paragraph("ANNEXES")
@@ -519,7 +604,7 @@ Source des données: Données comptables fournies par l'entreprise.
 Période de référence: {options.get('periode', '2024')}
 Devise: {options.get('devise', 'MAD')}
 Normes comptables: Plan Comptable Marocain
-Date d'édition: {datetime.now().strftime('%d/%m/%Y')}
+Date d'édition: {options.get('_today') or datetime.now().strftime('%d/%m/%Y')}
 
 Méthodes de calcul:
 • FRNG = Ressources stables - Emplois stables
@@ -550,84 +635,98 @@ pour une prise de décision éclairée.
         
         notes_para = doc.add_paragraph(notes_text.strip())
 
+    def _build_table_xml(self, table_data, subtotal_rows=(), total_row=None, body_align='right'):
+        """Construire un tableau complet comme sous-arbre <w:tbl> lxml.
+
+        L'accès cellule par cellule de python-docx (table.rows[i].cells[j])
+        reconstruit la grille de cellules à chaque lecture, ce qui rend le
+        remplissage quadratique. Ici le sous-arbre XML (lignes, cellules,
+        paragraphes, runs, fonds w:shd) est construit en une seule passe puis
+        rattaché au corps du document par l'appelant.
+        """
+        tbl = OxmlElement('w:tbl')
+        tbl_pr = OxmlElement('w:tblPr')
+        style = OxmlElement('w:tblStyle')
+        style.set(qn('w:val'), 'TableGrid')
+        jc_tbl = OxmlElement('w:jc')
+        jc_tbl.set(qn('w:val'), 'center')
+        tbl_pr.append(style)
+        tbl_pr.append(jc_tbl)
+        tbl.append(tbl_pr)
+        grille = OxmlElement('w:tblGrid')
+        for _ in table_data[0]:
+            grille.append(OxmlElement('w:gridCol'))
+        tbl.append(grille)
+
+        for i, row_data in enumerate(table_data):
+            inverse = i == 0 or i == total_row  # en-tête et total : fond sombre
+            sous_total = i in subtotal_rows
+            tr = OxmlElement('w:tr')
+            for j, cell_data in enumerate(row_data):
+                tc = OxmlElement('w:tc')
+                if inverse or sous_total:
+                    tc_pr = OxmlElement('w:tcPr')
+                    tc_pr.append(deepcopy(_SHD_SOMBRE if inverse else _SHD_CLAIR))
+                    tc.append(tc_pr)
+                p = OxmlElement('w:p')
+                if not sous_total:
+                    p_pr = OxmlElement('w:pPr')
+                    jc = OxmlElement('w:jc')
+                    jc.set(qn('w:val'),
+                           'center' if inverse else ('left' if j == 0 else body_align))
+                    p_pr.append(jc)
+                    p.append(p_pr)
+                r = OxmlElement('w:r')
+                if inverse or sous_total:
+                    r_pr = OxmlElement('w:rPr')
+                    r_pr.append(OxmlElement('w:b'))
+                    if inverse:
+                        couleur = OxmlElement('w:color')
+                        couleur.set(qn('w:val'), 'FFFFFF')
+                        r_pr.append(couleur)
+                    r.append(r_pr)
+                t = OxmlElement('w:t')
+                t.text = cell_data
+                r.append(t)
+                p.append(r)
+                tc.append(p)
+                tr.append(tc)
+            tbl.append(tr)
+        return tbl
+
     def set_cell_background(self, cell, color):
         """Définir la couleur de fond d'une cellule."""
         shading = OxmlElement('w:shd')
         shading.set(qn('w:fill'), f"{color.red:02x}{color.green:02x}{color.blue:02x}")
         cell._tc.get_or_add_tcPr().append(shading)
 
-    # Méthodes d'analyse (similaires à celles du PDFExporter)
+    # Méthodes d'analyse (similaires à celles du PDFExporter). Le texte est
+    # mémoïsé sur les valeurs numériques converties une fois en float : quand
+    # le même bilan part vers plusieurs formats d'export, l'analyse n'est
+    # calculée qu'une fois.
+    @staticmethod
+    def _indicateurs_fonctionnels(bilan: BilanFonctionnel) -> tuple:
+        """Convertir une seule fois les indicateurs du bilan fonctionnel."""
+        return float(bilan.frng), float(bilan.bfr), float(bilan.tresorerie_nette)
+
     def _analyze_bilan_fonctionnel(self, bilan: BilanFonctionnel) -> str:
         """Analyser le bilan fonctionnel."""
-        analyses = []
-        
-        if float(bilan.frng) > 0:
-            analyses.append("Le Fonds de Rouillage Net Global est positif, ce qui indique que les ressources stables financent correctement les emplois stables.")
-        else:
-            analyses.append("Le FRNG est négatif, ce qui révèle une dépendance aux financements à court terme pour couvrir les investissements.")
-        
-        if float(bilan.bfr) > 0:
-            analyses.append("Le Besoin en Fonds de Roulement est positif, ce qui signifie que le cycle d'exploitation nécessite un financement.")
-        else:
-            analyses.append("Le BFR est négatif, ce qui constitue une ressource de financement issue de l'exploitation.")
-        
-        if float(bilan.tresorerie_nette) > 0:
-            analyses.append("La trésorerie nette est positive, offrant une marge de sécurité financière.")
-        elif float(bilan.tresorerie_nette) < 0:
-            analyses.append("La trésorerie nette est négative, ce qui peut créer des tensions de liquidité.")
-        
-        return " ".join(analyses)
+        return _analyse_fonctionnelle(*self._indicateurs_fonctionnels(bilan))
 
     def _analyze_bilan_financier(self, bilan: BilanFinancier) -> str:
         """Analyser le bilan financier."""
-        analyses = []
-        
-        total_actif = float(bilan.total_actif)
-        if total_actif > 0:
-            ratio_immobilisations = float(bilan.immobilisations_nettes) / total_actif
-            ratio_capitaux_propres = float(bilan.capitaux_propres) / total_actif
-            
-            if ratio_immobilisations > 0.5:
-                analyses.append("L'entreprise présente une structure capitalistique marquée avec des immobilisations importantes.")
-            
-            if ratio_capitaux_propres > 0.5:
-                analyses.append("Les capitaux propres constituent la principale source de financement, assurant une bonne autonomie financière.")
-            elif ratio_capitaux_propres < 0.2:
-                analyses.append("L'entreprise dépend fortement de l'endettement pour son financement.")
-        
-        return " ".join(analyses)
+        return _analyse_financiere(
+            float(bilan.total_actif), float(bilan.immobilisations_nettes),
+            float(bilan.capitaux_propres))
 
     def _analyze_patrimoine(self, patrimoine: PatrimoineEntreprise) -> str:
         """Analyser le patrimoine."""
-        analyses = []
-        
-        if patrimoine.ratio_endettement and patrimoine.ratio_endettement < 0.5:
-            analyses.append("L'endettement est maîtrisé, offrant une bonne sécurité financière.")
-        elif patrimoine.ratio_endettement and patrimoine.ratio_endettement > 0.8:
-            analyses.append("L'endettement est élevé et peut compromettre la solvabilité à long terme.")
-        
-        if patrimoine.ratio_solvabilite and patrimoine.ratio_solvabilite > 1:
-            analyses.append("La solvabilité est assurée avec des capitaux propres supérieurs aux dettes.")
-        
-        return " ".join(analyses)
+        return _analyse_patrimoniale(
+            patrimoine.ratio_endettement, patrimoine.ratio_solvabilite)
 
     def _get_bilan_fonctionnel_recommendations(self, bilan: BilanFonctionnel) -> list:
         """Obtenir les recommandations pour le bilan fonctionnel."""
-        recommendations = []
-        
-        if float(bilan.frng) < 0:
-            recommendations.append("Renforcer les ressources stables (augmentation de capital, dettes à long terme)")
-        
-        if float(bilan.bfr) > float(bilan.frng):
-            recommendations.append("Optimiser le cycle d'exploitation pour réduire le BFR")
-        
-        if float(bilan.tresorerie_nette) < 0:
-            recommendations.append("Améliorer la gestion de trésorerie (negociation des délais, cession d'actifs)")
-        
-        if not recommendations:
-            recommendations.append("La structure financière est équilibrée, maintenir la politique actuelle")
-        
-        return recommendations
+        return list(_recommandations_fonctionnelles(*self._indicateurs_fonctionnels(bilan)))
 
     def _interpret_ratio(self, ratio: Optional[float], good_threshold: float, bad_threshold: float) -> str:
         """Interpréter un ratio."""
@@ -652,3 +751,85 @@ pour une prise de décision éclairée.
             return "🟡 Solvabilité moyenne"
         else:
             return "⚠️ Solvabilité faible"
+
+
+@lru_cache(maxsize=128)
+def _analyse_fonctionnelle(frng: float, bfr: float, tresorerie_nette: float) -> str:
+    """Texte d'analyse du bilan fonctionnel, mémoïsé sur ses indicateurs."""
+    analyses = []
+
+    if frng > 0:
+        analyses.append("Le Fonds de Rouillage Net Global est positif, ce qui indique que les ressources stables financent correctement les emplois stables.")
+    else:
+        analyses.append("Le FRNG est négatif, ce qui révèle une dépendance aux financements à court terme pour couvrir les investissements.")
+
+    if bfr > 0:
+        analyses.append("Le Besoin en Fonds de Roulement est positif, ce qui signifie que le cycle d'exploitation nécessite un financement.")
+    else:
+        analyses.append("Le BFR est négatif, ce qui constitue une ressource de financement issue de l'exploitation.")
+
+    if tresorerie_nette > 0:
+        analyses.append("La trésorerie nette est positive, offrant une marge de sécurité financière.")
+    elif tresorerie_nette < 0:
+        analyses.append("La trésorerie nette est négative, ce qui peut créer des tensions de liquidité.")
+
+    return " ".join(analyses)
+
+
+@lru_cache(maxsize=128)
+def _analyse_financiere(total_actif: float, immobilisations_nettes: float,
+                        capitaux_propres: float) -> str:
+    """Texte d'analyse du bilan financier, mémoïsé sur ses indicateurs."""
+    analyses = []
+
+    if total_actif > 0:
+        ratio_immobilisations = immobilisations_nettes / total_actif
+        ratio_capitaux_propres = capitaux_propres / total_actif
+
+        if ratio_immobilisations > 0.5:
+            analyses.append("L'entreprise présente une structure capitalistique marquée avec des immobilisations importantes.")
+
+        if ratio_capitaux_propres > 0.5:
+            analyses.append("Les capitaux propres constituent la principale source de financement, assurant une bonne autonomie financière.")
+        elif ratio_capitaux_propres < 0.2:
+            analyses.append("L'entreprise dépend fortement de l'endettement pour son financement.")
+
+    return " ".join(analyses)
+
+
+@lru_cache(maxsize=128)
+def _analyse_patrimoniale(ratio_endettement: Optional[float],
+                          ratio_solvabilite: Optional[float]) -> str:
+    """Texte d'analyse patrimoniale, mémoïsé sur ses ratios."""
+    analyses = []
+
+    if ratio_endettement and ratio_endettement < 0.5:
+        analyses.append("L'endettement est maîtrisé, offrant une bonne sécurité financière.")
+    elif ratio_endettement and ratio_endettement > 0.8:
+        analyses.append("L'endettement est élevé et peut compromettre la solvabilité à long terme.")
+
+    if ratio_solvabilite and ratio_solvabilite > 1:
+        analyses.append("La solvabilité est assurée avec des capitaux propres supérieurs aux dettes.")
+
+    return " ".join(analyses)
+
+
+@lru_cache(maxsize=128)
+def _recommandations_fonctionnelles(frng: float, bfr: float,
+                                    tresorerie_nette: float) -> tuple:
+    """Recommandations du bilan fonctionnel, mémoïsées sur ses indicateurs."""
+    recommendations = []
+
+    if frng < 0:
+        recommendations.append("Renforcer les ressources stables (augmentation de capital, dettes à long terme)")
+
+    if bfr > frng:
+        recommendations.append("Optimiser le cycle d'exploitation pour réduire le BFR")
+
+    if tresorerie_nette < 0:
+        recommendations.append("Améliorer la gestion de trésorerie (negociation des délais, cession d'actifs)")
+
+    if not recommendations:
+        recommendations.append("La structure financière est équilibrée, maintenir la politique actuelle")
+
+    return tuple(recommendations)
@@ -3,109 +3,251 @@ Exporteur de rapports au format Excel (XLSX).
 Génère des classeurs Excel avec formules et graphiques.
 """
 
-import os
+import io
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
+
+import numpy as np
 
 from openpyxl import Workbook
-from openpyxl.styles import Font, PatternFill, Alignment, Border, Side
-from openpyxl.chart import BarChart, Reference, LineChart
-from openpyxl.utils import get_column_letter
+from openpyxl.cell import WriteOnlyCell
+from openpyxl.styles import Font, PatternFill, Alignment, Border, Side, NamedStyle
 from openpyxl.worksheet.worksheet import Worksheet
 
 from core.models import BilanFonctionnel, BilanFinancier, PatrimoineEntreprise
 
+from ._ratios import ratios_financiers
+
+
+# Styles partagés (poids mouche) : openpyxl déduplique les styles identiques
+# dans sa table de styles, et une instance unique par style évite de
+# réallouer Font/PatternFill/Border à chaque export ou à chaque ligne.
+
+# Style pour les titres
+_TITLE_FONT = Font(name='Arial', size=14, bold=True, color='FFFFFF')
+_TITLE_FILL = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
+_TITLE_ALIGN = Alignment(horizontal='center', vertical='center')
+
+# Style pour les sous-titres
+_SUBTITLE_FONT = Font(name='Arial', size=12, bold=True, color='FFFFFF')
+_SUBTITLE_FILL = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
+
+# Style pour les en-têtes de tableau
+_HEADER_FONT = Font(name='Arial', size=10, bold=True, color='FFFFFF')
+_HEADER_FILL = PatternFill(start_color='70AD47', end_color='70AD47', fill_type='solid')
+_HEADER_ALIGN = Alignment(horizontal='center', vertical='center')
+
+# Style pour les totaux et sous-totaux
+_TOTAL_FONT = Font(name='Arial', size=10, bold=True, color='FFFFFF')
+_TOTAL_FILL = PatternFill(start_color='5B9BD5', end_color='5B9BD5', fill_type='solid')
+_SUBTOTAL_FONT = Font(bold=True)
+_SUBTOTAL_FILL = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
+
+# Alignements partagés des cellules de données
+_ALIGN_LEFT = Alignment(horizontal='left')
+_ALIGN_RIGHT = Alignment(horizontal='right')
+_ALIGN_CENTER = Alignment(horizontal='center')
+
+# Remplissages des verdicts d'analyse (vert favorable / rouge défavorable),
+# résolus par table plutôt que par tests d'appartenance dans les boucles
+_POS_FILL = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
+_NEG_FILL = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
+
+_FILL_PAR_VERDICT = {
+    "Positif": _POS_FILL, "Positive": _POS_FILL, "Équilibré": _POS_FILL,
+    "Négatif": _NEG_FILL, "Négative": _NEG_FILL, "Déséquilibré": _NEG_FILL,
+}
+
+# Verdicts patrimoniaux identifiés par leur premier caractère (émoji)
+_FILL_PAR_EMOJI = {"✅"[:1]: _POS_FILL, "⚠️"[:1]: _NEG_FILL}
+
+# Bordures
+_THIN_BORDER = Border(
+    left=Side(style='thin'),
+    right=Side(style='thin'),
+    top=Side(style='thin'),
+    bottom=Side(style='thin')
+)
+
+# Styles nommés partagés : enregistrés une fois par classeur, ils
+# remplacent quatre écritures d'attributs par cellule par une seule
+# affectation cell.style = 'nom', dédupliquée par openpyxl dans la table
+# de styles du fichier
+def _construire_styles_nommes():
+    titre = NamedStyle(name='excel_title')
+    titre.font = _TITLE_FONT
+    titre.fill = _TITLE_FILL
+    titre.alignment = _TITLE_ALIGN
+
+    entete = NamedStyle(name='excel_header')
+    entete.font = _HEADER_FONT
+    entete.fill = _HEADER_FILL
+    entete.alignment = _HEADER_ALIGN
+    entete.border = _THIN_BORDER
+
+    total = NamedStyle(name='excel_total')
+    total.font = _TOTAL_FONT
+    total.fill = _TOTAL_FILL
+    total.border = _THIN_BORDER
+
+    sous_total = NamedStyle(name='excel_subtotal')
+    sous_total.font = _SUBTOTAL_FONT
+    sous_total.fill = _SUBTOTAL_FILL
+    sous_total.border = _THIN_BORDER
+
+    return (titre, entete, total, sous_total)
+
+
+_STYLES_NOMMES = _construire_styles_nommes()
+
+# Rubriques des tableaux : libellés figés et extracteurs attrgetter (accès
+# attribut en C) pour sortir tous les champs d'un bilan en un seul appel
+_LIBELLES_ACTIF = ("Immobilisations nettes", "Stocks", "Créances clients",
+                   "Autres créances", "Trésorerie active")
+_GET_ACTIF = attrgetter('immobilisations_nettes', 'stocks', 'creances_clients',
+                        'autres_creances', 'tresorerie_active')
+
+_LIBELLES_PASSIF = ("Capital social", "Réserves", "Résultat net",
+                    "Capitaux propres", "Dettes financières LT",
+                    "Dettes fournisseurs", "Autres dettes CT",
+                    "Trésorerie passive")
+_GET_PASSIF = attrgetter('capital_social', 'reserves', 'resultat_net',
+                         'capitaux_propres', 'dettes_financieres_lt',
+                         'dettes_fournisseurs', 'autres_dettes_ct',
+                         'tresorerie_passive')
+
+_LIBELLES_PATRIMOINE = ("Actifs économiques", "Dettes financières",
+                        "Actif net comptable", "Capitaux propres retraités")
+_GET_PATRIMOINE = attrgetter('actifs_economiques', 'dettes_financieres',
+                             'actif_net_comptable', 'capitaux_propres_retraites')
+
+# Répartition par type de rapport : un accès dict sur type(report_data)
+# remplace les chaînes isinstance, comme dans l'exporteur DOCX
+_FEUILLES_PAR_TYPE = {
+    BilanFonctionnel: 'create_bilan_fonctionnel_sheets',
+    BilanFinancier: 'create_bilan_financier_sheets',
+    PatrimoineEntreprise: 'create_patrimoine_sheets',
+}
+
+_LIBELLE_PAR_TYPE = {
+    BilanFonctionnel: "Bilan fonctionnel",
+    BilanFinancier: "Bilan financier",
+    PatrimoineEntreprise: "Patrimoine de l'entreprise",
+}
+
+
+def _definir_largeurs(ws: Worksheet, largeurs: Dict[str, int]):
+    """Poser les largeurs de colonnes d'une feuille en un seul passage.
+
+    À appeler avant d'append des lignes : une feuille write-only ne
+    revient pas en arrière.
+    """
+    for lettre, largeur in largeurs.items():
+        ws.column_dimensions[lettre].width = largeur
+
 
 class ExcelExporter:
     """
     Exporteur pour générer des rapports Excel professionnels.
-    """
 
-    def __init__(self):
-        self.setup_styles()
-
-    def setup_styles(self):
-        """Configurer les styles pour Excel."""
-        # Style pour les titres
-        self.title_font = Font(name='Arial', size=14, bold=True, color='FFFFFF')
-        self.title_fill = PatternFill(start_color='366092', end_color='366092', fill_type='solid')
-        self.title_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Style pour les sous-titres
-        self.subtitle_font = Font(name='Arial', size=12, bold=True, color='FFFFFF')
-        self.subtitle_fill = PatternFill(start_color='4472C4', end_color='4472C4', fill_type='solid')
-        
-        # Style pour les en-têtes de tableau
-        self.header_font = Font(name='Arial', size=10, bold=True, color='FFFFFF')
-        self.header_fill = PatternFill(start_color='70AD47', end_color='70AD47', fill_type='solid')
-        self.header_alignment = Alignment(horizontal='center', vertical='center')
-        
-        # Style pour les totaux
-        self.total_font = Font(name='Arial', size=10, bold=True, color='FFFFFF')
-        self.total_fill = PatternFill(start_color='5B9BD5', end_color='5B9BD5', fill_type='solid')
-        
-        # Style pour les nombres
-        self.number_alignment = Alignment(horizontal='right')
-        
-        # Bordures
-        self.thin_border = Border(
-            left=Side(style='thin'),
-            right=Side(style='thin'),
-            top=Side(style='thin'),
-            bottom=Side(style='thin')
-        )
+    Le classeur est construit en mode write-only d'openpyxl : chaque ligne
+    est envoyée au flux XML dès son append, sans retenir d'arbre de cellules
+    en mémoire. Les feuilles s'écrivent donc strictement de haut en bas et
+    la feuille de résumé est créée en premier (plus de move_sheet possible).
+    C'est l'équivalent openpyxl du mode constant_memory de xlsxwriter :
+    l'empreinte mémoire reste bornée quelle que soit la taille du classeur.
+    """
 
     def export(self, report_data, filename: str, options: Dict[str, Any]) -> str:
         """
         Exporter un rapport au format Excel.
-        
+
         Args:
             report_data: Données du rapport (BilanFonctionnel, BilanFinancier, etc.)
             filename: Nom du fichier de sortie
             options: Options d'exportation
-            
+
         Returns:
             Chemin du fichier généré
         """
         # Créer le répertoire d'export si nécessaire
         export_dir = Path("exports")
         export_dir.mkdir(exist_ok=True)
-        
+
         file_path = export_dir / filename
-        
-        # Créer le classeur
-        wb = Workbook()
-        
-        # Supprimer la feuille par défaut
-        wb.remove(wb.active)
-        
-        # Contenu du classeur
-        if isinstance(report_data, BilanFonctionnel):
-            self.create_bilan_fonctionnel_sheets(wb, report_data, options)
-        elif isinstance(report_data, BilanFinancier):
-            self.create_bilan_financier_sheets(wb, report_data, options)
-        elif isinstance(report_data, PatrimoineEntreprise):
-            self.create_patrimoine_sheets(wb, report_data, options)
-        
-        # Feuille de résumé
+
+        # Horloge lue une seule fois : le même horodatage apparaît sur
+        # toutes les feuilles du classeur
+        maintenant = datetime.now()
+        options = {
+            **options,
+            '_date': maintenant.strftime('%d/%m/%Y'),
+            '_datetime': maintenant.strftime('%d/%m/%Y %H:%M'),
+        }
+
+        # Créer le classeur en mode write-only (flux direct vers le XML)
+        wb = Workbook(write_only=True)
+        for style in _STYLES_NOMMES:
+            wb.add_named_style(style)
+
+        # Feuille de résumé en premier : une feuille write-only ne peut
+        # plus être déplacée après coup
         self.create_summary_sheet(wb, report_data, options)
-        
-        # Sauvegarder le classeur
-        wb.save(str(file_path))
-        
+
+        # Contenu du classeur
+        methode = _FEUILLES_PAR_TYPE.get(type(report_data))
+        if methode:
+            getattr(self, methode)(wb, report_data, options)
+
+        # Sérialiser le zip xlsx en mémoire puis l'écrire sur disque en une
+        # seule écriture contiguë
+        buf = io.BytesIO()
+        wb.save(buf)
+        file_path.write_bytes(buf.getbuffer())
+
         return str(file_path)
 
+    # Construction de cellules write-only stylées en un seul passage
+    def _cellule(self, ws, valeur, style=None, font=None, fill=None,
+                 alignment=None, border=None, number_format=None):
+        """Construire une cellule write-only avec ses styles."""
+        cell = WriteOnlyCell(ws, value=valeur)
+        if style is not None:
+            cell.style = style
+        if font is not None:
+            cell.font = font
+        if fill is not None:
+            cell.fill = fill
+        if alignment is not None:
+            cell.alignment = alignment
+        if border is not None:
+            cell.border = border
+        if number_format is not None:
+            cell.number_format = number_format
+        return cell
+
+    def _ligne_titre(self, ws, texte, plage):
+        """Écrire la ligne de titre fusionnée d'une feuille."""
+        ws.append([self._cellule(ws, texte, style='excel_title')])
+        ws.merged_cells.ranges.add(plage)
+
+    def _ligne_entetes(self, ws, headers):
+        """Construire la ligne d'en-têtes d'un tableau."""
+        return [self._cellule(ws, header, style='excel_header')
+                for header in headers]
+
     def create_bilan_fonctionnel_sheets(self, wb: Workbook, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer les feuilles pour le bilan fonctionnel."""
         # Feuille principale
         ws = wb.create_sheet("Bilan Fonctionnel")
         self.create_bilan_fonctionnel_main(ws, bilan, options)
-        
+
         # Feuille d'analyse
         ws_analysis = wb.create_sheet("Analyse")
         self.create_bilan_fonctionnel_analysis(ws_analysis, bilan, options)
-        
+
         # Feuille de graphiques
         if options.get('include_charts', True):
             ws_charts = wb.create_sheet("Graphiques")
@@ -113,36 +255,26 @@ class ExcelExporter:
 
     def create_bilan_fonctionnel_main(self, ws: Worksheet, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer la feuille principale du bilan fonctionnel."""
+        # Largeur des colonnes
+        _definir_largeurs(ws, {'A': 25, 'B': 15, 'C': 12})
+
         # Titre
-        ws.merge_cells('A1:C1')
-        title_cell = ws['A1']
-        title_cell.value = "BILAN FONCTIONNEL"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "BILAN FONCTIONNEL", 'A1:C1')
+        ws.append([])
+
         # Informations
-        ws['A3'] = "Entreprise:"
-        ws['B3'] = options.get('entreprise', 'Entreprise')
-        ws['A4'] = "Période:"
-        ws['B4'] = options.get('periode', '2024')
-        ws['A5'] = "Devise:"
-        ws['B5'] = options.get('devise', 'MAD')
-        ws['A6'] = "Date:"
-        ws['B6'] = datetime.now().strftime('%d/%m/%Y')
-        
+        ws.append(["Entreprise:", options.get('entreprise', 'Entreprise')])
+        ws.append(["Période:", options.get('periode', '2024')])
+        ws.append(["Devise:", options.get('devise', 'MAD')])
+        ws.append(["Date:", options.get('_date') or datetime.now().strftime('%d/%m/%Y')])
+        ws.append([])
+
         # Tableau principal
         row_start = 8
-        
+
         # En-têtes
-        headers = ["EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
+        ws.append(self._ligne_entetes(ws, ["EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"]))
+
         # Données
         data = [
             ("EMPLOIS STABLES", float(bilan.emplois_stables), ""),
@@ -157,103 +289,79 @@ class ExcelExporter:
             ("Trésorerie passive", float(bilan.tresorerie_passive), ""),
             ("TRÉSORERIE NETTE", float(bilan.tresorerie_nette), "=B18-B17"),
         ]
-        
+
+        # Lignes de sous-totaux (FRNG, BFR, trésorerie nette) figées hors boucle
+        sous_totaux = (row_start + 3, row_start + 7, row_start + 11)
+
         for i, (label, montant, formule) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=label)
-            
-            if formule:
-                ws.cell(row=i, column=2, value=formule)
+            if i in sous_totaux:  # Sous-totaux
+                style = 'excel_subtotal'
+                align_a = align_bc = None
+            elif i == row_start + 12:  # Total
+                style = 'excel_total'
+                align_a = align_bc = None
             else:
-                ws.cell(row=i, column=2, value=montant)
-            
-            ws.cell(row=i, column=3, value="")
-            
-            # Style
-            for col in range(1, 4):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                
-                if i in [row_start + 3, row_start + 7, row_start + 11]:  # Sous-totaux
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-                elif i == row_start + 12:  # Total
-                    cell.font = self.total_font
-                    cell.fill = self.total_fill
-                else:
-                    cell.alignment = Alignment(horizontal='left' if col == 1 else 'right')
-        
-        # Formatage des nombres
-        for row in range(row_start + 1, row_start + 13):
-            cell = ws.cell(row=row, column=2)
-            cell.number_format = '#,##0.00'
-        
-        # Largeur des colonnes
-        ws.column_dimensions['A'].width = 25
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 12
+                style = None
+                align_a = _ALIGN_LEFT
+                align_bc = _ALIGN_RIGHT
+            bordure = None if style else _THIN_BORDER
+
+            ws.append([
+                self._cellule(ws, label, style=style,
+                              alignment=align_a, border=bordure),
+                self._cellule(ws, formule if formule else montant, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='#,##0.00'),
+                self._cellule(ws, "", style=style,
+                              alignment=align_bc, border=bordure),
+            ])
 
     def create_bilan_fonctionnel_analysis(self, ws: Worksheet, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer la feuille d'analyse du bilan fonctionnel."""
+        # Largeur des colonnes
+        _definir_largeurs(ws, {'A': 15, 'B': 15, 'C': 15, 'D': 15})
+
         # Titre
-        ws.merge_cells('A1:D1')
-        title_cell = ws['A1']
-        title_cell.value = "ANALYSE FONCTIONNELLE"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "ANALYSE FONCTIONNELLE", 'A1:D1')
+        ws.append([])
+
         # Tableau d'analyse
         row_start = 3
-        
+
         # En-têtes
-        headers = ["Indicateur", "Valeur", "Seuil", "Interprétation"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
+        ws.append(self._ligne_entetes(ws, ["Indicateur", "Valeur", "Seuil", "Interprétation"]))
+
         # Données d'analyse
         frng = float(bilan.frng)
         bfr = float(bilan.bfr)
         treso_nette = float(bilan.tresorerie_nette)
-        
+
+        ecart = abs(frng - (bfr + treso_nette))
+
         data = [
             ("FRNG", frng, "> 0", "Positif" if frng > 0 else "Négatif"),
             ("BFR", bfr, "Variable", "Positif" if bfr > 0 else "Négatif"),
             ("Trésorerie nette", treso_nette, "> 0", "Positive" if treso_nette > 0 else "Négative"),
-            ("Équilibre", abs(frng - (bfr + treso_nette)), "= 0", "Équilibré" if abs(frng - (bfr + treso_nette)) < 0.01 else "Déséquilibré"),
+            ("Équilibre", ecart, "= 0", "Équilibré" if ecart < 0.01 else "Déséquilibré"),
         ]
-        
-        for i, (indicateur, valeur, seuil, interpretation) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=indicateur)
-            ws.cell(row=i, column=2, value=valeur)
-            ws.cell(row=i, column=3, value=seuil)
-            ws.cell(row=i, column=4, value=interpretation)
-            
-            # Style
-            for col in range(1, 5):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                cell.alignment = Alignment(horizontal='center')
-                
-                if interpretation in ["Positif", "Positive", "Équilibré"]:
-                    cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                elif interpretation in ["Négatif", "Négative", "Déséquilibré"]:
-                    cell.fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-        
-        # Formatage des nombres
-        for row in range(row_start + 1, row_start + 5):
-            cell = ws.cell(row=row, column=2)
-            cell.number_format = '#,##0.00'
-        
-        # Largeur des colonnes
-        for col in ['A', 'B', 'C', 'D']:
-            ws.column_dimensions[col].width = 15
+
+        for indicateur, valeur, seuil, interpretation in data:
+            fill = _FILL_PAR_VERDICT.get(interpretation)
+
+            ws.append([
+                self._cellule(ws, indicateur, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+                self._cellule(ws, valeur, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER,
+                              number_format='#,##0.00'),
+                self._cellule(ws, seuil, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+                self._cellule(ws, interpretation, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+            ])
 
     def create_bilan_fonctionnel_charts(self, ws: Worksheet, bilan: BilanFonctionnel, options: Dict[str, Any]):
         """Créer les graphiques du bilan fonctionnel."""
+        # Import différé : openpyxl.chart tire un sous-arbre conséquent qui
+        # n'est utile que si la feuille de graphiques est demandée
+        from openpyxl.chart import BarChart, Reference
+
         # Données pour les graphiques
         chart_data = [
             ["Rubrique", "Montant"],
@@ -267,12 +375,11 @@ class ExcelExporter:
             ["Trésorerie passive", float(bilan.tresorerie_passive)],
             ["Trésorerie nette", float(bilan.tresorerie_nette)],
         ]
-        
+
         # Ajouter les données
-        for row_idx, row_data in enumerate(chart_data, 1):
-            for col_idx, value in enumerate(row_data, 1):
-                ws.cell(row=row_idx, column=col_idx, value=value)
-        
+        for row_data in chart_data:
+            ws.append(row_data)
+
         # Graphique en barres
         chart = BarChart()
         chart.type = "col"
@@ -280,14 +387,14 @@ class ExcelExporter:
         chart.title = "Structure financière"
         chart.y_axis.title = "Montant"
         chart.x_axis.title = "Rubriques"
-        
+
         # Références des données
         data_ref = Reference(ws, min_col=2, min_row=2, max_row=len(chart_data), max_col=2)
         labels_ref = Reference(ws, min_col=1, min_row=2, max_row=len(chart_data), max_col=1)
-        
+
         chart.add_data(data_ref, titles_from_data=False)
         chart.set_categories(labels_ref)
-        
+
         # Position du graphique
         ws.add_chart(chart, "F2")
 
@@ -296,11 +403,11 @@ class ExcelExporter:
         # Feuille Actif
         ws_actif = wb.create_sheet("Actif")
         self.create_actif_sheet(ws_actif, bilan, options)
-        
+
         # Feuille Passif
         ws_passif = wb.create_sheet("Passif")
         self.create_passif_sheet(ws_passif, bilan, options)
-        
+
         # Feuille Ratios
         ws_ratios = wb.create_sheet("Ratios")
         self.create_ratios_sheet(ws_ratios, bilan, options)
@@ -308,195 +415,144 @@ class ExcelExporter:
     def create_actif_sheet(self, ws: Worksheet, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer la feuille de l'actif."""
         # Titre
-        ws.merge_cells('A1:C1')
-        title_cell = ws['A1']
-        title_cell.value = "ACTIF"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "ACTIF", 'A1:C1')
+        ws.append([])
+
         # Tableau
         row_start = 3
-        
+
         # En-têtes
-        headers = ["Rubriques", "Montant", "Pourcentage"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
-        # Données
+        ws.append(self._ligne_entetes(ws, ["Rubriques", "Montant", "Pourcentage"]))
+
+        # Données : montants extraits en un appel et portés par un tableau
+        # NumPy plutôt que des float(...) champ par champ
         total_actif = float(bilan.total_actif)
-        data = [
-            ("Immobilisations nettes", float(bilan.immobilisations_nettes)),
-            ("Stocks", float(bilan.stocks)),
-            ("Créances clients", float(bilan.creances_clients)),
-            ("Autres créances", float(bilan.autres_creances)),
-            ("Trésorerie active", float(bilan.tresorerie_active)),
-            ("TOTAL ACTIF", total_actif),
-        ]
-        
+        valeurs = np.array(_GET_ACTIF(bilan), dtype=np.float64)
+        data = [*zip(_LIBELLES_ACTIF, valeurs.tolist()), ("TOTAL ACTIF", total_actif)]
+
+        # Ligne du total et référence du diviseur calculées une fois
+        total_row = row_start + len(data)
+        divisor_ref = f"B{total_row}"
+
         for i, (label, montant) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=label)
-            ws.cell(row=i, column=2, value=montant)
-            
-            # Pourcentage
-            if i == row_start + 5:  # Total
-                ws.cell(row=i, column=3, value="100%")
+            if i == total_row:  # Total
+                valeur_pct = "100%"
+                style = 'excel_total'
+                align_a = align_bc = None
             else:
-                pct = (montant / total_actif * 100) if total_actif > 0 else 0
-                ws.cell(row=i, column=3, value=f"=B{i}/B{row_start + 5}")
-            
-            # Style
-            for col in range(1, 4):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                
-                if i == row_start + 5:  # Total
-                    cell.font = self.total_font
-                    cell.fill = self.total_fill
-                else:
-                    cell.alignment = Alignment(horizontal='left' if col == 1 else 'right')
-        
-        # Formatage
-        for row in range(row_start + 1, row_start + 6):
-            ws.cell(row=row, column=2).number_format = '#,##0.00'
-            ws.cell(row=row, column=3).number_format = '0.00%'
+                valeur_pct = f"=B{i}/{divisor_ref}"
+                style = None
+                align_a = _ALIGN_LEFT
+                align_bc = _ALIGN_RIGHT
+            bordure = None if style else _THIN_BORDER
+
+            ws.append([
+                self._cellule(ws, label, style=style,
+                              alignment=align_a, border=bordure),
+                self._cellule(ws, montant, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='#,##0.00'),
+                self._cellule(ws, valeur_pct, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='0.00%'),
+            ])
 
     def create_passif_sheet(self, ws: Worksheet, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer la feuille du passif."""
         # Titre
-        ws.merge_cells('A1:C1')
-        title_cell = ws['A1']
-        title_cell.value = "PASSIF"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "PASSIF", 'A1:C1')
+        ws.append([])
+
         # Tableau
         row_start = 3
-        
+
         # En-têtes
-        headers = ["Rubriques", "Montant", "Pourcentage"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
-        # Données
+        ws.append(self._ligne_entetes(ws, ["Rubriques", "Montant", "Pourcentage"]))
+
+        # Données : montants extraits en un appel et portés par un tableau
+        # NumPy plutôt que des float(...) champ par champ
         total_passif = float(bilan.total_passif)
-        data = [
-            ("Capital social", float(bilan.capital_social)),
-            ("Réserves", float(bilan.reserves)),
-            ("Résultat net", float(bilan.resultat_net)),
-            ("Capitaux propres", float(bilan.capitaux_propres)),
-            ("Dettes financières LT", float(bilan.dettes_financieres_lt)),
-            ("Dettes fournisseurs", float(bilan.dettes_fournisseurs)),
-            ("Autres dettes CT", float(bilan.autres_dettes_ct)),
-            ("Trésorerie passive", float(bilan.tresorerie_passive)),
-            ("TOTAL PASSIF", total_passif),
-        ]
-        
+        valeurs = np.array(_GET_PASSIF(bilan), dtype=np.float64)
+        data = [*zip(_LIBELLES_PASSIF, valeurs.tolist()), ("TOTAL PASSIF", total_passif)]
+
+        # Ligne du total et référence du diviseur calculées une fois
+        total_row = row_start + len(data)
+        divisor_ref = f"B{total_row}"
+
         for i, (label, montant) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=label)
-            ws.cell(row=i, column=2, value=montant)
-            
-            # Pourcentage
-            if i == row_start + 8:  # Total
-                ws.cell(row=i, column=3, value="100%")
+            if i == total_row:  # Total
+                valeur_pct = "100%"
+                style = 'excel_total'
+                align_a = align_bc = None
+            elif i == row_start + 4:  # Sous-total capitaux propres
+                valeur_pct = f"=B{i}/{divisor_ref}"
+                style = 'excel_subtotal'
+                align_a = align_bc = None
             else:
-                pct = (montant / total_passif * 100) if total_passif > 0 else 0
-                ws.cell(row=i, column=3, value=f"=B{i}/B{row_start + 8}")
-            
-            # Style
-            for col in range(1, 4):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                
-                if i == row_start + 4:  # Sous-total capitaux propres
-                    cell.font = Font(bold=True)
-                    cell.fill = PatternFill(start_color='D9E1F2', end_color='D9E1F2', fill_type='solid')
-                elif i == row_start + 8:  # Total
-                    cell.font = self.total_font
-                    cell.fill = self.total_fill
-                else:
-                    cell.alignment = Alignment(horizontal='left' if col == 1 else 'right')
-        
-        # Formatage
-        for row in range(row_start + 1, row_start + 9):
-            ws.cell(row=row, column=2).number_format = '#,##0.00'
-            ws.cell(row=row, column=3).number_format = '0.00%'
+                valeur_pct = f"=B{i}/{divisor_ref}"
+                style = None
+                align_a = _ALIGN_LEFT
+                align_bc = _ALIGN_RIGHT
+            bordure = None if style else _THIN_BORDER
+
+            ws.append([
+                self._cellule(ws, label, style=style,
+                              alignment=align_a, border=bordure),
+                self._cellule(ws, montant, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='#,##0.00'),
+                self._cellule(ws, valeur_pct, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='0.00%'),
+            ])
 
     def create_ratios_sheet(self, ws: Worksheet, bilan: BilanFinancier, options: Dict[str, Any]):
         """Créer la feuille des ratios."""
         # Titre
-        ws.merge_cells('A1:D1')
-        title_cell = ws['A1']
-        title_cell.value = "RATIOS FINANCIERS"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
-        # Calcul des ratios
-        total_actif = float(bilan.total_actif)
-        total_passif = float(bilan.total_passif)
-        capitaux_propres = float(bilan.capitaux_propres)
-        dettes_totales = total_passif - capitaux_propres
-        
+        self._ligne_titre(ws, "RATIOS FINANCIERS", 'A1:D1')
+        ws.append([])
+
+        # Calcul des trois ratios par le noyau compilé (chauffé à l'import)
+        endettement, autonomie, liquidite = ratios_financiers(
+            float(bilan.total_actif), float(bilan.total_passif),
+            float(bilan.capitaux_propres), float(bilan.stocks),
+            float(bilan.creances_clients), float(bilan.tresorerie_active),
+            float(bilan.dettes_fournisseurs))
+
         ratios = [
-            ("Ratio d'endettement", dettes_totales / total_actif if total_actif > 0 else 0, "< 70%"),
-            ("Ratio d'autonomie", capitaux_propres / total_passif if total_passif > 0 else 0, "> 50%"),
-            ("Ratio de liquidité générale", (float(bilan.stocks) + float(bilan.creances_clients) + float(bilan.tresorerie_active)) / float(bilan.dettes_fournisseurs) if float(bilan.dettes_fournisseurs) > 0 else 0, "> 1"),
+            ("Ratio d'endettement", endettement, "< 70%"),
+            ("Ratio d'autonomie", autonomie, "> 50%"),
+            ("Ratio de liquidité générale", liquidite, "> 1"),
         ]
-        
-        # Tableau
-        row_start = 3
-        
+
         # En-têtes
-        headers = ["Ratio", "Valeur", "Formule", "Recommandation"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
+        ws.append(self._ligne_entetes(ws, ["Ratio", "Valeur", "Formule", "Recommandation"]))
+
         # Données
-        for i, (ratio, valeur, recommandation) in enumerate(ratios, row_start + 1):
-            ws.cell(row=i, column=1, value=ratio)
-            ws.cell(row=i, column=2, value=valeur)
-            ws.cell(row=i, column=3, value=self._get_ratio_formula(ratio))
-            ws.cell(row=i, column=4, value=recommandation)
-            
-            # Style
-            for col in range(1, 5):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                cell.alignment = Alignment(horizontal='center')
-                
-                # Coloration selon la valeur
-                if col == 2:
-                    if ratio == "Ratio d'endettement" and valeur < 0.7:
-                        cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                    elif ratio == "Ratio d'autonomie" and valeur > 0.5:
-                        cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                    elif ratio == "Ratio de liquidité générale" and valeur > 1:
-                        cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-        
-        # Formatage
-        for row in range(row_start + 1, row_start + 4):
-            ws.cell(row=row, column=2).number_format = '0.00%'
+        for ratio, valeur, recommandation in ratios:
+            # Coloration selon la valeur
+            if ((ratio == "Ratio d'endettement" and valeur < 0.7)
+                    or (ratio == "Ratio d'autonomie" and valeur > 0.5)
+                    or (ratio == "Ratio de liquidité générale" and valeur > 1)):
+                fill_valeur = _POS_FILL
+            else:
+                fill_valeur = None
+
+            ws.append([
+                self._cellule(ws, ratio, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+                self._cellule(ws, valeur, fill=fill_valeur, alignment=_ALIGN_CENTER,
+                              border=_THIN_BORDER, number_format='0.00%'),
+                self._cellule(ws, self._get_ratio_formula(ratio), alignment=_ALIGN_CENTER,
+                              border=_THIN_BORDER),
+                self._cellule(ws, recommandation, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+            ])
 
     def create_patrimoine_sheets(self, wb: Workbook, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]):
         """Créer les feuilles pour le patrimoine."""
         # Feuille principale
         ws = wb.create_sheet("Patrimoine")
         self.create_patrimoine_main(ws, patrimoine, options)
-        
+
         # Feuille d'analyse
         ws_analysis = wb.create_sheet("Analyse Patrimoniale")
         self.create_patrimoine_analysis(ws_analysis, patrimoine, options)
@@ -504,192 +560,146 @@ class ExcelExporter:
     def create_patrimoine_main(self, ws: Worksheet, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]):
         """Créer la feuille principale du patrimoine."""
         # Titre
-        ws.merge_cells('A1:C1')
-        title_cell = ws['A1']
-        title_cell.value = "PATRIMOINE DE L'ENTREPRISE"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "PATRIMOINE DE L'ENTREPRISE", 'A1:C1')
+        ws.append([])
+
         # Tableau
         row_start = 3
-        
+
         # En-têtes
-        headers = ["Éléments patrimoniaux", "Montant", "Pourcentage"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
-        # Données
+        ws.append(self._ligne_entetes(ws, ["Éléments patrimoniaux", "Montant", "Pourcentage"]))
+
+        # Données : montants extraits en un appel et portés par un tableau
+        # NumPy plutôt que des float(...) champ par champ
         patrimoine_net = float(patrimoine.patrimoine_net)
-        data = [
-            ("Actifs économiques", float(patrimoine.actifs_economiques)),
-            ("Dettes financières", float(patrimoine.dettes_financieres)),
-            ("Actif net comptable", float(patrimoine.actif_net_comptable)),
-            ("Capitaux propres retraités", float(patrimoine.capitaux_propres_retraites)),
-            ("PATRIMOINE NET", patrimoine_net),
-        ]
-        
+        valeurs = np.array(_GET_PATRIMOINE(patrimoine), dtype=np.float64)
+        data = [*zip(_LIBELLES_PATRIMOINE, valeurs.tolist()),
+                ("PATRIMOINE NET", patrimoine_net)]
+
+        # Ligne du total et référence du diviseur calculées une fois
+        total_row = row_start + len(data)
+        divisor_ref = f"B{total_row}"
+
         for i, (label, montant) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=label)
-            ws.cell(row=i, column=2, value=montant)
-            
-            # Pourcentage
-            if i == row_start + 4:  # Total
-                ws.cell(row=i, column=3, value="100%")
+            if i == total_row:  # Total
+                valeur_pct = "100%"
+                style = 'excel_total'
+                align_a = align_bc = None
             else:
-                pct = (montant / patrimoine_net * 100) if patrimoine_net > 0 else 0
-                ws.cell(row=i, column=3, value=f"=B{i}/B{row_start + 4}")
-            
-            # Style
-            for col in range(1, 4):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                
-                if i == row_start + 4:  # Total
-                    cell.font = self.total_font
-                    cell.fill = self.total_fill
-                else:
-                    cell.alignment = Alignment(horizontal='left' if col == 1 else 'right')
-        
-        # Formatage
-        for row in range(row_start + 1, row_start + 5):
-            ws.cell(row=row, column=2).number_format = '#,##0.00'
-            ws.cell(row=row, column=3).number_format = '0.00%'
+                valeur_pct = f"=B{i}/{divisor_ref}"
+                style = None
+                align_a = _ALIGN_LEFT
+                align_bc = _ALIGN_RIGHT
+            bordure = None if style else _THIN_BORDER
+
+            ws.append([
+                self._cellule(ws, label, style=style,
+                              alignment=align_a, border=bordure),
+                self._cellule(ws, montant, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='#,##0.00'),
+                self._cellule(ws, valeur_pct, style=style,
+                              alignment=align_bc, border=bordure,
+                              number_format='0.00%'),
+            ])
 
     def create_patrimoine_analysis(self, ws: Worksheet, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]):
         """Créer la feuille d'analyse patrimoniale."""
         # Titre
-        ws.merge_cells('A1:D1')
-        title_cell = ws['A1']
-        title_cell.value = "ANALYSE PATRIMONIALE"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "ANALYSE PATRIMONIALE", 'A1:D1')
+        ws.append([])
+
         # Tableau des ratios
         row_start = 3
-        
+
         # En-têtes
-        headers = ["Ratio", "Valeur", "Seuil", "Interprétation"]
-        for col, header in enumerate(headers, 1):
-            cell = ws.cell(row=row_start, column=col, value=header)
-            cell.font = self.header_font
-            cell.fill = self.header_fill
-            cell.alignment = self.header_alignment
-            cell.border = self.thin_border
-        
+        ws.append(self._ligne_entetes(ws, ["Ratio", "Valeur", "Seuil", "Interprétation"]))
+
         # Données
         data = [
             ("Ratio d'endettement", patrimoine.ratio_endettement or 0, "< 50%", self._interpret_ratio(patrimoine.ratio_endettement, 0.5, 0.8)),
             ("Ratio de solvabilité", patrimoine.ratio_solvabilite or 0, "> 1", self._interpret_solvability(patrimoine.ratio_solvabilite)),
             ("Ratio de liquidité", patrimoine.ratio_liquidite or 0, "> 1", self._interpret_ratio(patrimoine.ratio_liquidite, 1.0, 0.8)),
         ]
-        
-        for i, (ratio, valeur, seuil, interpretation) in enumerate(data, row_start + 1):
-            ws.cell(row=i, column=1, value=ratio)
-            ws.cell(row=i, column=2, value=valeur)
-            ws.cell(row=i, column=3, value=seuil)
-            ws.cell(row=i, column=4, value=interpretation)
-            
-            # Style
-            for col in range(1, 5):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                cell.alignment = Alignment(horizontal='center')
-                
-                # Coloration selon l'interprétation
-                if interpretation.startswith("✅"):
-                    cell.fill = PatternFill(start_color='C6EFCE', end_color='C6EFCE', fill_type='solid')
-                elif interpretation.startswith("⚠️"):
-                    cell.fill = PatternFill(start_color='FFC7CE', end_color='FFC7CE', fill_type='solid')
-        
-        # Formatage
-        for row in range(row_start + 1, row_start + 4):
-            ws.cell(row=row, column=2).number_format = '0.00%'
+
+        for ratio, valeur, seuil, interpretation in data:
+            # Coloration selon l'interprétation
+            fill = _FILL_PAR_EMOJI.get(interpretation[:1])
+
+            ws.append([
+                self._cellule(ws, ratio, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+                self._cellule(ws, valeur, fill=fill, alignment=_ALIGN_CENTER,
+                              border=_THIN_BORDER, number_format='0.00%'),
+                self._cellule(ws, seuil, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+                self._cellule(ws, interpretation, fill=fill, alignment=_ALIGN_CENTER, border=_THIN_BORDER),
+            ])
 
     def create_summary_sheet(self, wb: Workbook, report_data, options: Dict[str, Any]):
         """Créer la feuille de résumé."""
         ws = wb.create_sheet("Résumé")
-        ws.move_sheet("Résumé", 0)  # Déplacer en première position
-        
+
+        # Largeur des colonnes
+        _definir_largeurs(ws, {'A': 20, 'B': 15, 'C': 15, 'D': 15})
+
         # Titre
-        ws.merge_cells('A1:D1')
-        title_cell = ws['A1']
-        title_cell.value = "RÉSUMÉ DU RAPPORT"
-        title_cell.font = self.title_font
-        title_cell.fill = self.title_fill
-        title_cell.alignment = self.title_alignment
-        
+        self._ligne_titre(ws, "RÉSUMÉ DU RAPPORT", 'A1:D1')
+        ws.append([])
+
         # Informations générales
-        ws['A3'] = "Entreprise:"
-        ws['B3'] = options.get('entreprise', 'Entreprise')
-        ws['A4'] = "Type de rapport:"
-        
-        if isinstance(report_data, BilanFonctionnel):
-            ws['B4'] = "Bilan fonctionnel"
-        elif isinstance(report_data, BilanFinancier):
-            ws['B4'] = "Bilan financier"
-        elif isinstance(report_data, PatrimoineEntreprise):
-            ws['B4'] = "Patrimoine de l'entreprise"
-        
-        ws['A5'] = "Période:"
-        ws['B5'] = options.get('periode', '2024')
-        ws['A6'] = "Devise:"
-        ws['B6'] = options.get('devise', 'MAD')
-        ws['A7'] = "Date de génération:"
-        ws['B7'] = datetime.now().strftime('%d/%m/%Y %H:%M')
-        
+        type_rapport = _LIBELLE_PAR_TYPE.get(type(report_data), "")
+
+        ws.append(["Entreprise:", options.get('entreprise', 'Entreprise')])
+        ws.append(["Type de rapport:", type_rapport])
+        ws.append(["Période:", options.get('periode', '2024')])
+        ws.append(["Devise:", options.get('devise', 'MAD')])
+        ws.append(["Date de génération:",
+                   options.get('_datetime') or datetime.now().strftime('%d/%m/%Y %H:%M')])
+        ws.append([])
+
         # Points clés
-        ws.merge_cells('A9:D9')
-        subtitle_cell = ws['A9']
-        subtitle_cell.value = "POINTS CLÉS"
-        subtitle_cell.font = self.subtitle_font
-        subtitle_cell.fill = self.subtitle_fill
-        subtitle_cell.alignment = self.title_alignment
-        
+        ws.append([self._cellule(ws, "POINTS CLÉS", font=_SUBTITLE_FONT,
+                                 fill=_SUBTITLE_FILL, alignment=_TITLE_ALIGN)])
+        ws.merged_cells.ranges.add('A9:D9')
+        ws.append([])
+
         # Contenu des points clés selon le type de rapport
-        row_start = 11
-        
         if isinstance(report_data, BilanFonctionnel):
+            frng = float(report_data.frng)
+            bfr = float(report_data.bfr)
+            treso_nette = float(report_data.tresorerie_nette)
             points_cles = [
-                ("FRNG", float(report_data.frng), "Positif" if float(report_data.frng) > 0 else "Négatif"),
-                ("BFR", float(report_data.bfr), "Positif" if float(report_data.bfr) > 0 else "Négatif"),
-                ("Trésorerie nette", float(report_data.tresorerie_nette), "Positive" if float(report_data.tresorerie_nette) > 0 else "Négative"),
+                ("FRNG", frng, "Positif" if frng > 0 else "Négatif", None),
+                ("BFR", bfr, "Positif" if bfr > 0 else "Négatif", None),
+                ("Trésorerie nette", treso_nette, "Positive" if treso_nette > 0 else "Négative", None),
             ]
         elif isinstance(report_data, BilanFinancier):
             total_actif = float(report_data.total_actif)
+            capitaux_propres = float(report_data.capitaux_propres)
+            endettement = total_actif - capitaux_propres
             points_cles = [
-                ("Total actif", total_actif, ""),
-                ("Capitaux propres", float(report_data.capitaux_propres), f"{float(report_data.capitaux_propres)/total_actif*100:.1f}%" if total_actif > 0 else ""),
-                ("Endettement", total_actif - float(report_data.capitaux_propres), f"{(total_actif - float(report_data.capitaux_propres))/total_actif*100:.1f}%" if total_actif > 0 else ""),
+                ("Total actif", total_actif, "", None),
+                ("Capitaux propres", capitaux_propres, f"{capitaux_propres/total_actif*100:.1f}%" if total_actif > 0 else "", None),
+                ("Endettement", endettement, f"{endettement/total_actif*100:.1f}%" if total_actif > 0 else "", None),
             ]
         else:  # PatrimoineEntreprise
+            # Ratios en valeurs numériques mises en forme par Excel plutôt
+            # qu'en chaînes préformatées : ils restent exploitables par des
+            # formules en aval
             points_cles = [
-                ("Patrimoine net", float(report_data.patrimoine_net), ""),
-                ("Ratio d'endettement", f"{report_data.ratio_endettement or 0:.1%}", ""),
-                ("Ratio de solvabilité", f"{report_data.ratio_solvabilite or 0:.2f}", ""),
+                ("Patrimoine net", float(report_data.patrimoine_net), "", None),
+                ("Ratio d'endettement", report_data.ratio_endettement or 0.0, "", '0.0%'),
+                ("Ratio de solvabilité", report_data.ratio_solvabilite or 0.0, "", '0.00'),
             ]
-        
-        for i, (label, valeur, complement) in enumerate(points_cles, row_start):
-            ws.cell(row=i, column=1, value=label)
-            ws.cell(row=i, column=2, value=valeur)
-            ws.cell(row=i, column=3, value=complement)
-            
-            # Style
-            for col in range(1, 4):
-                cell = ws.cell(row=i, column=col)
-                cell.border = self.thin_border
-                cell.alignment = Alignment(horizontal='left' if col == 1 else 'right')
-        
-        # Largeur des colonnes
-        ws.column_dimensions['A'].width = 20
-        ws.column_dimensions['B'].width = 15
-        ws.column_dimensions['C'].width = 15
-        ws.column_dimensions['D'].width = 15
+
+        for label, valeur, complement, fmt in points_cles:
+            ws.append([
+                self._cellule(ws, label, alignment=_ALIGN_LEFT,
+                              border=_THIN_BORDER),
+                self._cellule(ws, valeur, alignment=_ALIGN_RIGHT,
+                              border=_THIN_BORDER, number_format=fmt),
+                self._cellule(ws, complement, alignment=_ALIGN_RIGHT,
+                              border=_THIN_BORDER),
+            ])
 
     # Méthodes utilitaires
     def _get_ratio_formula(self, ratio_name: str) -> str:
@@ -705,7 +715,7 @@ class ExcelExporter:
         """Interpréter un ratio."""
         if ratio is None:
             return "Non calculable"
-        
+
         if ratio <= good_threshold:
             return "✅ Bon"
         elif ratio >= bad_threshold:
@@ -717,7 +727,7 @@ class ExcelExporter:
         """Interpréter le ratio de solvabilité."""
         if ratio is None:
             return "Non calculable"
-        
+
         if ratio > 1:
             return "✅ Solvable"
         elif ratio > 0.5:
@@ -3,10 +3,16 @@ Exporteur de rapports au format PDF.
 Génère des documents PDF professionnels avec mise en page complète.
 """
 
+import copy
+import hashlib
+import io
+import multiprocessing
 import os
+from bisect import bisect_left
+from dataclasses import asdict, is_dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 
 from reportlab.lib.pagesizes import A4, letter
 from reportlab.lib.units import cm, mm
@@ -25,55 +31,365 @@ from reportlab.pdfbase.ttfonts import TTFont
 
 from core.models import BilanFonctionnel, BilanFinancier, PatrimoineEntreprise
 
+from ._ratios import classer_bilan_financier
+
+
+# Feuille de styles construite une seule fois au chargement du module :
+# chaque export réutilise les mêmes ParagraphStyle au lieu de reconstruire
+# une feuille getSampleStyleSheet et quatre styles par instance
+_STYLES = getSampleStyleSheet()
+
+if 'CustomTitle' not in _STYLES:
+    # Style pour les titres
+    _STYLES.add(ParagraphStyle(
+        name='CustomTitle',
+        parent=_STYLES['Heading1'],
+        fontSize=16,
+        spaceAfter=20,
+        textColor=Color(0.2, 0.2, 0.2),
+        alignment=TA_CENTER
+    ))
+
+    # Style pour les sous-titres
+    _STYLES.add(ParagraphStyle(
+        name='CustomHeading2',
+        parent=_STYLES['Heading2'],
+        fontSize=14,
+        spaceAfter=12,
+        spaceBefore=20,
+        textColor=Color(0.3, 0.3, 0.3)
+    ))
+
+    # Style pour les paragraphes
+    _STYLES.add(ParagraphStyle(
+        name='CustomBody',
+        parent=_STYLES['Normal'],
+        fontSize=10,
+        spaceAfter=6,
+        leading=14
+    ))
+
+    # Style pour les tableaux
+    _STYLES.add(ParagraphStyle(
+        name='TableHeader',
+        parent=_STYLES['Normal'],
+        fontSize=10,
+        alignment=TA_CENTER,
+        textColor=white
+    ))
+
+
+# Flowables statiques partagés entre exports : espacements et paragraphes
+# fixes de la page de titre, que platypus ne modifie pas entre documents
+_ESPACE_1CM = Spacer(1, 1 * cm)
+_ESPACE_2CM = Spacer(1, 2 * cm)
+_ESPACE_3CM = Spacer(1, 3 * cm)
+_LOGO_PARAGRAPHE = Paragraph("[Logo de l'entreprise]", _STYLES['CustomBody'])
+_PIED_PAGE_TITRE = Paragraph(
+    "Rapport généré par l'application de comptabilité professionnelle",
+    _STYLES['CustomBody'])
+
+# Styles de tableaux construits une seule fois au chargement du module :
+# ReportLab ne fait que lire la liste de commandes, le partage entre
+# exports est donc sûr
+_STYLE_TABLEAU_SOMMAIRE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), lightgrey),
+    ('TEXTCOLOR', (0, 0), (-1, -1), black),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+    ('BACKGROUND', (0, 0), (0, -1), grey),
+    ('TEXTCOLOR', (0, 0), (0, -1), white),
+])
+
+_STYLE_TABLEAU_BILAN_FONCTIONNEL = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, 3), (-1, 3), lightgrey),
+    ('BACKGROUND', (0, 7), (-1, 7), lightgrey),
+    ('BACKGROUND', (0, 10), (-1, 10), lightgrey),
+    ('FONTNAME', (0, 3), (0, 3), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 7), (0, 7), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 10), (0, 10), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 2), (0, 2), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 6), (0, 6), 'Helvetica-Bold'),
+    ('FONTNAME', (0, 9), (0, 9), 'Helvetica-Bold'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+])
+
+# Tableaux de montants avec ligne de total (actif et patrimoine partagent
+# exactement les mêmes commandes)
+_STYLE_TABLEAU_MONTANTS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, -1), (-1, -1), Color(0.3, 0.3, 0.3)),
+    ('TEXTCOLOR', (0, -1), (-1, -1), white),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+])
+
+_STYLE_TABLEAU_PASSIF = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('BACKGROUND', (0, -1), (-1, -1), Color(0.3, 0.3, 0.3)),
+    ('TEXTCOLOR', (0, -1), (-1, -1), white),
+    ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
+    ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ('ALIGN', (2, 0), (2, -1), 'CENTER'),
+    ('BACKGROUND', (0, 3), (0, 3), lightgrey),
+    ('FONTNAME', (0, 3), (0, 3), 'Helvetica-Bold'),
+])
+
+_STYLE_TABLEAU_RATIOS = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
+    ('TEXTCOLOR', (0, 0), (-1, 0), white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 0), (-1, -1), 9),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'TOP'),
+])
+
+# Tableau du sommaire : les données sont entièrement statiques, le Table
+# est construit une fois à l'import et copié superficiellement par document
+# (doc.build mute le flowable en y posant les largeurs calculées)
+_DONNEES_SOMMAIRE = [
+    ["1. Introduction", "3"],
+    ["2. Analyse financière", "4"],
+    ["3. Tableaux détaillés", "6"],
+    ["4. Ratios et indicateurs", "8"],
+    ["5. Recommandations", "10"],
+    ["6. Annexes", "12"]
+]
+
+_TABLE_SOMMAIRE = Table(_DONNEES_SOMMAIRE, colWidths=[12*cm, 2*cm])
+_TABLE_SOMMAIRE.setStyle(_STYLE_TABLEAU_SOMMAIRE)
+
+# Mise en forme monétaire préliée : un seul appel par cellule, sans
+# ré-analyse de la spécification de format à chaque ligne
+_MONEY_FMT = "{:,.2f} {}".format
+
+# Lignes des tableaux (libellé, attribut du modèle, pourcentage) ; un
+# attribut None produit une ligne de séparation vide
+_LIGNES_BILAN_FONCTIONNEL = (
+    ("EMPLOIS STABLES", 'emplois_stables', ""),
+    ("Ressources stables", 'ressources_stables', ""),
+    ("FRNG", 'frng', "100%"),
+    ("", None, ""),
+    ("ACTIFS CIRCULANTS", 'actifs_circulants', ""),
+    ("Passifs circulants", 'passifs_circulants', ""),
+    ("BFR", 'bfr', ""),
+    ("", None, ""),
+    ("TRÉSORERIE ACTIVE", 'tresorerie_active', ""),
+    ("Trésorerie passive", 'tresorerie_passive', ""),
+    ("TRÉSORERIE NETTE", 'tresorerie_nette', ""),
+)
+
+_LIGNES_ACTIF = (
+    ("Immobilisations nettes", 'immobilisations_nettes', ""),
+    ("Stocks", 'stocks', ""),
+    ("Créances clients", 'creances_clients', ""),
+    ("Autres créances", 'autres_creances', ""),
+    ("Trésorerie active", 'tresorerie_active', ""),
+    ("TOTAL ACTIF", 'total_actif', "100%"),
+)
+
+_LIGNES_PASSIF = (
+    ("Capital social", 'capital_social', ""),
+    ("Réserves", 'reserves', ""),
+    ("Résultat net", 'resultat_net', ""),
+    ("Capitaux propres", 'capitaux_propres', ""),
+    ("Dettes financières LT", 'dettes_financieres_lt', ""),
+    ("Dettes fournisseurs", 'dettes_fournisseurs', ""),
+    ("Autres dettes CT", 'autres_dettes_ct', ""),
+    ("Trésorerie passive", 'tresorerie_passive', ""),
+    ("TOTAL PASSIF", 'total_passif', "100%"),
+)
+
+_LIGNES_PATRIMOINE = (
+    ("Actifs économiques", 'actifs_economiques', ""),
+    ("Dettes financières", 'dettes_financieres', ""),
+    ("Actif net comptable", 'actif_net_comptable', ""),
+    ("Capitaux propres retraités", 'capitaux_propres_retraites', ""),
+    ("PATRIMOINE NET", 'patrimoine_net', "100%"),
+)
+
+
+# Gabarits de contenu des rapports : (titre, introduction, tableaux,
+# crochets). Chaque tableau est (sous-titre ou None, en-tête, lignes,
+# style, espacement après en cm) ; chaque crochet est le nom d'une méthode
+# de l'exporteur renvoyant les flowables des sections propres au rapport
+_ENTETE_MONTANTS = ("Rubriques", "Montant", "Pourcentage")
+
+_SPEC_BILAN_FONCTIONNEL = (
+    "BILAN FONCTIONNEL",
+    """
+    Le bilan fonctionnel présente l'analyse de la structure financière de l'entreprise
+    selon l'approche fonctionnelle. Il met en évidence les équilibres fondamentaux :
+    Fonds de Roulement Net Global (FRNG), Besoin en Fonds de Roulement (BFR) et Trésorerie.
+    """,
+    ((None, ("EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"),
+      _LIGNES_BILAN_FONCTIONNEL, _STYLE_TABLEAU_BILAN_FONCTIONNEL, 1.5),),
+    ('_flowables_analyse_fonctionnelle',),
+)
+
+_SPEC_BILAN_FINANCIER = (
+    "BILAN FINANCIER",
+    """
+    Le bilan financier présente la situation patrimoniale de l'entreprise selon
+    la présentation comptable classique. Il distingue clairement les actifs
+    et les passifs pour évaluer la structure financière et la solvabilité.
+    """,
+    (("ACTIF", _ENTETE_MONTANTS, _LIGNES_ACTIF, _STYLE_TABLEAU_MONTANTS, 1.0),
+     ("PASSIF", _ENTETE_MONTANTS, _LIGNES_PASSIF, _STYLE_TABLEAU_PASSIF, 1.5)),
+    ('_flowables_analyse_financiere',),
+)
+
+_SPEC_PATRIMOINE = (
+    "PATRIMOINE DE L'ENTREPRISE",
+    """
+    L'analyse patrimoniale évalue la valeur réelle de l'entreprise en tenant compte
+    de ses actifs économiques et de ses dettes. Elle permet d'apprécier la solidité
+    financière et la capacité de l'entreprise à faire face à ses engagements.
+    """,
+    ((None, ("ÉLÉMENTS PATRIMONIAUX", "Montant", "Pourcentage"),
+      _LIGNES_PATRIMOINE, _STYLE_TABLEAU_MONTANTS, 1.5),),
+    ('_flowables_ratios_patrimoniaux', '_flowables_analyse_patrimoniale'),
+)
+
+# Sections tabulaires du rendu rapide : (titre de section, lignes) par
+# type de rapport, réutilisant les spécifications des tableaux platypus
+_SECTIONS_RAPIDES = {
+    BilanFonctionnel: (("EMPLOIS ET RESSOURCES", _LIGNES_BILAN_FONCTIONNEL),),
+    BilanFinancier: (("ACTIF", _LIGNES_ACTIF), ("PASSIF", _LIGNES_PASSIF)),
+    PatrimoineEntreprise: (("ÉLÉMENTS PATRIMONIAUX", _LIGNES_PATRIMOINE),),
+}
+
+# Répartition par type de rapport : une recherche par type(report_data)
+# remplace les chaînes d'isinstance dans export et create_title_page
+_CONTENU_PAR_TYPE = {
+    BilanFonctionnel: 'create_bilan_fonctionnel_content',
+    BilanFinancier: 'create_bilan_financier_content',
+    PatrimoineEntreprise: 'create_patrimoine_content',
+}
+
+_TITRE_PAR_TYPE = {
+    BilanFonctionnel: "BILAN FONCTIONNEL",
+    BilanFinancier: "BILAN FINANCIER",
+    PatrimoineEntreprise: "PATRIMOINE DE L'ENTREPRISE",
+}
+
+
+def _valeurs_bilan_fonctionnel(bilan) -> Dict[str, float]:
+    """Convertir une seule fois les soldes Decimal du bilan en float.
+
+    L'analyse et les recommandations repartageaient chacune leurs propres
+    conversions ; la conversion Decimal→float n'est faite qu'ici.
+    """
+    return {
+        'frng': float(bilan.frng),
+        'bfr': float(bilan.bfr),
+        'tresorerie_nette': float(bilan.tresorerie_nette),
+    }
+
+
+def _lignes_montants(entete, lignes, data, devise):
+    """Construire les lignes d'un tableau : en-tête puis montants formatés."""
+    _float = float      # liaison locale : LOAD_FAST au lieu de LOAD_GLOBAL
+    rows = [list(entete)]
+    for libelle, attr, pct in lignes:
+        if attr is None:
+            rows.append(["", "", ""])
+        else:
+            rows.append([libelle, _MONEY_FMT(_float(getattr(data, attr)), devise), pct])
+    return rows
+
+
+# Phrases d'analyse constantes : les méthodes _analyze_* ne font plus que
+# choisir la phrase de chaque couple puis joindre la sélection
+_ANALYSE_FRNG = (
+    "Le Fonds de Roulement Net Global est positif, ce qui indique que les ressources stables financent correctement les emplois stables.",
+    "Le FRNG est négatif, ce qui révèle une dépendance aux financements à court terme pour couvrir les investissements.",
+)
+
+_ANALYSE_BFR = (
+    "Le Besoin en Fonds de Roulement est positif, ce qui signifie que le cycle d'exploitation nécessite un financement.",
+    "Le BFR est négatif, ce qui constitue une ressource de financement issue de l'exploitation.",
+)
+
+_ANALYSE_TRESORERIE = (
+    "La trésorerie nette est positive, offrant une marge de sécurité financière.",
+    "La trésorerie nette est négative, ce qui peut créer des tensions de liquidité.",
+)
+
+_ANALYSE_IMMOBILISATIONS = "L'entreprise présente une structure capitalistique marquée avec des immobilisations importantes."
+
+_ANALYSE_CAPITAUX_PROPRES = (
+    "Les capitaux propres constituent la principale source de financement, assurant une bonne autonomie financière.",
+    "L'entreprise dépend fortement de l'endettement pour son financement.",
+)
+
+_ANALYSE_ENDETTEMENT = (
+    "L'endettement est maîtrisé, offrant une bonne sécurité financière.",
+    "L'endettement est élevé et peut compromettre la solvabilité à long terme.",
+)
+
+_ANALYSE_SOLVABILITE = "La solvabilité est assurée avec des capitaux propres supérieurs aux dettes."
+
+# Classification des ratios : les chaînes if/elif deviennent des indexations
+# dans des tuples de verdicts
+_VERDICTS_RATIO = ("✅ Bon", "🟡 Moyen", "⚠️ À surveiller")
+
+_SEUILS_SOLVABILITE = (0.5, 1.0)
+_VERDICTS_SOLVABILITE = ("⚠️ Solvabilité faible", "🟡 Solvabilité moyenne",
+                         "✅ Solvable")
+
+
+def _export_un(report_data, filename, options):
+    """Exporter un rapport dans un processus de travail."""
+    return PDFExporter().export(report_data, filename, options)
+
 
 class PDFExporter:
     """
     Exporteur pour générer des rapports PDF professionnels.
     """
 
+    # Pas de __dict__ par instance : les attributs deviennent des
+    # emplacements fixes, ce qui allège chaque exporteur d'un pool de
+    # processus et accélère les lectures répétées de create_header_footer
+    __slots__ = ('styles', '_page_w', '_page_h', '_marge', '_haut_ligne',
+                 '_haut_texte', '_bas_ligne', '_bas_texte', '_horodatage')
+
     def __init__(self):
-        self.styles = getSampleStyleSheet()
-        self.setup_custom_styles()
-
-    def setup_custom_styles(self):
-        """Configurer les styles personnalisés."""
-        # Style pour les titres
-        self.styles.add(ParagraphStyle(
-            name='CustomTitle',
-            parent=self.styles['Heading1'],
-            fontSize=16,
-            spaceAfter=20,
-            textColor=Color(0.2, 0.2, 0.2),
-            alignment=TA_CENTER
-        ))
-        
-        # Style pour les sous-titres
-        self.styles.add(ParagraphStyle(
-            name='CustomHeading2',
-            parent=self.styles['Heading2'],
-            fontSize=14,
-            spaceAfter=12,
-            spaceBefore=20,
-            textColor=Color(0.3, 0.3, 0.3)
-        ))
-        
-        # Style pour les paragraphes
-        self.styles.add(ParagraphStyle(
-            name='CustomBody',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            spaceAfter=6,
-            leading=14
-        ))
-        
-        # Style pour les tableaux
-        self.styles.add(ParagraphStyle(
-            name='TableHeader',
-            parent=self.styles['Normal'],
-            fontSize=10,
-            alignment=TA_CENTER,
-            textColor=white
-        ))
+        self.styles = _STYLES
+        # Géométrie des en-têtes/pieds de page calculée une fois : ces
+        # valeurs sont invariantes d'une page à l'autre, inutile de refaire
+        # l'arithmétique A4/cm (et un datetime.now() par page ferait dériver
+        # l'horodatage entre les pages d'un même document)
+        self._page_w, self._page_h = A4
+        self._marge = 2 * cm
+        self._haut_ligne = self._page_h - 2 * cm
+        self._haut_texte = self._page_h - 1.5 * cm
+        self._bas_ligne = 2 * cm
+        self._bas_texte = 1.5 * cm
+        self._horodatage = f"Généré le {datetime.now().strftime('%d/%m/%Y %H:%M')}"
 
     def export(self, report_data, filename: str, options: Dict[str, Any]) -> str:
         """
@@ -92,10 +408,27 @@ class PDFExporter:
         export_dir.mkdir(exist_ok=True)
         
         file_path = export_dir / filename
-        
-        # Créer le document PDF
+
+        # Mémoïsation sur disque : pour un rapport dont les données et les
+        # options n'ont pas changé, resservir le PDF du cache évite de
+        # repayer tout le doc.build (le document resservi garde la date
+        # d'édition de sa première génération)
+        fichier_cache = None
+        if is_dataclass(report_data):
+            cle = hashlib.blake2b(
+                repr((asdict(report_data), options)).encode(),
+                digest_size=16).hexdigest()
+            fichier_cache = export_dir / '.cache' / f"{cle}.pdf"
+            if fichier_cache.exists():
+                file_path.write_bytes(fichier_cache.read_bytes())
+                return str(file_path)
+
+        # Créer le document PDF : le rendu se fait en mémoire puis le
+        # fichier est écrit en un seul write, au lieu des nombreuses
+        # petites écritures qu'émet ReportLab quand il tient le fichier
+        buf = io.BytesIO()
         doc = SimpleDocTemplate(
-            str(file_path),
+            buf,
             pagesize=A4,
             rightMargin=2*cm,
             leftMargin=2*cm,
@@ -114,15 +447,10 @@ class PDFExporter:
         story.extend(self.create_table_of_contents())
         
         # Contenu principal selon le type de rapport
-        if isinstance(report_data, BilanFonctionnel):
-            story.append(PageBreak())
-            story.extend(self.create_bilan_fonctionnel_content(report_data, options))
-        elif isinstance(report_data, BilanFinancier):
-            story.append(PageBreak())
-            story.extend(self.create_bilan_financier_content(report_data, options))
-        elif isinstance(report_data, PatrimoineEntreprise):
+        nom_methode = _CONTENU_PAR_TYPE.get(type(report_data))
+        if nom_methode:
             story.append(PageBreak())
-            story.extend(self.create_patrimoine_content(report_data, options))
+            story.extend(getattr(self, nom_methode)(report_data, options))
         
         # Annexes
         if options.get('include_notes', True):
@@ -131,7 +459,111 @@ class PDFExporter:
         
         # Générer le PDF
         doc.build(story, onFirstPage=self.create_header_footer, onLaterPages=self.create_header_footer)
-        
+        file_path.write_bytes(buf.getbuffer())
+
+        if fichier_cache is not None:
+            fichier_cache.parent.mkdir(exist_ok=True)
+            fichier_cache.write_bytes(buf.getbuffer())
+
+        return str(file_path)
+
+    def export_batch(self, items: List[Tuple[Any, str, Dict[str, Any]]]) -> List[str]:
+        """
+        Exporter plusieurs rapports en parallèle, un par cœur.
+
+        ReportLab est en Python pur et garde le GIL pendant le rendu : des
+        threads n'apporteraient rien. Chaque rapport produisant un fichier
+        indépendant, le lot est réparti sur un processus par cœur, chacun
+        construisant son propre exporteur.
+
+        Args:
+            items: Liste de tuples (report_data, filename, options)
+
+        Returns:
+            Liste des chemins des fichiers générés, dans l'ordre d'entrée
+        """
+        with multiprocessing.Pool() as pool:
+            return pool.starmap(_export_un, items)
+
+    def export_fast(self, report_data, filename: str, options: Dict[str, Any]) -> str:
+        """
+        Exporter un rapport condensé en traçant directement sur le canvas.
+
+        Le pipeline platypus (découpage en cadres, pagination, répartition
+        des flowables) domine le coût de génération d'un PDF. Les rapports
+        ayant un gabarit fixe qui tient sur une page, ce rendu positionne
+        lui-même titre, sections et lignes de montants et court-circuite
+        entièrement le moteur de mise en page. La sortie est plus sobre que
+        celle d'export (ni sommaire, ni analyse, ni annexes).
+
+        Args:
+            report_data: Données du rapport
+            filename: Nom du fichier de sortie
+            options: Options d'exportation
+
+        Returns:
+            Chemin du fichier généré
+        """
+        export_dir = Path("exports")
+        export_dir.mkdir(exist_ok=True)
+
+        file_path = export_dir / filename
+        devise = options.get('devise', 'MAD')
+
+        buf = io.BytesIO()
+        c = canvas.Canvas(buf, pagesize=A4)
+
+        # Titre et informations d'en-tête
+        y = self._page_h - 3 * cm
+        c.setFont("Helvetica-Bold", 16)
+        c.drawCentredString(self._page_w / 2, y,
+                            _TITRE_PAR_TYPE.get(type(report_data),
+                                                "RAPPORT FINANCIER"))
+        y -= 1.2 * cm
+        c.setFont("Helvetica", 10)
+        c.drawString(self._marge, y,
+                     f"Entreprise : {options.get('entreprise', 'Entreprise')}")
+        y -= 0.5 * cm
+        c.drawString(self._marge, y,
+                     f"Période : {options.get('periode', '2024')} — "
+                     f"Devise : {devise}")
+        y -= 1.4 * cm
+
+        # Sections tabulaires à positions fixes
+        _float = float
+        interligne = 0.55 * cm
+        col_montant = self._marge + 10 * cm
+        for titre_section, lignes in _SECTIONS_RAPIDES.get(type(report_data), ()):
+            c.setFont("Helvetica-Bold", 12)
+            c.drawString(self._marge, y, titre_section)
+            y -= interligne
+            c.setFont("Helvetica", 9)
+            for libelle, attr, pct in lignes:
+                if attr is None:
+                    y -= interligne / 2
+                    continue
+                c.drawString(self._marge, y, libelle)
+                c.drawRightString(
+                    col_montant, y,
+                    _MONEY_FMT(_float(getattr(report_data, attr)), devise))
+                if pct:
+                    c.drawString(col_montant + 0.5 * cm, y, pct)
+                y -= interligne
+            y -= interligne
+
+        # Pied de page
+        c.setFont("Helvetica", 9)
+        c.setFillColor(grey)
+        c.line(self._marge, self._bas_ligne,
+               self._page_w - self._marge, self._bas_ligne)
+        c.drawString(self._marge, self._bas_texte, self._horodatage)
+        c.drawRightString(self._page_w - self._marge, self._bas_texte,
+                          "Confidentiel")
+
+        c.showPage()
+        c.save()
+        file_path.write_bytes(buf.getbuffer())
+
         return str(file_path)
 
     def create_title_page(self, report_data, options: Dict[str, Any]) -> list:
@@ -139,20 +571,13 @@ class PDFExporter:
         content = []
         
         # Espacement
-        content.append(Spacer(1, 3*cm))
-        
+        content.append(_ESPACE_3CM)
+
         # Titre principal
-        if isinstance(report_data, BilanFonctionnel):
-            title = "BILAN FONCTIONNEL"
-        elif isinstance(report_data, BilanFinancier):
-            title = "BILAN FINANCIER"
-        elif isinstance(report_data, PatrimoineEntreprise):
-            title = "PATRIMOINE DE L'ENTREPRISE"
-        else:
-            title = "RAPPORT FINANCIER"
-        
+        title = _TITRE_PAR_TYPE.get(type(report_data), "RAPPORT FINANCIER")
+
         content.append(Paragraph(title, self.styles['CustomTitle']))
-        content.append(Spacer(1, 1*cm))
+        content.append(_ESPACE_1CM)
         
         # Informations sur l'entreprise
         entreprise = options.get('entreprise', 'Entreprise')
@@ -167,17 +592,16 @@ class PDFExporter:
         """
         
         content.append(Paragraph(info_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 2*cm))
-        
+        content.append(_ESPACE_2CM)
+
         # Logo si disponible
         if options.get('include_logo', True):
             # TODO: Ajouter le logo
-            content.append(Paragraph("[Logo de l'entreprise]", self.styles['CustomBody']))
-            content.append(Spacer(1, 1*cm))
-        
+            content.append(_LOGO_PARAGRAPHE)
+            content.append(_ESPACE_1CM)
+
         # Footer
-        footer_text = "Rapport généré par l'application de comptabilité professionnelle"
-        content.append(Paragraph(footer_text, self.styles['CustomBody']))
+        content.append(_PIED_PAGE_TITRE)
         
         return content
 
@@ -186,276 +610,112 @@ class PDFExporter:
         content = []
         
         content.append(Paragraph("SOMMAIRE", self.styles['CustomTitle']))
-        content.append(Spacer(1, 1*cm))
-        
-        toc_data = [
-            ["1. Introduction", "3"],
-            ["2. Analyse financière", "4"],
-            ["3. Tableaux détaillés", "6"],
-            ["4. Ratios et indicateurs", "8"],
-            ["5. Recommandations", "10"],
-            ["6. Annexes", "12"]
-        ]
-        
-        toc_table = Table(toc_data, colWidths=[12*cm, 2*cm])
-        toc_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, -1), lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('BACKGROUND', (0, 0), (0, -1), grey),
-            ('TEXTCOLOR', (0, 0), (0, -1), white),
-        ]))
-        
-        content.append(toc_table)
-        content.append(Spacer(1, 1*cm))
+        content.append(_ESPACE_1CM)
+
+        content.append(copy.copy(_TABLE_SOMMAIRE))
+        content.append(_ESPACE_1CM)
         
         return content
 
     def create_bilan_fonctionnel_content(self, bilan: BilanFonctionnel, options: Dict[str, Any]) -> list:
         """Créer le contenu du bilan fonctionnel."""
-        content = []
-        
-        # Titre
-        content.append(Paragraph("BILAN FONCTIONNEL", self.styles['CustomHeading2']))
-        
-        # Introduction
-        intro_text = """
-        Le bilan fonctionnel présente l'analyse de la structure financière de l'entreprise 
-        selon l'approche fonctionnelle. Il met en évidence les équilibres fondamentaux : 
-        Fonds de Roulement Net Global (FRNG), Besoin en Fonds de Roulement (BFR) et Trésorerie.
-        """
-        content.append(Paragraph(intro_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 1*cm))
-        
-        # Tableau principal
-        tableau_data = [
-            ["EMPLOIS ET RESSOURCES", "Montant", "Pourcentage"],
-            ["EMPLOIS STABLES", f"{float(bilan.emplois_stables):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Ressources stables", f"{float(bilan.ressources_stables):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["FRNG", f"{float(bilan.frng):,.2f} {options.get('devise', 'MAD')}", "100%"],
-            ["", "", ""],
-            ["ACTIFS CIRCULANTS", f"{float(bilan.actifs_circulants):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Passifs circulants", f"{float(bilan.passifs_circulants):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["BFR", f"{float(bilan.bfr):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["", "", ""],
-            ["TRÉSORERIE ACTIVE", f"{float(bilan.tresorerie_active):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie passive", f"{float(bilan.tresorerie_passive):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TRÉSORERIE NETTE", f"{float(bilan.tresorerie_nette):,.2f} {options.get('devise', 'MAD')}", ""],
-        ]
-        
-        tableau = Table(tableau_data, colWidths=[6*cm, 4*cm, 2*cm])
-        tableau.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, 3), (-1, 3), lightgrey),
-            ('BACKGROUND', (0, 7), (-1, 7), lightgrey),
-            ('BACKGROUND', (0, 10), (-1, 10), lightgrey),
-            ('FONTNAME', (0, 3), (0, 3), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 7), (0, 7), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 10), (0, 10), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 2), (0, 2), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 6), (0, 6), 'Helvetica-Bold'),
-            ('FONTNAME', (0, 9), (0, 9), 'Helvetica-Bold'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-        ]))
-        
-        content.append(tableau)
-        content.append(Spacer(1, 1.5*cm))
-        
-        # Analyse
-        content.append(Paragraph("ANALyse FONCTIONNELLE", self.styles['CustomHeading2']))
-        
-        analyse_text = self._analyze_bilan_fonctionnel(bilan)
-        content.append(Paragraph(analyse_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 1*cm))
-        
-        # Recommandations
-        if options.get('include_ratios', True):
-            content.append(Paragraph("RECOMMANDATIONS", self.styles['CustomHeading2']))
-            
-            recommandations = self._get_bilan_fonctionnel_recommendations(bilan)
-            for rec in recommandations:
-                content.append(Paragraph(f"• {rec}", self.styles['CustomBody']))
-        
-        return content
+        return self._render_report(bilan, _SPEC_BILAN_FONCTIONNEL, options)
 
     def create_bilan_financier_content(self, bilan: BilanFinancier, options: Dict[str, Any]) -> list:
         """Créer le contenu du bilan financier."""
-        content = []
-        
-        # Titre
-        content.append(Paragraph("BILAN FINANCIER", self.styles['CustomHeading2']))
-        
-        # Introduction
-        intro_text = """
-        Le bilan financier présente la situation patrimoniale de l'entreprise selon 
-        la présentation comptable classique. Il distingue clairement les actifs 
-        et les passifs pour évaluer la structure financière et la solvabilité.
-        """
-        content.append(Paragraph(intro_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 1*cm))
-        
-        # Tableau de l'actif
-        content.append(Paragraph("ACTIF", self.styles['CustomHeading2']))
-        
-        actif_data = [
-            ["Rubriques", "Montant", "Pourcentage"],
-            ["Immobilisations nettes", f"{float(bilan.immobilisations_nettes):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Stocks", f"{float(bilan.stocks):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Créances clients", f"{float(bilan.creances_clients):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Autres créances", f"{float(bilan.autres_creances):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie active", f"{float(bilan.tresorerie_active):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TOTAL ACTIF", f"{float(bilan.total_actif):,.2f} {options.get('devise', 'MAD')}", "100%"],
-        ]
-        
-        actif_table = Table(actif_data, colWidths=[6*cm, 4*cm, 2*cm])
-        actif_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, -1), (-1, -1), Color(0.3, 0.3, 0.3)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), white),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-        ]))
-        
-        content.append(actif_table)
-        content.append(Spacer(1, 1*cm))
-        
-        # Tableau du passif
-        content.append(Paragraph("PASSIF", self.styles['CustomHeading2']))
-        
-        passif_data = [
-            ["Rubriques", "Montant", "Pourcentage"],
-            ["Capital social", f"{float(bilan.capital_social):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Réserves", f"{float(bilan.reserves):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Résultat net", f"{float(bilan.resultat_net):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Capitaux propres", f"{float(bilan.capitaux_propres):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes financières LT", f"{float(bilan.dettes_financieres_lt):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes fournisseurs", f"{float(bilan.dettes_fournisseurs):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Autres dettes CT", f"{float(bilan.autres_dettes_ct):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Trésorerie passive", f"{float(bilan.tresorerie_passive):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["TOTAL PASSIF", f"{float(bilan.total_passif):,.2f} {options.get('devise', 'MAD')}", "100%"],
-        ]
-        
-        passif_table = Table(passif_data, colWidths=[6*cm, 4*cm, 2*cm])
-        passif_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, -1), (-1, -1), Color(0.3, 0.3, 0.3)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), white),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-            ('BACKGROUND', (0, 3), (0, 3), lightgrey),
-            ('FONTNAME', (0, 3), (0, 3), 'Helvetica-Bold'),
-        ]))
-        
-        content.append(passif_table)
-        content.append(Spacer(1, 1.5*cm))
-        
-        # Analyse
-        content.append(Paragraph("ANALYSE FINANCIÈRE", self.styles['CustomHeading2']))
-        
-        analyse_text = self._analyze_bilan_financier(bilan)
-        content.append(Paragraph(analyse_text, self.styles['CustomBody']))
-        
-        return content
+        return self._render_report(bilan, _SPEC_BILAN_FINANCIER, options)
 
     def create_patrimoine_content(self, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]) -> list:
         """Créer le contenu du patrimoine."""
-        content = []
-        
-        # Titre
-        content.append(Paragraph("PATRIMOINE DE L'ENTREPRISE", self.styles['CustomHeading2']))
-        
-        # Introduction
-        intro_text = """
-        L'analyse patrimoniale évalue la valeur réelle de l'entreprise en tenant compte 
-        de ses actifs économiques et de ses dettes. Elle permet d'apprécier la solidité 
-        financière et la capacité de l'entreprise à faire face à ses engagements.
+        return self._render_report(patrimoine, _SPEC_PATRIMOINE, options)
+
+    def _render_report(self, report_data, spec, options: Dict[str, Any]) -> list:
+        """Construire les flowables d'un rapport à partir de son gabarit.
+
+        Les trois contenus suivent la même trame — titre, introduction,
+        tableaux de montants, sections d'analyse — et ne diffèrent que par
+        leur gabarit déclaratif (_SPEC_*).
         """
-        content.append(Paragraph(intro_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 1*cm))
-        
-        # Tableau patrimonial
-        patrimoine_data = [
-            ["ÉLÉMENTS PATRIMONIAUX", "Montant", "Pourcentage"],
-            ["Actifs économiques", f"{float(patrimoine.actifs_economiques):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Dettes financières", f"{float(patrimoine.dettes_financieres):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Actif net comptable", f"{float(patrimoine.actif_net_comptable):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["Capitaux propres retraités", f"{float(patrimoine.capitaux_propres_retraites):,.2f} {options.get('devise', 'MAD')}", ""],
-            ["PATRIMOINE NET", f"{float(patrimoine.patrimoine_net):,.2f} {options.get('devise', 'MAD')}", "100%"],
+        titre, intro, tableaux, crochets = spec
+        devise = options.get('devise', 'MAD')
+
+        content = [
+            Paragraph(titre, self.styles['CustomHeading2']),
+            Paragraph(intro, self.styles['CustomBody']),
+            _ESPACE_1CM,
         ]
-        
-        patrimoine_table = Table(patrimoine_data, colWidths=[6*cm, 4*cm, 2*cm])
-        patrimoine_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
-            ('TEXTCOLOR', (0, 0), (-1, 0), white),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-            ('BACKGROUND', (0, -1), (-1, -1), Color(0.3, 0.3, 0.3)),
-            ('TEXTCOLOR', (0, -1), (-1, -1), white),
-            ('FONTNAME', (0, -1), (-1, -1), 'Helvetica-Bold'),
-            ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
-            ('ALIGN', (2, 0), (2, -1), 'CENTER'),
-        ]))
-        
-        content.append(patrimoine_table)
-        content.append(Spacer(1, 1.5*cm))
-        
-        # Ratios patrimoniaux
-        if options.get('include_ratios', True):
-            content.append(Paragraph("RATIOS PATRIMONIAUX", self.styles['CustomHeading2']))
-            
-            ratios_data = [
-                ["Ratio", "Valeur", "Interprétation"],
-                ["Ratio d'endettement", f"{patrimoine.ratio_endettement or 0:.2%}", self._interpret_ratio(patrimoine.ratio_endettement, 0.5, 0.8)],
-                ["Ratio de solvabilité", f"{patrimoine.ratio_solvabilite or 0:.2f}", self._interpret_solvability(patrimoine.ratio_solvabilite)],
-                ["Ratio de liquidité", f"{patrimoine.ratio_liquidite or 0:.2f}", self._interpret_ratio(patrimoine.ratio_liquidite, 1.0, 0.8)],
-            ]
-            
-            ratios_table = Table(ratios_data, colWidths=[4*cm, 3*cm, 5*cm])
-            ratios_table.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), Color(0.2, 0.2, 0.2)),
-                ('TEXTCOLOR', (0, 0), (-1, 0), white),
-                ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, -1), 'Helvetica'),
-                ('FONTSIZE', (0, 0), (-1, -1), 9),
-                ('BOTTOMPADDING', (0, 0), (-1, -1), 8),
-                ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-                ('VALIGN', (0, 0), (-1, -1), 'TOP'),
-            ]))
-            
-            content.append(ratios_table)
-            content.append(Spacer(1, 1*cm))
-        
-        # Analyse
-        content.append(Paragraph("ANALYSE PATRIMONIALE", self.styles['CustomHeading2']))
-        
-        analyse_text = self._analyze_patrimoine(patrimoine)
-        content.append(Paragraph(analyse_text, self.styles['CustomBody']))
-        
+
+        for sous_titre, entete, lignes, style, espace in tableaux:
+            if sous_titre:
+                content.append(Paragraph(sous_titre, self.styles['CustomHeading2']))
+            table = Table(_lignes_montants(entete, lignes, report_data, devise),
+                          colWidths=[6 * cm, 4 * cm, 2 * cm])
+            table.setStyle(style)
+            content.append(table)
+            content.append(Spacer(1, espace * cm))
+
+        for crochet in crochets:
+            content.extend(getattr(self, crochet)(report_data, options))
+
         return content
 
+    def _flowables_analyse_fonctionnelle(self, bilan: BilanFonctionnel, options: Dict[str, Any]) -> list:
+        """Analyse fonctionnelle et recommandations du bilan fonctionnel."""
+        # Soldes convertis une fois pour l'analyse et les recommandations
+        valeurs = _valeurs_bilan_fonctionnel(bilan)
+
+        flowables = [
+            Paragraph("ANALyse FONCTIONNELLE", self.styles['CustomHeading2']),
+            Paragraph(self._analyze_bilan_fonctionnel(valeurs), self.styles['CustomBody']),
+            _ESPACE_1CM,
+        ]
+
+        if options.get('include_ratios', True):
+            flowables.append(Paragraph("RECOMMANDATIONS", self.styles['CustomHeading2']))
+
+            # Un seul Paragraph pour toute la liste : chaque flowable
+            # supplémentaire coûte une passe de mise en page à doc.build
+            recommandations = self._get_bilan_fonctionnel_recommendations(valeurs)
+            texte = "<br/>".join(f"• {rec}" for rec in recommandations)
+            flowables.append(Paragraph(texte, self.styles['CustomBody']))
+
+        return flowables
+
+    def _flowables_analyse_financiere(self, bilan: BilanFinancier, options: Dict[str, Any]) -> list:
+        """Analyse financière du bilan financier."""
+        return [
+            Paragraph("ANALYSE FINANCIÈRE", self.styles['CustomHeading2']),
+            Paragraph(self._analyze_bilan_financier(bilan), self.styles['CustomBody']),
+        ]
+
+    def _flowables_ratios_patrimoniaux(self, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]) -> list:
+        """Tableau des ratios patrimoniaux, si les options le demandent."""
+        if not options.get('include_ratios', True):
+            return []
+
+        ratios_data = [
+            ["Ratio", "Valeur", "Interprétation"],
+            ["Ratio d'endettement", f"{patrimoine.ratio_endettement or 0:.2%}", self._interpret_ratio(patrimoine.ratio_endettement, 0.5, 0.8)],
+            ["Ratio de solvabilité", f"{patrimoine.ratio_solvabilite or 0:.2f}", self._interpret_solvability(patrimoine.ratio_solvabilite)],
+            ["Ratio de liquidité", f"{patrimoine.ratio_liquidite or 0:.2f}", self._interpret_ratio(patrimoine.ratio_liquidite, 1.0, 0.8)],
+        ]
+
+        ratios_table = Table(ratios_data, colWidths=[4 * cm, 3 * cm, 5 * cm])
+        ratios_table.setStyle(_STYLE_TABLEAU_RATIOS)
+
+        return [
+            Paragraph("RATIOS PATRIMONIAUX", self.styles['CustomHeading2']),
+            ratios_table,
+            _ESPACE_1CM,
+        ]
+
+    def _flowables_analyse_patrimoniale(self, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]) -> list:
+        """Analyse patrimoniale."""
+        return [
+            Paragraph("ANALYSE PATRIMONIALE", self.styles['CustomHeading2']),
+            Paragraph(self._analyze_patrimoine(patrimoine), self.styles['CustomBody']),
+        ]
+
     def create_annexes(self, report_data, options: Dict[str, Any]) -> list:
         """Créer les annexes du rapport."""
         content = []
@@ -465,13 +725,13 @@ class PDFExporter:
         # Méthodologie
         content.append(Paragraph("MÉTHODOLOGIE", self.styles['CustomHeading2']))
         
-        methode_text = """
+        methode_text = f"""
         <b>Source des données:</b> Données comptables fournies par l'entreprise.<br/>
-        <b>Période de référence:</b> {periode}<br/>
-        <b>Devise:</b> {devise}<br/>
+        <b>Période de référence:</b> {options.get('periode', '2024')}<br/>
+        <b>Devise:</b> {options.get('devise', 'MAD')}<br/>
         <b>Normes comptables:</b> Plan Comptable Marocain<br/>
-        <b>Date d'édition:</b> {date}<br/><br/>
-        
+        <b>Date d'édition:</b> {datetime.now().strftime('%d/%m/%Y')}<br/><br/>
+
         <b>Méthodes de calcul:</b><br/>
         • FRNG = Ressources stables - Emplois stables<br/>
         • BFR = Actifs circulants - Passifs circulants<br/>
@@ -479,14 +739,10 @@ class PDFExporter:
         • Ratio d'endettement = Dettes / Actifs économiques<br/>
         • Ratio de solvabilité = Capitaux propres / Dettes<br/>
         • Ratio de liquidité = Actifs liquides / Passifs exigibles
-        """.format(
-            periode=options.get('periode', '2024'),
-            devise=options.get('devise', 'MAD'),
-            date=datetime.now().strftime('%d/%m/%Y')
-        )
+        """
         
         content.append(Paragraph(methode_text, self.styles['CustomBody']))
-        content.append(Spacer(1, 1*cm))
+        content.append(_ESPACE_1CM)
         
         # Notes techniques
         content.append(Paragraph("NOTES TECHNIQUES", self.styles['CustomHeading2']))
@@ -513,61 +769,59 @@ class PDFExporter:
         canvas.setFillColor(grey)
         
         # Ligne supérieure
-        canvas.line(2*cm, A4[1] - 2*cm, A4[0] - 2*cm, A4[1] - 2*cm)
-        
+        canvas.line(self._marge, self._haut_ligne,
+                    self._page_w - self._marge, self._haut_ligne)
+
         # Titre du document
-        canvas.drawString(2*cm, A4[1] - 1.5*cm, "Rapport Financier")
-        
+        canvas.drawString(self._marge, self._haut_texte, "Rapport Financier")
+
         # Numéro de page
-        canvas.drawRightString(A4[0] - 2*cm, A4[1] - 1.5*cm, f"Page {doc.page}")
-        
+        canvas.drawRightString(self._page_w - self._marge, self._haut_texte,
+                               f"Page {doc.page}")
+
         # Pied de page
-        canvas.line(2*cm, 2*cm, A4[0] - 2*cm, 2*cm)
-        canvas.drawString(2*cm, 1.5*cm, f"Généré le {datetime.now().strftime('%d/%m/%Y %H:%M')}")
-        canvas.drawCentredString(A4[0]/2, 1.5*cm, "Application de Comptabilité Professionnelle")
-        canvas.drawRightString(A4[0] - 2*cm, 1.5*cm, "Confidentiel")
+        canvas.line(self._marge, self._bas_ligne,
+                    self._page_w - self._marge, self._bas_ligne)
+        canvas.drawString(self._marge, self._bas_texte, self._horodatage)
+        canvas.drawCentredString(self._page_w / 2, self._bas_texte,
+                                 "Application de Comptabilité Professionnelle")
+        canvas.drawRightString(self._page_w - self._marge, self._bas_texte,
+                               "Confidentiel")
         
         canvas.restoreState()
 
     # Méthodes d'analyse
-    def _analyze_bilan_fonctionnel(self, bilan: BilanFonctionnel) -> str:
-        """Analyser le bilan fonctionnel."""
-        analyses = []
-        
-        if float(bilan.frng) > 0:
-            analyses.append("Le Fonds de Roulement Net Global est positif, ce qui indique que les ressources stables financent correctement les emplois stables.")
-        else:
-            analyses.append("Le FRNG est négatif, ce qui révèle une dépendance aux financements à court terme pour couvrir les investissements.")
-        
-        if float(bilan.bfr) > 0:
-            analyses.append("Le Besoin en Fonds de Roulement est positif, ce qui signifie que le cycle d'exploitation nécessite un financement.")
-        else:
-            analyses.append("Le BFR est négatif, ce qui constitue une ressource de financement issue de l'exploitation.")
-        
-        if float(bilan.tresorerie_nette) > 0:
-            analyses.append("La trésorerie nette est positive, offrant une marge de sécurité financière.")
-        elif float(bilan.tresorerie_nette) < 0:
-            analyses.append("La trésorerie nette est négative, ce qui peut créer des tensions de liquidité.")
-        
+    def _analyze_bilan_fonctionnel(self, valeurs: Dict[str, float]) -> str:
+        """Analyser le bilan fonctionnel à partir de ses soldes en float."""
+        analyses = [
+            _ANALYSE_FRNG[0] if valeurs['frng'] > 0 else _ANALYSE_FRNG[1],
+            _ANALYSE_BFR[0] if valeurs['bfr'] > 0 else _ANALYSE_BFR[1],
+        ]
+
+        tresorerie_nette = valeurs['tresorerie_nette']
+        if tresorerie_nette > 0:
+            analyses.append(_ANALYSE_TRESORERIE[0])
+        elif tresorerie_nette < 0:
+            analyses.append(_ANALYSE_TRESORERIE[1])
+
         return " ".join(analyses)
 
     def _analyze_bilan_financier(self, bilan: BilanFinancier) -> str:
         """Analyser le bilan financier."""
+        # La partie numérique (divisions et comparaisons) est classée par le
+        # noyau compilé ; seul le masque de constats revient en Python
+        masque = classer_bilan_financier(float(bilan.total_actif),
+                                         float(bilan.immobilisations_nettes),
+                                         float(bilan.capitaux_propres))
+
         analyses = []
-        
-        total_actif = float(bilan.total_actif)
-        if total_actif > 0:
-            ratio_immobilisations = float(bilan.immobilisations_nettes) / total_actif
-            ratio_capitaux_propres = float(bilan.capitaux_propres) / total_actif
-            
-            if ratio_immobilisations > 0.5:
-                analyses.append("L'entreprise présente une structure capitalistique marquée avec des immobilisations importantes.")
-            
-            if ratio_capitaux_propres > 0.5:
-                analyses.append("Les capitaux propres constituent la principale source de financement, assurant une bonne autonomie financière.")
-            elif ratio_capitaux_propres < 0.2:
-                analyses.append("L'entreprise dépend fortement de l'endettement pour son financement.")
-        
+        if masque & 1:
+            analyses.append(_ANALYSE_IMMOBILISATIONS)
+        if masque & 2:
+            analyses.append(_ANALYSE_CAPITAUX_PROPRES[0])
+        elif masque & 4:
+            analyses.append(_ANALYSE_CAPITAUX_PROPRES[1])
+
         return " ".join(analyses)
 
     def _analyze_patrimoine(self, patrimoine: PatrimoineEntreprise) -> str:
@@ -575,26 +829,26 @@ class PDFExporter:
         analyses = []
         
         if patrimoine.ratio_endettement and patrimoine.ratio_endettement < 0.5:
-            analyses.append("L'endettement est maîtrisé, offrant une bonne sécurité financière.")
+            analyses.append(_ANALYSE_ENDETTEMENT[0])
         elif patrimoine.ratio_endettement and patrimoine.ratio_endettement > 0.8:
-            analyses.append("L'endettement est élevé et peut compromettre la solvabilité à long terme.")
-        
+            analyses.append(_ANALYSE_ENDETTEMENT[1])
+
         if patrimoine.ratio_solvabilite and patrimoine.ratio_solvabilite > 1:
-            analyses.append("La solvabilité est assurée avec des capitaux propres supérieurs aux dettes.")
+            analyses.append(_ANALYSE_SOLVABILITE)
         
         return " ".join(analyses)
 
-    def _get_bilan_fonctionnel_recommendations(self, bilan: BilanFonctionnel) -> list:
+    def _get_bilan_fonctionnel_recommendations(self, valeurs: Dict[str, float]) -> list:
         """Obtenir les recommandations pour le bilan fonctionnel."""
         recommendations = []
-        
-        if float(bilan.frng) < 0:
+
+        if valeurs['frng'] < 0:
             recommendations.append("Renforcer les ressources stables (augmentation de capital, dettes à long terme)")
-        
-        if float(bilan.bfr) > float(bilan.frng):
+
+        if valeurs['bfr'] > valeurs['frng']:
             recommendations.append("Optimiser le cycle d'exploitation pour réduire le BFR")
-        
-        if float(bilan.tresorerie_nette) < 0:
+
+        if valeurs['tresorerie_nette'] < 0:
             recommendations.append("Améliorer la gestion de trésorerie (negociation des délais, cession d'actifs)")
         
         if not recommendations:
@@ -607,21 +861,17 @@ class PDFExporter:
         if ratio is None:
             return "Non calculable"
         
-        if ratio <= good_threshold:
-            return "✅ Bon"
-        elif ratio >= bad_threshold:
-            return "⚠️ À surveiller"
-        else:
-            return "🟡 Moyen"
+        # Indexation sans branche : 0 (bon) si ratio <= good_threshold,
+        # sinon 2 (à surveiller) si ratio >= bad_threshold, sinon 1 (moyen).
+        # Les seuils arrivent dans un ordre quelconque selon le ratio
+        # (liquidité : bon au-dessous de 1.0), d'où l'arithmétique plutôt
+        # qu'un bisect qui exigerait des seuils triés
+        return _VERDICTS_RATIO[(ratio > good_threshold)
+                               * (1 + (ratio >= bad_threshold))]
 
     def _interpret_solvability(self, ratio: Optional[float]) -> str:
         """Interpréter le ratio de solvabilité."""
         if ratio is None:
             return "Non calculable"
         
-        if ratio > 1:
-            return "✅ Solvable"
-        elif ratio > 0.5:
-            return "🟡 Solvabilité moyenne"
-        else:
-            return "⚠️ Solvabilité faible"
+        return _VERDICTS_SOLVABILITE[bisect_left(_SEUILS_SOLVABILITE, ratio)]
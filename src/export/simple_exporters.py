@@ -3,19 +3,204 @@ Exporteurs simplifiés sans dépendances complexes pour compatibilité Python 3.
 """
 
 import os
-from pathlib import Path
+import tempfile
+from functools import lru_cache
 from datetime import datetime
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import csv
 import json
 
+try:
+    import orjson
+    ORJSON_DISPONIBLE = True
+except ImportError:
+    ORJSON_DISPONIBLE = False
+
 from core.simple_models import BilanFonctionnel, BilanFinancier, PatrimoineEntreprise
 
 
+# Lignes CSV (libellé, attribut du modèle, catégorie) par type de rapport ;
+# les valeurs sont écrites brutes par csv.writer, sans f-string par ligne
+_LIGNES_CSV = {
+    BilanFonctionnel: (
+        ("Emplois stables", 'emplois_stables', "Emploi"),
+        ("Ressources stables", 'ressources_stables', "Ressource"),
+        ("FRNG", 'frng', "Solde"),
+        ("Actifs circulants", 'actifs_circulants', "Actif"),
+        ("Passifs circulants", 'passifs_circulants', "Passif"),
+        ("BFR", 'bfr', "Solde"),
+        ("Trésorerie active", 'tresorerie_active', "Actif"),
+        ("Trésorerie passive", 'tresorerie_passive', "Passif"),
+        ("Trésorerie nette", 'tresorerie_nette', "Solde"),
+    ),
+    BilanFinancier: (
+        ("Immobilisations nettes", 'immobilisations_nettes', "Actif"),
+        ("Stocks", 'stocks', "Actif"),
+        ("Créances clients", 'creances_clients', "Actif"),
+        ("Autres créances", 'autres_creances', "Actif"),
+        ("Trésorerie active", 'tresorerie_active', "Actif"),
+        ("TOTAL ACTIF", 'total_actif', "Total"),
+        ("Capital social", 'capital_social', "Passif"),
+        ("Réserves", 'reserves', "Passif"),
+        ("Résultat net", 'resultat_net', "Passif"),
+        ("Capitaux propres", 'capitaux_propres', "Passif"),
+        ("Dettes financières LT", 'dettes_financieres_lt', "Passif"),
+        ("Dettes fournisseurs", 'dettes_fournisseurs', "Passif"),
+        ("Autres dettes CT", 'autres_dettes_ct', "Passif"),
+        ("Trésorerie passive", 'tresorerie_passive', "Passif"),
+        ("TOTAL PASSIF", 'total_passif', "Total"),
+    ),
+    PatrimoineEntreprise: (
+        ("Actifs économiques", 'actifs_economiques', "Actif"),
+        ("Dettes financières", 'dettes_financieres', "Passif"),
+        ("Actif net comptable", 'actif_net_comptable', "Solde"),
+        ("Capitaux propres retraités", 'capitaux_propres_retraites', "Capitaux"),
+        ("PATRIMOINE NET", 'patrimoine_net', "Total"),
+    ),
+}
+
+
+def _analyser_bilan_fonctionnel(rapport: BilanFonctionnel) -> Tuple[tuple, tuple, tuple]:
+    """Analyser un bilan fonctionnel."""
+    points_cles, recommandations, alertes = [], [], []
+
+    if rapport.frng > 0:
+        points_cles.append("FRNG positif")
+    else:
+        alertes.append("FRNG négatif")
+        recommandations.append("Renforcer les ressources stables")
+
+    if rapport.tresorerie_nette < 0:
+        alertes.append("Trésorerie négative")
+        recommandations.append("Améliorer la gestion de trésorerie")
+
+    return tuple(points_cles), tuple(recommandations), tuple(alertes)
+
+
+def _analyser_bilan_financier(rapport: BilanFinancier) -> Tuple[tuple, tuple, tuple]:
+    """Analyser un bilan financier."""
+    if rapport.total_actif > 0:
+        ratio_endettement = (rapport.total_passif - rapport.capitaux_propres) / rapport.total_actif
+        if ratio_endettement > 0.7:
+            return (), ("Réduire l'endettement",), ("Endettement élevé",)
+    return (), (), ()
+
+
+def _analyser_patrimoine(rapport: PatrimoineEntreprise) -> Tuple[tuple, tuple, tuple]:
+    """Analyser un patrimoine."""
+    if rapport.ratio_endettement and rapport.ratio_endettement > 0.5:
+        return (), (), ("Endettement patrimonial élevé",)
+    return (), (), ()
+
+
+# Répartition par type de rapport : une recherche par type(rapport)
+# remplace les chaînes d'isinstance
+_NOMS_PAR_TYPE = {
+    BilanFonctionnel: "Bilan Fonctionnel",
+    BilanFinancier: "Bilan Financier",
+    PatrimoineEntreprise: "Patrimoine Entreprise",
+}
+
+_ANALYSEURS_PAR_TYPE = {
+    BilanFonctionnel: _analyser_bilan_fonctionnel,
+    BilanFinancier: _analyser_bilan_financier,
+    PatrimoineEntreprise: _analyser_patrimoine,
+}
+
+# Gabarits texte par type de rapport : une seule passe de format C par
+# section au lieu d'une f-string par ligne, puis un split pour retrouver
+# les lignes
+# Séparateurs du rapport texte, construits une fois à l'import
+_SEP_DOUBLE = "=" * 60
+_SEP_SIMPLE = "-" * 40
+
+_GABARIT_BILAN_FONCTIONNEL = (
+    "BILAN FONCTIONNEL\n" + "-" * 30 + "\n"
+    "Emplois stables:    {0.emplois_stables:,.2f} {d}\n"
+    "Ressources stables:  {0.ressources_stables:,.2f} {d}\n"
+    "FRNG:               {0.frng:,.2f} {d}\n"
+    "\n"
+    "Actifs circulants:   {0.actifs_circulants:,.2f} {d}\n"
+    "Passifs circulants:  {0.passifs_circulants:,.2f} {d}\n"
+    "BFR:                {0.bfr:,.2f} {d}\n"
+    "\n"
+    "Trésorerie active:   {0.tresorerie_active:,.2f} {d}\n"
+    "Trésorerie passive:  {0.tresorerie_passive:,.2f} {d}\n"
+    "Trésorerie nette:    {0.tresorerie_nette:,.2f} {d}"
+)
+
+_GABARIT_BILAN_FINANCIER = (
+    "ACTIF\n" + "-" * 30 + "\n"
+    "Immobilisations nettes: {0.immobilisations_nettes:,.2f} {d}\n"
+    "Stocks:                {0.stocks:,.2f} {d}\n"
+    "Créances clients:       {0.creances_clients:,.2f} {d}\n"
+    "Autres créances:       {0.autres_creances:,.2f} {d}\n"
+    "Trésorerie active:      {0.tresorerie_active:,.2f} {d}\n"
+    "TOTAL ACTIF:           {0.total_actif:,.2f} {d}\n"
+    "\n"
+    "PASSIF\n" + "-" * 30 + "\n"
+    "Capital social:         {0.capital_social:,.2f} {d}\n"
+    "Réserves:              {0.reserves:,.2f} {d}\n"
+    "Résultat net:          {0.resultat_net:,.2f} {d}\n"
+    "Capitaux propres:       {0.capitaux_propres:,.2f} {d}\n"
+    "Dettes financières LT:   {0.dettes_financieres_lt:,.2f} {d}\n"
+    "Dettes fournisseurs:     {0.dettes_fournisseurs:,.2f} {d}\n"
+    "Autres dettes CT:       {0.autres_dettes_ct:,.2f} {d}\n"
+    "Trésorerie passive:     {0.tresorerie_passive:,.2f} {d}\n"
+    "TOTAL PASSIF:           {0.total_passif:,.2f} {d}"
+)
+
+_GABARIT_PATRIMOINE = (
+    "PATRIMOINE DE L'ENTREPRISE\n" + "-" * 30 + "\n"
+    "Actifs économiques:        {0.actifs_economiques:,.2f} {d}\n"
+    "Dettes financières:        {0.dettes_financieres:,.2f} {d}\n"
+    "Actif net comptable:       {0.actif_net_comptable:,.2f} {d}\n"
+    "Capitaux propres retraités: {0.capitaux_propres_retraites:,.2f} {d}\n"
+    "PATRIMOINE NET:           {0.patrimoine_net:,.2f} {d}\n"
+)
+
+_GABARIT_RATIOS_PATRIMOINE = (
+    "RATIOS PATRIMONIAUX\n" + "-" * 30 + "\n"
+    "Ratio d'endettement: {0.ratio_endettement:.2%}\n"
+    "Ratio de solvabilité: {0.ratio_solvabilite:.2f}\n"
+    "Ratio de liquidité:  {0.ratio_liquidite:.2f}"
+)
+
+_FORMATEURS_TEXTE_PAR_TYPE = {
+    BilanFonctionnel: '_format_bilan_fonctionnel_texte',
+    BilanFinancier: '_format_bilan_financier_texte',
+    PatrimoineEntreprise: '_format_patrimoine_texte',
+}
+
+
+@lru_cache(maxsize=128)
+def _analyser_rapport(rapport: Any) -> Tuple[tuple, tuple, tuple]:
+    """Analyser un rapport figé : (points clés, recommandations, alertes).
+
+    Les modèles étant des dataclasses figées (donc hachables), la même
+    instance repasse ici gratuitement — le flux affichage puis export
+    refait l'analyse deux fois. Le résultat est mis en cache sous forme de
+    tuples ; _generer_analyse rematérialise des listes fraîches à chaque
+    appel.
+    """
+    analyseur = _ANALYSEURS_PAR_TYPE.get(type(rapport))
+    if analyseur is None:
+        return (), (), ()
+    return analyseur(rapport)
+
+
 class SimpleExporter:
     """Exporteur de base pour les rapports financiers."""
     
-    def __init__(self):
-        pass
+    def __init__(self, export_dir: str = "exports"):
+        # Répertoire d'export résolu une fois pour toutes : le makedirs est
+        # idempotent et chaque export évite ainsi un appel système
+        # redondant. Chaîne plutôt que Path : os.path.join est une simple
+        # opération C sur chaînes, sans construction d'objet par export.
+        # Paramétrable pour que les tests écrivent dans un répertoire
+        # temporaire au lieu du répertoire exports/ suivi par git
+        self._export_dir = export_dir
+        os.makedirs(self._export_dir, exist_ok=True)
     
     def export_to_json(self, rapport: Any, filename: str, options: Dict[str, Any]) -> str:
         """
@@ -29,16 +214,12 @@ class SimpleExporter:
         Returns:
             Chemin du fichier généré
         """
-        # Créer le répertoire d'export
-        export_dir = Path("exports")
-        export_dir.mkdir(exist_ok=True)
-        
-        file_path = export_dir / filename
-        
+        file_path = os.path.join(self._export_dir, filename)
+
         # Préparer les données
         export_data = {
             'type': self._get_rapport_type(rapport),
-            'date_generation': datetime.now().isoformat(),
+            'date_generation': options.get('_date_iso') or datetime.now().isoformat(),
             'entreprise': options.get('entreprise', 'Entreprise'),
             'periode': options.get('periode', '2024'),
             'devise': options.get('devise', 'MAD'),
@@ -46,11 +227,38 @@ class SimpleExporter:
             'analyse': self._generer_analyse(rapport, options)
         }
         
-        # Écrire le fichier JSON
-        with open(file_path, 'w', encoding='utf-8') as f:
-            json.dump(export_data, f, indent=2, ensure_ascii=False, default=str)
-        
-        return str(file_path)
+        # Écrire le fichier JSON : une seule sérialisation puis un seul
+        # write, au lieu des nombreux petits écrits que json.dump émet
+        # morceau par morceau vers le fichier. orjson (sérialiseur C,
+        # sortie en octets) est utilisé quand il est installé, sinon le
+        # json de la bibliothèque standard
+        if ORJSON_DISPONIBLE:
+            payload = orjson.dumps(
+                export_data,
+                option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS,
+                default=str)
+        else:
+            payload = json.dumps(export_data, indent=2, ensure_ascii=False,
+                                 default=str).encode('utf-8')
+        self._ecrire_atomique(file_path, payload)
+
+        return file_path
+
+    def _ecrire_atomique(self, file_path: str, donnees: bytes) -> None:
+        """Écrire dans un fichier temporaire puis renommer sur la cible.
+
+        os.replace est atomique sur un même système de fichiers : un
+        lecteur concurrent (tableur ouvert sur l'export précédent,
+        synchronisation de dossier) ne voit jamais de fichier tronqué.
+        """
+        fd, tmp = tempfile.mkstemp(dir=self._export_dir, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                f.write(donnees)
+            os.replace(tmp, file_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
     
     def export_to_text(self, rapport: Any, filename: str, options: Dict[str, Any]) -> str:
         """
@@ -64,20 +272,18 @@ class SimpleExporter:
         Returns:
             Chemin du fichier généré
         """
-        # Créer le répertoire d'export
-        export_dir = Path("exports")
-        export_dir.mkdir(exist_ok=True)
-        
-        file_path = export_dir / filename
-        
-        # Générer le contenu texte
-        content = self._generer_rapport_texte(rapport, options)
-        
-        # Écrire le fichier
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return str(file_path)
+        return self.ecrire_texte(self._generer_rapport_texte(rapport, options), filename)
+
+    def ecrire_texte(self, contenu: str, filename: str) -> str:
+        """Écrire un contenu texte déjà rendu dans le répertoire d'export.
+
+        Permet de réutiliser un rendu existant (par exemple celui affiché à
+        l'écran) sans regénérer le rapport. L'écriture se fait en un seul
+        appel, sans repasser par le tampon de 8 Ko du TextIOWrapper.
+        """
+        file_path = os.path.join(self._export_dir, filename)
+        self._ecrire_atomique(file_path, contenu.encode('utf-8'))
+        return file_path
     
     def export_to_csv(self, rapport: Any, filename: str, options: Dict[str, Any]) -> str:
         """
@@ -91,95 +297,65 @@ class SimpleExporter:
         Returns:
             Chemin du fichier généré
         """
-        # Créer le répertoire d'export
-        export_dir = Path("exports")
-        export_dir.mkdir(exist_ok=True)
-        
-        file_path = export_dir / filename
-        
-        # Générer le contenu CSV
-        content = self._generer_rapport_csv(rapport, options)
-        
-        # Écrire le fichier
-        with open(file_path, 'w', encoding='utf-8') as f:
-            f.write(content)
-        
-        return str(file_path)
+        file_path = os.path.join(self._export_dir, filename)
+
+        # Écrire le CSV en continu : csv.writer (codé en C) formate les
+        # lignes directement dans le fichier, sans liste intermédiaire.
+        # Tampon large pour regrouper les lignes courtes en un minimum
+        # d'appels système ; écriture dans un temporaire puis renommage
+        # atomique, comme les autres formats
+        fd, tmp = tempfile.mkstemp(dir=self._export_dir, suffix='.tmp')
+        try:
+            with open(fd, 'w', encoding='utf-8', newline='', buffering=1 << 18) as f:
+                self._generer_rapport_csv(rapport, options, f)
+            os.replace(tmp, file_path)
+        except BaseException:
+            os.unlink(tmp)
+            raise
+
+        return file_path
     
     def _get_rapport_type(self, rapport: Any) -> str:
         """Déterminer le type de rapport."""
-        if isinstance(rapport, BilanFonctionnel):
-            return "Bilan Fonctionnel"
-        elif isinstance(rapport, BilanFinancier):
-            return "Bilan Financier"
-        elif isinstance(rapport, PatrimoineEntreprise):
-            return "Patrimoine Entreprise"
-        else:
-            return "Rapport Inconnu"
+        return _NOMS_PAR_TYPE.get(type(rapport), "Rapport Inconnu")
     
     def _generer_analyse(self, rapport: Any, options: Dict[str, Any]) -> Dict[str, Any]:
         """Générer une analyse simple du rapport."""
-        analyse = {
-            'points_cles': [],
-            'recommandations': [],
-            'alertes': []
+        points_cles, recommandations, alertes = _analyser_rapport(rapport)
+        return {
+            'points_cles': list(points_cles),
+            'recommandations': list(recommandations),
+            'alertes': list(alertes)
         }
-        
-        if isinstance(rapport, BilanFonctionnel):
-            if rapport.frng > 0:
-                analyse['points_cles'].append("FRNG positif")
-            else:
-                analyse['alertes'].append("FRNG négatif")
-                analyse['recommandations'].append("Renforcer les ressources stables")
-            
-            if rapport.tresorerie_nette < 0:
-                analyse['alertes'].append("Trésorerie négative")
-                analyse['recommandations'].append("Améliorer la gestion de trésorerie")
-        
-        elif isinstance(rapport, BilanFinancier):
-            if rapport.total_actif > 0:
-                ratio_endettement = (rapport.total_passif - rapport.capitaux_propres) / rapport.total_actif
-                if ratio_endettement > 0.7:
-                    analyse['alertes'].append("Endettement élevé")
-                    analyse['recommandations'].append("Réduire l'endettement")
-        
-        elif isinstance(rapport, PatrimoineEntreprise):
-            if rapport.ratio_endettement and rapport.ratio_endettement > 0.5:
-                analyse['alertes'].append("Endettement patrimonial élevé")
-        
-        return analyse
     
     def _generer_rapport_texte(self, rapport: Any, options: Dict[str, Any]) -> str:
         """Générer le rapport au format texte."""
         lines = []
         
         # En-tête
-        lines.append("=" * 60)
+        lines.append(_SEP_DOUBLE)
         lines.append(f"RAPPORT FINANCIER - {self._get_rapport_type(rapport)}")
-        lines.append("=" * 60)
+        lines.append(_SEP_DOUBLE)
         lines.append("")
         
         # Informations générales
         lines.append(f"Entreprise: {options.get('entreprise', 'Entreprise')}")
         lines.append(f"Période: {options.get('periode', '2024')}")
         lines.append(f"Devise: {options.get('devise', 'MAD')}")
-        lines.append(f"Date: {datetime.now().strftime('%d/%m/%Y %H:%M')}")
+        lines.append(f"Date: {options.get('_datetime') or datetime.now().strftime('%d/%m/%Y %H:%M')}")
         lines.append("")
         
         # Contenu spécifique selon le type
-        if isinstance(rapport, BilanFonctionnel):
-            lines.extend(self._format_bilan_fonctionnel_texte(rapport, options))
-        elif isinstance(rapport, BilanFinancier):
-            lines.extend(self._format_bilan_financier_texte(rapport, options))
-        elif isinstance(rapport, PatrimoineEntreprise):
-            lines.extend(self._format_patrimoine_texte(rapport, options))
+        formateur = _FORMATEURS_TEXTE_PAR_TYPE.get(type(rapport))
+        if formateur:
+            lines.extend(getattr(self, formateur)(rapport, options))
         
         # Analyse
         analyse = self._generer_analyse(rapport, options)
         if analyse['points_cles'] or analyse['alertes']:
             lines.append("")
             lines.append("ANALYSE ET RECOMMANDATIONS")
-            lines.append("-" * 40)
+            lines.append(_SEP_SIMPLE)
             
             if analyse['points_cles']:
                 lines.append("Points clés:")
@@ -203,123 +379,32 @@ class SimpleExporter:
     def _format_bilan_fonctionnel_texte(self, bilan: BilanFonctionnel, options: Dict[str, Any]) -> List[str]:
         """Formater le bilan fonctionnel en texte."""
         devise = options.get('devise', 'MAD')
-        lines = []
-        
-        lines.append("BILAN FONCTIONNEL")
-        lines.append("-" * 30)
-        lines.append(f"Emplois stables:    {bilan.emplois_stables:,.2f} {devise}")
-        lines.append(f"Ressources stables:  {bilan.ressources_stables:,.2f} {devise}")
-        lines.append(f"FRNG:               {bilan.frng:,.2f} {devise}")
-        lines.append("")
-        lines.append(f"Actifs circulants:   {bilan.actifs_circulants:,.2f} {devise}")
-        lines.append(f"Passifs circulants:  {bilan.passifs_circulants:,.2f} {devise}")
-        lines.append(f"BFR:                {bilan.bfr:,.2f} {devise}")
-        lines.append("")
-        lines.append(f"Trésorerie active:   {bilan.tresorerie_active:,.2f} {devise}")
-        lines.append(f"Trésorerie passive:  {bilan.tresorerie_passive:,.2f} {devise}")
-        lines.append(f"Trésorerie nette:    {bilan.tresorerie_nette:,.2f} {devise}")
-        
-        return lines
+        return _GABARIT_BILAN_FONCTIONNEL.format(bilan, d=devise).split("\n")
     
     def _format_bilan_financier_texte(self, bilan: BilanFinancier, options: Dict[str, Any]) -> List[str]:
         """Formater le bilan financier en texte."""
         devise = options.get('devise', 'MAD')
-        lines = []
-        
-        lines.append("ACTIF")
-        lines.append("-" * 30)
-        lines.append(f"Immobilisations nettes: {bilan.immobilisations_nettes:,.2f} {devise}")
-        lines.append(f"Stocks:                {bilan.stocks:,.2f} {devise}")
-        lines.append(f"Créances clients:       {bilan.creances_clients:,.2f} {devise}")
-        lines.append(f"Autres créances:       {bilan.autres_creances:,.2f} {devise}")
-        lines.append(f"Trésorerie active:      {bilan.tresorerie_active:,.2f} {devise}")
-        lines.append(f"TOTAL ACTIF:           {bilan.total_actif:,.2f} {devise}")
-        lines.append("")
-        
-        lines.append("PASSIF")
-        lines.append("-" * 30)
-        lines.append(f"Capital social:         {bilan.capital_social:,.2f} {devise}")
-        lines.append(f"Réserves:              {bilan.reserves:,.2f} {devise}")
-        lines.append(f"Résultat net:          {bilan.resultat_net:,.2f} {devise}")
-        lines.append(f"Capitaux propres:       {bilan.capitaux_propres:,.2f} {devise}")
-        lines.append(f"Dettes financières LT:   {bilan.dettes_financieres_lt:,.2f} {devise}")
-        lines.append(f"Dettes fournisseurs:     {bilan.dettes_fournisseurs:,.2f} {devise}")
-        lines.append(f"Autres dettes CT:       {bilan.autres_dettes_ct:,.2f} {devise}")
-        lines.append(f"Trésorerie passive:     {bilan.tresorerie_passive:,.2f} {devise}")
-        lines.append(f"TOTAL PASSIF:           {bilan.total_passif:,.2f} {devise}")
-        
-        return lines
+        return _GABARIT_BILAN_FINANCIER.format(bilan, d=devise).split("\n")
     
     def _format_patrimoine_texte(self, patrimoine: PatrimoineEntreprise, options: Dict[str, Any]) -> List[str]:
         """Formater le patrimoine en texte."""
         devise = options.get('devise', 'MAD')
-        lines = []
-        
-        lines.append("PATRIMOINE DE L'ENTREPRISE")
-        lines.append("-" * 30)
-        lines.append(f"Actifs économiques:        {patrimoine.actifs_economiques:,.2f} {devise}")
-        lines.append(f"Dettes financières:        {patrimoine.dettes_financieres:,.2f} {devise}")
-        lines.append(f"Actif net comptable:       {patrimoine.actif_net_comptable:,.2f} {devise}")
-        lines.append(f"Capitaux propres retraités: {patrimoine.capitaux_propres_retraites:,.2f} {devise}")
-        lines.append(f"PATRIMOINE NET:           {patrimoine.patrimoine_net:,.2f} {devise}")
-        lines.append("")
-        
+        lines = _GABARIT_PATRIMOINE.format(patrimoine, d=devise).split("\n")
+
         if patrimoine.ratio_endettement is not None:
-            lines.append("RATIOS PATRIMONIAUX")
-            lines.append("-" * 30)
-            lines.append(f"Ratio d'endettement: {patrimoine.ratio_endettement:.2%}")
-            lines.append(f"Ratio de solvabilité: {patrimoine.ratio_solvabilite:.2f}")
-            lines.append(f"Ratio de liquidité:  {patrimoine.ratio_liquidite:.2f}")
-        
+            lines.extend(_GABARIT_RATIOS_PATRIMOINE.format(patrimoine).split("\n"))
+
         return lines
     
-    def _generer_rapport_csv(self, rapport: Any, options: Dict[str, Any]) -> str:
-        """Générer le rapport au format CSV."""
-        lines = []
-        
+    def _generer_rapport_csv(self, rapport: Any, options: Dict[str, Any],
+                             fileobj) -> None:
+        """Écrire le rapport au format CSV dans le fichier ouvert."""
+        writer = csv.writer(fileobj, lineterminator='\n')
+
         # En-tête CSV
-        lines.append("Rubrique,Montant,Type")
-        
+        writer.writerow(("Rubrique", "Montant", "Type"))
+
         # Contenu selon le type
-        if isinstance(rapport, BilanFonctionnel):
-            lines.extend([
-                f"Emplois stables,{rapport.emplois_stables},Emploi",
-                f"Ressources stables,{rapport.ressources_stables},Ressource",
-                f"FRNG,{rapport.frng},Solde",
-                f"Actifs circulants,{rapport.actifs_circulants},Actif",
-                f"Passifs circulants,{rapport.passifs_circulants},Passif",
-                f"BFR,{rapport.bfr},Solde",
-                f"Trésorerie active,{rapport.tresorerie_active},Actif",
-                f"Trésorerie passive,{rapport.tresorerie_passive},Passif",
-                f"Trésorerie nette,{rapport.tresorerie_nette},Solde"
-            ])
-        
-        elif isinstance(rapport, BilanFinancier):
-            lines.extend([
-                f"Immobilisations nettes,{rapport.immobilisations_nettes},Actif",
-                f"Stocks,{rapport.stocks},Actif",
-                f"Créances clients,{rapport.creances_clients},Actif",
-                f"Autres créances,{rapport.autres_creances},Actif",
-                f"Trésorerie active,{rapport.tresorerie_active},Actif",
-                f"TOTAL ACTIF,{rapport.total_actif},Total",
-                f"Capital social,{rapport.capital_social},Passif",
-                f"Réserves,{rapport.reserves},Passif",
-                f"Résultat net,{rapport.resultat_net},Passif",
-                f"Capitaux propres,{rapport.capitaux_propres},Passif",
-                f"Dettes financières LT,{rapport.dettes_financieres_lt},Passif",
-                f"Dettes fournisseurs,{rapport.dettes_fournisseurs},Passif",
-                f"Autres dettes CT,{rapport.autres_dettes_ct},Passif",
-                f"Trésorerie passive,{rapport.tresorerie_passive},Passif",
-                f"TOTAL PASSIF,{rapport.total_passif},Total"
-            ])
-        
-        elif isinstance(rapport, PatrimoineEntreprise):
-            lines.extend([
-                f"Actifs économiques,{rapport.actifs_economiques},Actif",
-                f"Dettes financières,{rapport.dettes_financieres},Passif",
-                f"Actif net comptable,{rapport.actif_net_comptable},Solde",
-                f"Capitaux propres retraités,{rapport.capitaux_propres_retraites},Capitaux",
-                f"PATRIMOINE NET,{rapport.patrimoine_net},Total"
-            ])
-        
-        return "\n".join(lines)
+        lignes = _LIGNES_CSV.get(type(rapport), ())
+        writer.writerows((libelle, getattr(rapport, attr), categorie)
+                         for libelle, attr, categorie in lignes)
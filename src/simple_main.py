@@ -4,6 +4,7 @@ Compatible avec Python 3.14 et dépendances minimales.
 """
 
 import sys
+from datetime import datetime
 from pathlib import Path
 
 # Ajouter le répertoire src au path
@@ -56,17 +57,27 @@ class SimpleComptabilityApp(QMainWindow):
         # Onglet de saisie
         input_tab = self.create_input_tab()
         self.tabs.addTab(input_tab, "Saisie des données")
-        
-        # Onglet de rapports
-        report_tab = self.create_report_tab()
-        self.tabs.addTab(report_tab, "Rapports")
-        
-        # Onglet d'export
-        export_tab = self.create_export_tab()
-        self.tabs.addTab(export_tab, "Export")
-        
+
+        # Onglets de rapports et d'export différés : des emplacements vides
+        # sont affichés au démarrage, les widgets réels ne sont construits
+        # qu'à la première visite de l'onglet
+        self.tabs.addTab(QWidget(), "Rapports")
+        self.tabs.addTab(QWidget(), "Export")
+        self._onglets_differes = {1: self.create_report_tab, 2: self.create_export_tab}
+        self.tabs.currentChanged.connect(self._construire_onglet)
+
         # Status bar
         self.statusBar().showMessage("Prêt")
+
+    def _construire_onglet(self, indice):
+        """Remplacer l'emplacement d'un onglet différé à sa première visite."""
+        fabrique = self._onglets_differes.pop(indice, None)
+        if fabrique is None:
+            return
+        titre = self.tabs.tabText(indice)
+        self.tabs.removeTab(indice)
+        self.tabs.insertTab(indice, fabrique(), titre)
+        self.tabs.setCurrentIndex(indice)
     
     def create_header(self):
         """Créer l'en-tête de l'application."""
@@ -213,15 +224,27 @@ class SimpleComptabilityApp(QMainWindow):
     
     def add_ligne(self):
         """Ajouter une ligne au tableau."""
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-        
         # Valeurs par défaut
-        self.table.setItem(row, 0, QTableWidgetItem("1111"))
-        self.table.setItem(row, 1, QTableWidgetItem("Capital social"))
-        self.table.setItem(row, 2, QTableWidgetItem("1"))
-        self.table.setItem(row, 3, QTableWidgetItem("CREDIT"))
-        self.table.setItem(row, 4, QTableWidgetItem("100000"))
+        self.add_lignes_batch([("1111", "Capital social", "1", "CREDIT", "100000")])
+
+    def add_lignes_batch(self, lignes):
+        """Ajouter plusieurs lignes au tableau en une seule repasse.
+
+        setRowCount réserve toutes les lignes d'un coup et les signaux et
+        rafraîchissements sont suspendus pendant le remplissage : une seule
+        mise en page au lieu d'une par ligne insérée.
+        """
+        debut = self.table.rowCount()
+        self.table.setUpdatesEnabled(False)
+        self.table.blockSignals(True)
+        try:
+            self.table.setRowCount(debut + len(lignes))
+            for i, ligne in enumerate(lignes):
+                for col, valeur in enumerate(ligne):
+                    self.table.setItem(debut + i, col, QTableWidgetItem(valeur))
+        finally:
+            self.table.blockSignals(False)
+            self.table.setUpdatesEnabled(True)
     
     def clear_table(self):
         """Vider le tableau."""
@@ -231,45 +254,61 @@ class SimpleComptabilityApp(QMainWindow):
     
     def validate_donnees(self):
         """Valider les données saisies."""
-        try:
-            lignes = []
-            
-            for row in range(self.table.rowCount()):
-                code = self.table.item(row, 0).text()
-                libelle = self.table.item(row, 1).text()
-                classe = int(self.table.item(row, 2).text())
-                sens_text = self.table.item(row, 3).text().upper()
-                montant = float(self.table.item(row, 4).text())
-                
-                sens = Sens.DEBIT if sens_text == "DEBIT" else Sens.CREDIT
-                
-                ligne = LigneCompte(
+        periode = self.periode_input.text()
+
+        # Extraire toutes les cellules en une passe via le modèle :
+        # index(r, c).data() rend la chaîne affichée en un seul passage
+        # Qt C++ → Python, sans passer par le QTableWidgetItem, et rend
+        # None (donc "") pour les cellules jamais éditées
+        index = self.table.model().index
+        cellules = [
+            [index(row, col).data(Qt.DisplayRole) or ""
+             for col in range(5)]
+            for row in range(self.table.rowCount())
+        ]
+
+        lignes = []
+        erreurs = []
+        for numero, (code, libelle, classe, sens_text, montant) in enumerate(cellules, start=1):
+            try:
+                lignes.append(LigneCompte(
                     code_compte=code,
                     libelle=libelle,
-                    classe=classe,
-                    sens=sens,
-                    montant=montant,
-                    periode=self.periode_input.text()
-                )
-                lignes.append(ligne)
-            
-            # Créer le jeu de données
+                    classe=int(classe),
+                    sens=Sens.DEBIT if sens_text.upper() == "DEBIT" else Sens.CREDIT,
+                    montant=float(montant),
+                    periode=periode
+                ))
+            except Exception as e:
+                erreurs.append(f"ligne {numero}: {e}")
+
+        if erreurs:
+            # Toutes les lignes en erreur sont signalées d'un coup, au lieu
+            # d'abandonner le lot à la première cellule invalide
+            self.message_area.setText("❌ Erreur de validation: " + " ; ".join(erreurs))
+            self.statusBar().showMessage("Erreur de validation")
+            return
+
+        # Créer le jeu de données : la construction valide le lot dans son
+        # ensemble (au moins une ligne, équilibre débit/crédit) et doit donc
+        # rester gardée comme les lignes individuelles ci-dessus
+        try:
             self.donnees_actuelles = JeuDonnees(
                 lignes=lignes,
-                periode=self.periode_input.text(),
+                periode=periode,
                 entreprise=self.entreprise_input.text()
             )
-            
-            # Mettre à jour les labels
-            self.entreprise_label.setText(f"Entreprise: {self.entreprise_input.text()}")
-            self.periode_label.setText(f"Période: {self.periode_input.text()}")
-            
-            self.message_area.setText(f"✅ {len(lignes)} lignes validées avec succès")
-            self.statusBar().showMessage("Données validées")
-            
         except Exception as e:
             self.message_area.setText(f"❌ Erreur de validation: {str(e)}")
             self.statusBar().showMessage("Erreur de validation")
+            return
+
+        # Mettre à jour les labels
+        self.entreprise_label.setText(f"Entreprise: {self.entreprise_input.text()}")
+        self.periode_label.setText(f"Période: {periode}")
+
+        self.message_area.setText(f"✅ {len(lignes)} lignes validées avec succès")
+        self.statusBar().showMessage("Données validées")
     
     def generate_report(self):
         """Générer le rapport sélectionné."""
@@ -298,8 +337,15 @@ class SimpleComptabilityApp(QMainWindow):
             
             rapport_text = self.exporter._generer_rapport_texte(rapport, options)
             self.report_display.setPlainText(rapport_text)
-            
+
             self.current_report = rapport
+            # Mémoriser le rendu affiché : l'export texte du même rapport
+            # avec les mêmes options le réécrira tel quel sans regénérer
+            self._dernier_rendu = (
+                rapport,
+                (options['entreprise'], options['periode'], options['devise']),
+                rapport_text,
+            )
             self.statusBar().showMessage(f"{report_type} généré")
             
         except Exception as e:
@@ -313,31 +359,38 @@ class SimpleComptabilityApp(QMainWindow):
         
         try:
             format_type = self.export_format.currentText().lower()
-            
+            periode = self.periode_input.text()
+
             # Nom de fichier par défaut
-            filename = f"rapport_{self.report_type.currentText().lower().replace(' ', '_')}_{self.periode_input.text()}"
-            
+            filename = f"rapport_{self.report_type.currentText().lower().replace(' ', '_')}_{periode}"
+
+            # Options construites une seule fois pour tous les formats, avec
+            # l'horodatage figé au début de l'action d'export
+            maintenant = datetime.now()
+            options = {
+                '_date_iso': maintenant.isoformat(),
+                '_datetime': maintenant.strftime('%d/%m/%Y %H:%M'),
+                'entreprise': self.entreprise_input.text(),
+                'periode': periode,
+                'devise': 'MAD'
+            }
+
             if format_type == "json":
                 filename += ".json"
-                filepath = self.exporter.export_to_json(self.current_report, filename, {
-                    'entreprise': self.entreprise_input.text(),
-                    'periode': self.periode_input.text(),
-                    'devise': 'MAD'
-                })
+                filepath = self.exporter.export_to_json(self.current_report, filename, options)
             elif format_type == "texte":
                 filename += ".txt"
-                filepath = self.exporter.export_to_text(self.current_report, filename, {
-                    'entreprise': self.entreprise_input.text(),
-                    'periode': self.periode_input.text(),
-                    'devise': 'MAD'
-                })
+                rendu = getattr(self, '_dernier_rendu', None)
+                if (rendu is not None and rendu[0] is self.current_report
+                        and rendu[1] == (options['entreprise'], options['periode'], options['devise'])):
+                    # Le texte affiché a été rendu avec les mêmes options :
+                    # l'écrire tel quel évite une regénération complète
+                    filepath = self.exporter.ecrire_texte(rendu[2], filename)
+                else:
+                    filepath = self.exporter.export_to_text(self.current_report, filename, options)
             elif format_type == "csv":
                 filename += ".csv"
-                filepath = self.exporter.export_to_csv(self.current_report, filename, {
-                    'entreprise': self.entreprise_input.text(),
-                    'periode': self.periode_input.text(),
-                    'devise': 'MAD'
-                })
+                filepath = self.exporter.export_to_csv(self.current_report, filename, options)
             
             QMessageBox.information(self, "Export réussi", f"Rapport exporté avec succès:\n{filepath}")
             self.statusBar().showMessage(f"Exporté: {filename}")
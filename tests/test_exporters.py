@@ -6,21 +6,28 @@ import unittest
 import json
 import os
 import tempfile
-from pathlib import Path
 
-from src.core.simple_models import BilanFonctionnel
+from src.core.simple_models import BilanFonctionnel, BilanFinancier, PatrimoineEntreprise
 from src.export.simple_exporters import SimpleExporter
 
 
 class TestSimpleExporter(unittest.TestCase):
     """Tests pour la classe SimpleExporter."""
-    
-    def setUp(self):
-        """Configuration des tests."""
-        self.exporter = SimpleExporter()
-        
+
+    @classmethod
+    def setUpClass(cls):
+        """Configuration partagée des tests.
+
+        L'exporteur et le bilan de test sont immuables : une seule
+        construction pour toute la classe au lieu d'une par test.
+        L'exporteur écrit dans un répertoire temporaire partagé pour ne
+        pas laisser d'artefacts dans le répertoire exports/ suivi par git.
+        """
+        cls._repertoire_temp = tempfile.TemporaryDirectory()
+        cls.exporter = SimpleExporter(export_dir=cls._repertoire_temp.name)
+
         # Bilan fonctionnel de test
-        self.bilan_test = BilanFonctionnel(
+        cls.bilan_test = BilanFonctionnel(
             emplois_stables=30000.0,
             ressources_stables=107000.0,
             frng=77000.0,
@@ -33,12 +40,17 @@ class TestSimpleExporter(unittest.TestCase):
             periode="2024"
         )
         
-        self.options_test = {
+        cls.options_test = {
             'entreprise': 'Test Entreprise',
             'periode': '2024',
             'devise': 'MAD'
         }
-    
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage du répertoire temporaire partagé."""
+        cls._repertoire_temp.cleanup()
+
     def test_get_rapport_type(self):
         """Test identification du type de rapport."""
         rapport_type = self.exporter._get_rapport_type(self.bilan_test)
@@ -46,71 +58,57 @@ class TestSimpleExporter(unittest.TestCase):
     
     def test_export_to_json(self):
         """Test export au format JSON."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Modifier le répertoire d'export pour le test
-            original_export_dir = Path("exports")
-            test_export_dir = Path(temp_dir) / "exports"
-            test_export_dir.mkdir()
-            
-            filename = "test_bilan.json"
-            filepath = self.exporter.export_to_json(self.bilan_test, filename, self.options_test)
-            
-            # Vérifier que le fichier existe
-            self.assertTrue(os.path.exists(filepath))
-            
-            # Vérifier le contenu JSON
-            with open(filepath, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-            
-            self.assertEqual(data['type'], "Bilan Fonctionnel")
-            self.assertEqual(data['entreprise'], "Test Entreprise")
-            self.assertEqual(data['periode'], "2024")
-            self.assertEqual(data['devise'], "MAD")
-            self.assertIn('donnees', data)
-            self.assertIn('analyse', data)
-            self.assertEqual(data['donnees']['frng'], 77000.0)
-    
+        filename = "test_bilan.json"
+        filepath = self.exporter.export_to_json(self.bilan_test, filename, self.options_test)
+
+        # Vérifier que le fichier existe
+        self.assertTrue(os.path.exists(filepath))
+
+        # Vérifier le contenu JSON
+        with open(filepath, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        self.assertEqual(data['type'], "Bilan Fonctionnel")
+        self.assertEqual(data['entreprise'], "Test Entreprise")
+        self.assertEqual(data['periode'], "2024")
+        self.assertEqual(data['devise'], "MAD")
+        self.assertIn('donnees', data)
+        self.assertIn('analyse', data)
+        self.assertEqual(data['donnees']['frng'], 77000.0)
+
     def test_export_to_text(self):
         """Test export au format texte."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            test_export_dir = Path(temp_dir) / "exports"
-            test_export_dir.mkdir()
-            
-            filename = "test_bilan.txt"
-            filepath = self.exporter.export_to_text(self.bilan_test, filename, self.options_test)
-            
-            # Vérifier que le fichier existe
-            self.assertTrue(os.path.exists(filepath))
-            
-            # Vérifier le contenu texte
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.assertIn("BILAN FONCTIONNEL", content)
-            self.assertIn("Test Entreprise", content)
-            self.assertIn("2024", content)
-            self.assertIn("77000.00 MAD", content)
-            self.assertIn("FRNG", content)
-    
+        filename = "test_bilan.txt"
+        filepath = self.exporter.export_to_text(self.bilan_test, filename, self.options_test)
+
+        # Vérifier que le fichier existe
+        self.assertTrue(os.path.exists(filepath))
+
+        # Vérifier le contenu texte
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertIn("BILAN FONCTIONNEL", content)
+        self.assertIn("Test Entreprise", content)
+        self.assertIn("2024", content)
+        self.assertIn("77000.00 MAD", content)
+        self.assertIn("FRNG", content)
+
     def test_export_to_csv(self):
         """Test export au format CSV."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            test_export_dir = Path(temp_dir) / "exports"
-            test_export_dir.mkdir()
-            
-            filename = "test_bilan.csv"
-            filepath = self.exporter.export_to_csv(self.bilan_test, filename, self.options_test)
-            
-            # Vérifier que le fichier existe
-            self.assertTrue(os.path.exists(filepath))
-            
-            # Vérifier le contenu CSV
-            with open(filepath, 'r', encoding='utf-8') as f:
-                content = f.read()
-            
-            self.assertIn("Rubrique,Montant,Type", content)
-            self.assertIn("Emplois stables,30000.0,Emploi", content)
-            self.assertIn("FRNG,77000.0,Solde", content)
+        filename = "test_bilan.csv"
+        filepath = self.exporter.export_to_csv(self.bilan_test, filename, self.options_test)
+
+        # Vérifier que le fichier existe
+        self.assertTrue(os.path.exists(filepath))
+
+        # Vérifier le contenu CSV
+        with open(filepath, 'r', encoding='utf-8') as f:
+            content = f.read()
+
+        self.assertIn("Rubrique,Montant,Type", content)
+        self.assertIn("Emplois stables,30000.0,Emploi", content)
+        self.assertIn("FRNG,77000.0,Solde", content)
     
     def test_generer_analyse(self):
         """Test génération de l'analyse."""
@@ -138,8 +136,6 @@ class TestSimpleExporter(unittest.TestCase):
     
     def test_format_bilan_financier_texte(self):
         """Test formatage du bilan financier en texte."""
-        from src.core.simple_models import BilanFinancier
-        
         bilan_financier = BilanFinancier(
             immobilisations_nettes=30000.0,
             stocks=15000.0,
@@ -171,8 +167,6 @@ class TestSimpleExporter(unittest.TestCase):
     
     def test_format_patrimoine_texte(self):
         """Test formatage du patrimoine en texte."""
-        from src.core.simple_models import PatrimoineEntreprise
-        
         patrimoine = PatrimoineEntreprise(
             actifs_economiques=122000.0,
             dettes_financieres=0.0,
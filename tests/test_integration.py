@@ -3,9 +3,8 @@ Tests d'intégration pour l'application complète.
 """
 
 import unittest
-import tempfile
 import os
-from pathlib import Path
+import tempfile
 
 from src.core.simple_models import LigneCompte, JeuDonnees, Sens
 from src.core.simple_transforms import SimpleReportCalculator
@@ -15,13 +14,21 @@ from src.export.simple_exporters import SimpleExporter
 class TestIntegration(unittest.TestCase):
     """Tests d'intégration de bout en bout."""
     
-    def setUp(self):
-        """Configuration des tests."""
-        self.calculator = SimpleReportCalculator()
-        self.exporter = SimpleExporter()
-        
+    @classmethod
+    def setUpClass(cls):
+        """Configuration partagée des tests.
+
+        Le calculateur, l'exporteur et le jeu de données (lignes figées)
+        sont construits une seule fois pour toute la classe. L'exporteur
+        écrit dans un répertoire temporaire partagé pour ne pas laisser
+        d'artefacts dans le répertoire exports/ suivi par git.
+        """
+        cls.calculator = SimpleReportCalculator()
+        cls._repertoire_temp = tempfile.TemporaryDirectory()
+        cls.exporter = SimpleExporter(export_dir=cls._repertoire_temp.name)
+
         # Données complètes de test
-        self.lignes_completes = [
+        cls.lignes_completes = [
             LigneCompte("1111", "Capital social", 1, Sens.CREDIT, 100000.0, "2024"),
             LigneCompte("1119", "Report à nouveau", 1, Sens.CREDIT, 5000.0, "2024"),
             LigneCompte("1191", "Résultat de l'exercice", 1, Sens.CREDIT, 15000.0, "2024"),
@@ -50,14 +57,19 @@ class TestIntegration(unittest.TestCase):
         
         # Ajouter une ligne d'équilibrage pour le résultat
         ligne_equilibrage = LigneCompte("1191", "Résultat de l'exercice", 1, Sens.CREDIT, 23000.0, "2024")
-        self.lignes_completes.append(ligne_equilibrage)
-        
-        self.donnees_completes = JeuDonnees(
-            lignes=self.lignes_completes,
+        cls.lignes_completes.append(ligne_equilibrage)
+
+        cls.donnees_completes = JeuDonnees(
+            lignes=cls.lignes_completes,
             periode="2024",
             entreprise="Entreprise Test Complète"
         )
-    
+
+    @classmethod
+    def tearDownClass(cls):
+        """Nettoyage du répertoire temporaire partagé."""
+        cls._repertoire_temp.cleanup()
+
     def test_flux_complet_bilan_fonctionnel(self):
         """Test flux complet pour le bilan fonctionnel."""
         # 1. Calcul du bilan fonctionnel
@@ -80,24 +92,23 @@ class TestIntegration(unittest.TestCase):
             'devise': 'MAD'
         }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Export JSON
-            json_file = self.exporter.export_to_json(
-                bilan_fonctionnel, "test_bilan_fonctionnel.json", options
-            )
-            self.assertTrue(os.path.exists(json_file))
-            
-            # Export Texte
-            text_file = self.exporter.export_to_text(
-                bilan_fonctionnel, "test_bilan_fonctionnel.txt", options
-            )
-            self.assertTrue(os.path.exists(text_file))
-            
-            # Export CSV
-            csv_file = self.exporter.export_to_csv(
-                bilan_fonctionnel, "test_bilan_fonctionnel.csv", options
-            )
-            self.assertTrue(os.path.exists(csv_file))
+        # Export JSON
+        json_file = self.exporter.export_to_json(
+            bilan_fonctionnel, "test_bilan_fonctionnel.json", options
+        )
+        self.assertTrue(os.path.exists(json_file))
+
+        # Export Texte
+        text_file = self.exporter.export_to_text(
+            bilan_fonctionnel, "test_bilan_fonctionnel.txt", options
+        )
+        self.assertTrue(os.path.exists(text_file))
+
+        # Export CSV
+        csv_file = self.exporter.export_to_csv(
+            bilan_fonctionnel, "test_bilan_fonctionnel.csv", options
+        )
+        self.assertTrue(os.path.exists(csv_file))
     
     def test_flux_complet_bilan_financier(self):
         """Test flux complet pour le bilan financier."""
@@ -117,11 +128,10 @@ class TestIntegration(unittest.TestCase):
             'devise': 'MAD'
         }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            json_file = self.exporter.export_to_json(
-                bilan_financier, "test_bilan_financier.json", options
-            )
-            self.assertTrue(os.path.exists(json_file))
+        json_file = self.exporter.export_to_json(
+            bilan_financier, "test_bilan_financier.json", options
+        )
+        self.assertTrue(os.path.exists(json_file))
     
     def test_flux_complet_patrimoine(self):
         """Test flux complet pour le patrimoine."""
@@ -144,18 +154,17 @@ class TestIntegration(unittest.TestCase):
             'devise': 'MAD'
         }
         
-        with tempfile.TemporaryDirectory() as temp_dir:
-            json_file = self.exporter.export_to_json(
-                patrimoine, "test_patrimoine.json", options
-            )
-            self.assertTrue(os.path.exists(json_file))
+        json_file = self.exporter.export_to_json(
+            patrimoine, "test_patrimoine.json", options
+        )
+        self.assertTrue(os.path.exists(json_file))
     
     def test_coherence_entre_rapports(self):
         """Test cohérence entre les différents rapports."""
-        # Calculer tous les rapports
-        bilan_fonctionnel = self.calculator.calculer_bilan_fonctionnel(self.donnees_completes)
-        bilan_financier = self.calculator.calculer_bilan_financier(self.donnees_completes)
-        patrimoine = self.calculator.calculer_patrimoine(self.donnees_completes)
+        # Calculer tous les rapports en une seule passe sur les données
+        bilan_fonctionnel, bilan_financier, patrimoine = self.calculator.calculer_tous(
+            self.donnees_completes
+        )
         
         # Vérifier que les totaux sont cohérents
         # Actif total du bilan financier doit correspondre aux actifs économiques
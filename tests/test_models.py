@@ -27,49 +27,96 @@ class TestLigneCompte(unittest.TestCase):
         self.assertEqual(ligne.montant, 100000.0)
         self.assertEqual(ligne.periode, "2024")
     
-    def test_code_compte_invalide(self):
-        """Test validation du code compte."""
-        with self.assertRaises(ValueError):
-            LigneCompte(
-                code_compte="",
-                libelle="Test",
-                classe=1,
-                sens=Sens.DEBIT,
-                montant=1000.0,
-                periode="2024"
-            )
-    
-    def test_classe_invalide(self):
-        """Test validation de la classe."""
-        with self.assertRaises(ValueError):
-            LigneCompte(
-                code_compte="1111",
-                libelle="Test",
-                classe=10,
-                sens=Sens.DEBIT,
-                montant=1000.0,
-                periode="2024"
-            )
-    
-    def test_montant_invalide(self):
-        """Test validation du montant."""
+    def test_champs_invalides(self):
+        """Test validation du code compte, de la classe et du montant."""
+        cas_invalides = [
+            ("code_compte", ""),
+            ("classe", 10),
+            ("montant", -1000.0),
+        ]
+        for champ, valeur in cas_invalides:
+            with self.subTest(champ=champ):
+                kwargs = {
+                    'code_compte': "1111",
+                    'libelle': "Test",
+                    'classe': 1,
+                    'sens': Sens.DEBIT,
+                    'montant': 1000.0,
+                    'periode': "2024",
+                    champ: valeur,
+                }
+                with self.assertRaises(ValueError):
+                    LigneCompte(**kwargs)
+
+
+class TestDepuisTableaux(unittest.TestCase):
+    """Tests pour le constructeur en masse LigneCompte.depuis_tableaux."""
+
+    def test_construction_valide(self):
+        """Test construction en masse équivalente au constructeur unitaire."""
+        lignes = LigneCompte.depuis_tableaux(
+            codes=["1111", "5141"],
+            libelles=["Capital social", "Banque"],
+            classes=[1, 5],
+            sens=[Sens.CREDIT, Sens.DEBIT],
+            montants=[100000.0, 100000.0],
+            periodes=["2024", "2024"],
+        )
+
+        self.assertEqual(lignes, [
+            LigneCompte("1111", "Capital social", 1, Sens.CREDIT, 100000.0, "2024"),
+            LigneCompte("5141", "Banque", 5, Sens.DEBIT, 100000.0, "2024"),
+        ])
+        # Les préfixes précalculés doivent être peuplés comme en unitaire
+        self.assertEqual(lignes[0]._prefix2, 11)
+        self.assertEqual(lignes[0]._prefix3, 111)
+
+    def test_colonnes_vides(self):
+        """Test construction depuis des colonnes vides."""
+        self.assertEqual(
+            LigneCompte.depuis_tableaux([], [], [], [], [], []), [])
+
+    def test_colonnes_invalides(self):
+        """Test validation vectorisée du code, de la classe et du montant."""
+        cas_invalides = [
+            ("codes", ["1111", "51"]),
+            ("classes", [1, 10]),
+            ("montants", [100000.0, -1.0]),
+        ]
+        for colonne, valeur in cas_invalides:
+            with self.subTest(colonne=colonne):
+                kwargs = {
+                    'codes': ["1111", "5141"],
+                    'libelles': ["Capital social", "Banque"],
+                    'classes': [1, 5],
+                    'sens': [Sens.CREDIT, Sens.DEBIT],
+                    'montants': [100000.0, 100000.0],
+                    'periodes': ["2024", "2024"],
+                    colonne: valeur,
+                }
+                with self.assertRaises(ValueError):
+                    LigneCompte.depuis_tableaux(**kwargs)
+
+    def test_colonnes_desalignees(self):
+        """Test rejet de colonnes de longueurs différentes."""
         with self.assertRaises(ValueError):
-            LigneCompte(
-                code_compte="1111",
-                libelle="Test",
-                classe=1,
-                sens=Sens.DEBIT,
-                montant=-1000.0,
-                periode="2024"
+            LigneCompte.depuis_tableaux(
+                codes=["1111", "5141"],
+                libelles=["Capital social", "Banque"],
+                classes=[1, 5],
+                sens=[Sens.CREDIT, Sens.DEBIT],
+                montants=[100000.0],  # Une colonne plus courte
+                periodes=["2024", "2024"],
             )
 
 
 class TestJeuDonnees(unittest.TestCase):
     """Tests pour la classe JeuDonnees."""
     
-    def setUp(self):
-        """Configuration des tests."""
-        self.lignes_equilibrees = [
+    @classmethod
+    def setUpClass(cls):
+        """Configuration partagée des tests (lignes immuables)."""
+        cls.lignes_equilibrees = [
             LigneCompte("1111", "Capital social", 1, Sens.CREDIT, 100000.0, "2024"),
             LigneCompte("2111", "Frais constitution", 2, Sens.DEBIT, 5000.0, "2024"),
             LigneCompte("2340", "Matériel transport", 2, Sens.DEBIT, 25000.0, "2024"),
@@ -2,7 +2,14 @@
 Tests pour les transformations financières.
 """
 
+import importlib.util
+import sys
 import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.core import _kernels
 from src.core.simple_models import LigneCompte, JeuDonnees, Sens
 from src.core.simple_transforms import SimpleReportCalculator
 
@@ -10,12 +17,17 @@ from src.core.simple_transforms import SimpleReportCalculator
 class TestSimpleReportCalculator(unittest.TestCase):
     """Tests pour la classe SimpleReportCalculator."""
     
-    def setUp(self):
-        """Configuration des tests."""
-        self.calculator = SimpleReportCalculator()
-        
+    @classmethod
+    def setUpClass(cls):
+        """Configuration partagée des tests.
+
+        Le calculateur et le jeu de données (lignes figées, validation à
+        la construction) sont construits une seule fois pour la classe.
+        """
+        cls.calculator = SimpleReportCalculator()
+
         # Données de test équilibrées
-        self.lignes_test = [
+        cls.lignes_test = [
             LigneCompte("1111", "Capital social", 1, Sens.CREDIT, 100000.0, "2024"),
             LigneCompte("2111", "Frais constitution", 2, Sens.DEBIT, 5000.0, "2024"),
             LigneCompte("2340", "Matériel transport", 2, Sens.DEBIT, 25000.0, "2024"),
@@ -27,8 +39,8 @@ class TestSimpleReportCalculator(unittest.TestCase):
             LigneCompte("1191", "Résultat de l'exercice", 1, Sens.CREDIT, 10000.0, "2024"),
         ]
         
-        self.donnees_test = JeuDonnees(
-            lignes=self.lignes_test,
+        cls.donnees_test = JeuDonnees(
+            lignes=cls.lignes_test,
             periode="2024",
             entreprise="Test Entreprise"
         )
@@ -169,10 +181,99 @@ class TestSimpleReportCalculator(unittest.TestCase):
         self.assertGreater(len(analyse['alertes']), 0)
         self.assertGreater(len(analyse['recommandations']), 0)
         
-        # Vérifier les alertes spécifiques
-        alertes_text = ' '.join(analyse['alertes'])
-        self.assertIn("FRNG négatif", alertes_text)
-        self.assertIn("Trésorerie négative", alertes_text)
+        # Vérifier les alertes spécifiques, sans concaténer la liste
+        self.assertTrue(any("FRNG négatif" in a for a in analyse['alertes']))
+        self.assertTrue(any("Trésorerie négative" in a for a in analyse['alertes']))
+
+
+class TestNoyauxRepli(unittest.TestCase):
+    """Parité entre les replis NumPy des noyaux et la référence Python.
+
+    Numba est optionnel (commenté dans requirements.txt) : sur une
+    installation minimale, la production passe par les replis NumPy de
+    _kernels. Ces tests les chargent explicitement, quel que soit
+    l'environnement local, et les comparent à la référence Python pure
+    pour que les deux branches ne puissent pas diverger en silence.
+    """
+
+    @classmethod
+    def setUpClass(cls):
+        """Charge un exemplaire frais de _kernels avec numba bloqué.
+
+        L'exemplaire partagé de sys.modules n'est pas touché ; les
+        colonnes de test couvrent chaque branche des noyaux (classes 1 à
+        7 dans les deux sens, préfixes 111/11/14 et hors 11,
+        sous-comptes 342/441 et autres, trésorerie passive).
+        """
+        spec = importlib.util.find_spec('src.core._kernels')
+        cls.repli = importlib.util.module_from_spec(spec)
+        with mock.patch.dict(sys.modules, {'numba': None}):
+            spec.loader.exec_module(cls.repli)
+
+        colonnes = [
+            # (code, classe, sens, montant)
+            ("1111", 1, Sens.CREDIT, 100000.0),
+            ("1150", 1, Sens.CREDIT, 5000.0),
+            ("1410", 1, Sens.CREDIT, 8000.0),
+            ("1610", 1, Sens.CREDIT, 7000.0),
+            ("2111", 2, Sens.DEBIT, 30000.0),
+            ("3111", 3, Sens.DEBIT, 15000.0),
+            ("3112", 3, Sens.CREDIT, 2000.0),
+            ("3421", 4, Sens.DEBIT, 20000.0),
+            ("3461", 4, Sens.DEBIT, 4000.0),
+            ("4411", 4, Sens.CREDIT, 12000.0),
+            ("4484", 4, Sens.CREDIT, 3000.0),
+            ("5141", 5, Sens.DEBIT, 50000.0),
+            ("5520", 5, Sens.CREDIT, 9000.0),
+            ("6111", 6, Sens.DEBIT, 10000.0),
+            ("6119", 6, Sens.CREDIT, 500.0),
+            ("7129", 7, Sens.DEBIT, 300.0),
+            ("7111", 7, Sens.CREDIT, 18000.0),
+        ]
+        cls.montants = np.array([m for _, _, _, m in colonnes], dtype=np.float64)
+        cls.classes = np.array([c for _, c, _, _ in colonnes], dtype=np.int8)
+        cls.is_debit = np.array([s is Sens.DEBIT for _, _, s, _ in colonnes], dtype=bool)
+        cls.prefix2 = np.array([int(code[:2]) for code, _, _, _ in colonnes], dtype=np.int16)
+        cls.prefix3 = np.array([int(code[:3]) for code, _, _, _ in colonnes], dtype=np.int16)
+        cls.starts_11 = cls.prefix2 == 11
+
+    def test_repli_charge_sans_numba(self):
+        """Test que l'exemplaire rechargé expose bien les replis NumPy."""
+        self.assertFalse(self.repli.NUMBA_DISPONIBLE)
+
+    def test_parite_agg_fonctionnel(self):
+        """Test parité du repli agg_fonctionnel et valeurs attendues."""
+        attendu = _kernels._agg_fonctionnel(
+            self.montants, self.classes, self.is_debit)
+        obtenu = self.repli.agg_fonctionnel(
+            self.montants, self.classes, self.is_debit)
+
+        self.assertEqual(obtenu, (30000.0, 129000.0, 39000.0,
+                                  17000.0, 50000.0, 9000.0))
+        for reference, valeur in zip(attendu, obtenu):
+            self.assertAlmostEqual(valeur, reference)
+
+    def test_parite_agg_patrimoine(self):
+        """Test parité du repli agg_patrimoine avec la référence Python."""
+        attendu = _kernels._agg_patrimoine(
+            self.montants, self.classes, self.is_debit, self.starts_11)
+        obtenu = self.repli.agg_patrimoine(
+            self.montants, self.classes, self.is_debit, self.starts_11)
+
+        for reference, valeur in zip(attendu, obtenu):
+            self.assertAlmostEqual(valeur, reference)
+
+    def test_parite_agg_tous(self):
+        """Test parité du repli agg_tous avec la référence Python."""
+        attendu = _kernels._agg_tous(
+            self.montants, self.classes, self.is_debit,
+            self.prefix2, self.prefix3)
+        obtenu = self.repli.agg_tous(
+            self.montants, self.classes, self.is_debit,
+            self.prefix2, self.prefix3)
+
+        for reference, valeur in zip(attendu, obtenu):
+            self.assertAlmostEqual(valeur, reference)
 
 
 if __name__ == '__main__':